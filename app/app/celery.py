@@ -14,12 +14,18 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks(lambda: settings.INSTALLED_APPS)
 
+# Connect the task counters, runtime and resource instrumentation served on
+# /metrics
+from app import instrumentation, metrics  # noqa: E402,F401
+
 # Optional configuration for production
 app.conf.update(
     # Task result life time until they will be deleted
     result_expires=3600,  # 1 hour
     # Worker settings
-    worker_prefetch_multiplier=4,  # Adjust based on your workload
+    # Tasks reserved per worker process; measure other values for your
+    # workload with `manage.py bench_celery --prefetch 1,4,16`
+    worker_prefetch_multiplier=4,
     worker_max_tasks_per_child=100,  # Prevent memory leaks
     worker_max_memory_per_child=250000,  # 250MB
     # Queue/routing configuration
@@ -44,6 +50,15 @@ app.conf.update(
     task_send_sent_event=True,
 )
 
+# Periodic tasks
+if settings.EMAIL_OUTBOX_ENABLED:
+    app.conf.beat_schedule = {
+        "relay-email-outbox": {
+            "task": "users.tasks.relay_email_outbox",
+            "schedule": 5.0,  # seconds
+        },
+    }
+
 
 @app.task(bind=True)
 def debug_task(self):
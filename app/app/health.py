@@ -1,28 +1,202 @@
-from django.http import JsonResponse
-from django.db import connection
+"""
+Liveness and readiness probes.
+
+Liveness never touches a dependency. Readiness is served from the last
+result of a background prober, which checks the database, cache, broker,
+Celery queue depths and worker heartbeats concurrently with strict
+timeouts every HEALTH_CHECK_INTERVAL seconds, so a probe request is an
+in-memory read that cannot pile load onto a struggling dependency or hang
+a worker thread. Only HEALTH_CRITICAL_CHECKS decide readiness; the others
+are reported alongside.
+"""
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from celery import current_app
+from django.conf import settings
 from django.core.cache import cache
+from django.db import connection
+from django.http import JsonResponse
+from django.utils import timezone
 
+from app.monitor import get_worker_monitor, queue_depths
 
-def health_check(request):
-    """
-    Simple health check endpoint
-    """
+
+logger = logging.getLogger(__name__)
+
+
+def check_database():
     try:
-        # Test database connection
         with connection.cursor() as cursor:
             cursor.execute("SELECT 1")
+    finally:
+        # The prober thread outlives requests; never keep a broken handle
+        connection.close_if_unusable_or_obsolete()
+
+
+def check_cache():
+    cache.set("health_check", "ok", 10)
+    if cache.get("health_check") != "ok":
+        raise RuntimeError("value read back did not match")
+
+
+def check_broker():
+    with current_app.connection_for_write(
+        connect_timeout=settings.HEALTH_CHECK_TIMEOUT
+    ) as conn:
+        conn.connect()
+
+
+def check_queues():
+    depths = queue_depths(connect_timeout=settings.HEALTH_CHECK_TIMEOUT)
+    limit = settings.HEALTH_QUEUE_MAX_DEPTH
+    backed_up = [name for name, depth in depths.items() if depth > limit]
+    if limit and backed_up:
+        raise RuntimeError(
+            f"{', '.join(backed_up)} above {limit} messages: {depths}"
+        )
+    return {"depths": depths}
+
+
+def check_workers():
+    summary = get_worker_monitor().summary()
+    if not summary["alive"]:
+        raise RuntimeError("no worker heartbeat received")
+    return summary
+
+
+HEALTH_CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "broker": check_broker,
+    "queues": check_queues,
+    "workers": check_workers,
+}
+
+
+class HealthProber:
+    """Runs the checks in a daemon thread and keeps the latest result"""
+
+    def __init__(self, checks, interval, timeout):
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        self.result = None
+        self.ready = threading.Event()
+        self._running = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(checks), thread_name_prefix="health-check"
+        )
+
+    def start(self):
+        threading.Thread(
+            target=self.run, name="health-prober", daemon=True
+        ).start()
+
+    def run(self):
+        while True:
+            try:
+                self.result = self.probe()
+            except Exception as e:
+                logger.error(f"Health prober failed: {e}")
+            self.ready.set()
+            time.sleep(self.interval)
+
+    def _timed(self, check):
+        start = time.perf_counter()
+        details = check() or {}
+        return {
+            "status": "ok",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            **details,
+        }
+
+    def probe(self):
+        """Run every check concurrently, each bounded by ``timeout``"""
+        for name, check in self.checks.items():
+            # A check still stuck from an earlier round is not resubmitted,
+            # so a hung dependency cannot exhaust the executor
+            future = self._running.get(name)
+            if future is None or future.done():
+                self._running[name] = self._executor.submit(
+                    self._timed, check
+                )
+        wait(self._running.values(), timeout=self.timeout)
+
+        results = {}
+        for name, future in self._running.items():
+            if not future.done():
+                results[name] = {"status": "timeout"}
+            elif future.exception() is not None:
+                results[name] = {
+                    "status": "error",
+                    "error": str(future.exception()),
+                }
+            else:
+                results[name] = future.result()
+        return {
+            "checks": results,
+            "checked_at": timezone.now(),
+            "monotonic": time.monotonic(),
+        }
+
+
+_prober = None
+_prober_pid = None
+_prober_lock = threading.Lock()
+
+
+def get_prober():
+    """Return this process's prober, starting it on first use"""
+    global _prober, _prober_pid
+    with _prober_lock:
+        if _prober is None or _prober_pid != os.getpid():
+            _prober = HealthProber(
+                HEALTH_CHECKS,
+                settings.HEALTH_CHECK_INTERVAL,
+                settings.HEALTH_CHECK_TIMEOUT,
+            )
+            _prober_pid = os.getpid()
+            _prober.start()
+        return _prober
+
+
+def liveness(request):
+    """The process is up and serving requests"""
+    return JsonResponse({"status": "alive"})
+
+
+def readiness(request):
+    """Dependencies were reachable as of the last background probe"""
+    prober = get_prober()
+    # Only the very first probe of a process waits for a result
+    prober.ready.wait(settings.HEALTH_CHECK_TIMEOUT + 1)
+    result = prober.result
+    if result is None:
+        return JsonResponse({"status": "starting"}, status=503)
+
+    age = time.monotonic() - result["monotonic"]
+    healthy = all(
+        check["status"] == "ok"
+        for name, check in result["checks"].items()
+        if name in settings.HEALTH_CRITICAL_CHECKS
+    )
+    # A prober that stopped reporting must not keep the app "ready"
+    fresh = age <= (
+        settings.HEALTH_CHECK_INTERVAL * 3 + settings.HEALTH_CHECK_TIMEOUT
+    )
+    return JsonResponse(
+        {
+            "status": "healthy" if healthy and fresh else "unhealthy",
+            "checks": result["checks"],
+            "checked_at": result["checked_at"].isoformat(),
+            "age_seconds": round(age, 2),
+        },
+        status=200 if healthy and fresh else 503,
+    )
+
 
-        # Test cache
-        cache.set('health_check', 'ok', 10)
-        cache_status = cache.get('health_check')
-
-        return JsonResponse({
-            'status': 'healthy',
-            'database': 'ok',
-            'cache': 'ok' if cache_status == 'ok' else 'error'
-        })
-    except Exception as e:
-        return JsonResponse({
-            'status': 'unhealthy',
-            'error': str(e)
-        }, status=503)
+# Kept for existing probes pointing at /health/
+health_check = readiness
@@ -0,0 +1,230 @@
+"""
+Per-task outcome counters and resource instrumentation for Celery workers.
+
+Every task received, succeeded, failed or retried is counted, and for
+every task run the pool process measures the time the message waited in
+the queue (from a ``sent_at`` header stamped at publish, or its ETA), the
+execution time, the serialized payload size, the change in resident
+memory and the growth of the process's peak RSS, which is what
+``worker_max_memory_per_child`` compares against. Observations are
+aggregated in process and flushed to the metrics store (app.metrics) in
+one round trip every TASK_INSTRUMENTATION_BATCH_SIZE tasks or
+TASK_INSTRUMENTATION_FLUSH_INTERVAL seconds, and when the process exits.
+"""
+import os
+import json
+import time
+import resource
+import threading
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_received,
+    task_retry,
+    task_success,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+from app.metrics import (
+    TASK_RUNTIME,
+    TASKS_TOTAL,
+    Batch,
+    Metric,
+    counter_updates,
+    histogram_updates,
+    register,
+)
+
+BYTE_BUCKETS = (
+    1 << 10, 4 << 10, 16 << 10, 64 << 10, 256 << 10,
+    1 << 20, 4 << 20, 16 << 20, 64 << 20, 256 << 20,
+)
+
+QUEUE_WAIT = register(
+    Metric(
+        "celery_task_queue_wait_seconds",
+        "histogram",
+        "Time between publishing (or the ETA) and the task starting",
+        ("task",),
+        TASK_RUNTIME.buckets,
+    )
+)
+PAYLOAD_SIZE = register(
+    Metric(
+        "celery_task_payload_bytes",
+        "histogram",
+        "JSON size of the task arguments",
+        ("task",),
+        BYTE_BUCKETS,
+    )
+)
+RSS_DELTA = register(
+    Metric(
+        "celery_task_rss_delta_bytes",
+        "histogram",
+        "Change in resident memory across a task run",
+        ("task",),
+        BYTE_BUCKETS,
+    )
+)
+PEAK_RSS_GROWTH = register(
+    Metric(
+        "celery_task_peak_rss_growth_bytes_total",
+        "counter",
+        "Growth of the process's peak RSS while the task ran",
+        ("task",),
+    )
+)
+TASK_ERRORS = register(
+    Metric(
+        "celery_task_errors_total",
+        "counter",
+        "Exceptions that failed or retried a task",
+        ("task", "exception", "outcome"),
+    )
+)
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# ru_maxrss is in kilobytes on Linux and bytes on macOS
+_MAXRSS_UNIT = 1 if os.uname().sysname == "Darwin" else 1024
+
+
+def peak_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+def current_rss():
+    """Resident set size in bytes; the peak where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return peak_rss()
+
+
+def payload_size(args, kwargs):
+    return len(json.dumps([args, kwargs], default=str).encode())
+
+
+def queue_wait(request, now):
+    """Seconds the message waited since it was sent, or became due"""
+    sent_at = getattr(request, "sent_at", None)
+    if sent_at is None:
+        return None
+    due = sent_at
+    eta = getattr(request, "eta", None)
+    if eta:
+        parsed = parse_datetime(eta) if isinstance(eta, str) else eta
+        if parsed is not None:
+            due = max(due, parsed.timestamp())
+    return max(now - due, 0.0)
+
+
+_batch = None
+_batch_pid = None
+_batch_lock = threading.Lock()
+
+
+def get_batch():
+    global _batch, _batch_pid
+    with _batch_lock:
+        if _batch is None or _batch_pid != os.getpid():
+            _batch = Batch(
+                settings.TASK_INSTRUMENTATION_BATCH_SIZE,
+                settings.TASK_INSTRUMENTATION_FLUSH_INTERVAL,
+            )
+            _batch_pid = os.getpid()
+        return _batch
+
+
+_running = {}
+
+
+@before_task_publish.connect
+def stamp_sent_at(headers=None, **kwargs):
+    # Overwritten on purpose: a retry republishes the original headers
+    if headers is not None:
+        headers["sent_at"] = time.time()
+
+
+@task_prerun.connect
+def on_task_prerun(sender=None, task_id=None, args=None, kwargs=None, **_):
+    _running[task_id] = {
+        "queue_wait": queue_wait(sender.request, time.time()),
+        "payload": payload_size(args, kwargs),
+        "rss": current_rss(),
+        "peak_rss": peak_rss(),
+        "started": time.perf_counter(),
+    }
+
+
+def started_at(task_id):
+    """``perf_counter()`` when the running task ``task_id`` started"""
+    run = _running.get(task_id)
+    return run["started"] if run is not None else None
+
+
+@task_postrun.connect
+def on_task_postrun(sender=None, task_id=None, **kwargs):
+    run = _running.pop(task_id, None)
+    if run is None:
+        return
+    runtime = time.perf_counter() - run["started"]
+    rss_delta = current_rss() - run["rss"]
+    peak_growth = peak_rss() - run["peak_rss"]
+    labels = (sender.name,)
+    updates = (
+        histogram_updates(TASK_RUNTIME, labels, runtime)
+        + histogram_updates(PAYLOAD_SIZE, labels, run["payload"])
+        + histogram_updates(RSS_DELTA, labels, rss_delta)
+        + counter_updates(PEAK_RSS_GROWTH, labels, peak_growth)
+    )
+    if run["queue_wait"] is not None:
+        updates += histogram_updates(QUEUE_WAIT, labels, run["queue_wait"])
+    get_batch().add(updates)
+
+
+@task_received.connect
+def on_task_received(sender=None, request=None, **kwargs):
+    # Fires in the worker's main process, which flushes on worker_shutdown
+    get_batch().add(counter_updates(TASKS_TOTAL, (request.name, "received")))
+
+
+@task_success.connect
+def on_task_success(sender=None, **kwargs):
+    get_batch().add(counter_updates(TASKS_TOTAL, (sender.name, "succeeded")))
+
+
+@task_failure.connect
+def on_task_failure(sender=None, exception=None, **kwargs):
+    get_batch().add(
+        counter_updates(TASKS_TOTAL, (sender.name, "failed"))
+        + counter_updates(
+            TASK_ERRORS,
+            (sender.name, type(exception).__name__, "failed"),
+        )
+    )
+
+
+@task_retry.connect
+def on_task_retry(sender=None, reason=None, **kwargs):
+    exception = getattr(reason, "exc", None) or reason
+    get_batch().add(
+        counter_updates(TASKS_TOTAL, (sender.name, "retried"))
+        + counter_updates(
+            TASK_ERRORS,
+            (sender.name, type(exception).__name__, "retried"),
+        )
+    )
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_on_shutdown(**kwargs):
+    get_batch().flush()
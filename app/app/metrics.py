@@ -0,0 +1,287 @@
+"""
+Prometheus text exposition of Celery and HTTP request metrics.
+
+Counters and histograms are aggregated in a store shared by every web and
+worker process: one Redis hash per metric family (METRICS_BACKEND=redis),
+or a process-local dict for development and tests. Writes are HINCRBYFLOAT
+calls on fixed fields and a scrape reads each known family with a single
+HGETALL, so nothing is ever scanned. Queue lengths are read live.
+"""
+import os
+import time
+import bisect
+import logging
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.http import HttpResponse
+
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+KEY_PREFIX = "metrics:"
+LABEL_SEPARATOR = "|"
+
+RUNTIME_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300,
+)
+
+
+class Metric:
+    def __init__(self, name, kind, documentation, labelnames, buckets=()):
+        self.name = name
+        self.kind = kind
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+
+
+REGISTRY = {}
+
+
+def register(metric):
+    REGISTRY[metric.name] = metric
+    return metric
+
+
+TASKS_TOTAL = register(
+    Metric(
+        "celery_tasks_total",
+        "counter",
+        "Tasks received, succeeded, failed and retried per task name",
+        ("task", "state"),
+    )
+)
+TASK_RUNTIME = register(
+    Metric(
+        "celery_task_runtime_seconds",
+        "histogram",
+        "Task execution time",
+        ("task",),
+        RUNTIME_BUCKETS,
+    )
+)
+
+
+class LocalStore:
+    """Process-local store, only complete when a single process runs"""
+
+    def __init__(self):
+        self._data = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+
+    def increment(self, updates):
+        with self._lock:
+            for name, field, amount in updates:
+                self._data[name][field] += amount
+
+    def read(self, name):
+        with self._lock:
+            return dict(self._data.get(name, {}))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class RedisStore:
+    """One Redis hash per metric family, shared by every process"""
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=1, socket_connect_timeout=1
+        )
+
+    def increment(self, updates):
+        pipeline = self.client.pipeline(transaction=False)
+        for name, field, amount in updates:
+            pipeline.hincrbyfloat(KEY_PREFIX + name, field, amount)
+        pipeline.execute()
+
+    def read(self, name):
+        return {
+            field.decode(): float(value)
+            for field, value in self.client.hgetall(KEY_PREFIX + name).items()
+        }
+
+    def clear(self):
+        self.client.delete(*(KEY_PREFIX + name for name in REGISTRY))
+
+
+_store = None
+_store_pid = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store, _store_pid
+    with _store_lock:
+        if _store is None or _store_pid != os.getpid():
+            if settings.METRICS_BACKEND == "redis":
+                _store = RedisStore(settings.METRICS_REDIS_URL)
+            else:
+                _store = LocalStore()
+            _store_pid = os.getpid()
+        return _store
+
+
+def label_field(*values):
+    return LABEL_SEPARATOR.join(str(value) for value in values)
+
+
+def counter_updates(metric, labels, amount=1):
+    return [(metric.name, label_field(*labels), amount)]
+
+
+def histogram_updates(metric, labels, value):
+    """
+    Fields for one observation: its own bucket (made cumulative when
+    rendered), the sum and the count
+    """
+    index = bisect.bisect_left(metric.buckets, value)
+    bucket = metric.buckets[index] if index < len(metric.buckets) else "+Inf"
+    prefix = label_field(*labels)
+    return [
+        (metric.name, label_field(prefix, f"le={bucket}"), 1),
+        (metric.name, label_field(prefix, "sum"), value),
+        (metric.name, label_field(prefix, "count"), 1),
+    ]
+
+
+class Batch:
+    """
+    Updates aggregated in process and written to the store in one round
+    trip every ``size`` observations or ``interval`` seconds
+    """
+
+    def __init__(self, size, interval):
+        self.size = size
+        self.interval = interval
+        self._updates = defaultdict(float)
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, updates):
+        with self._lock:
+            for name, field, amount in updates:
+                self._updates[name, field] += amount
+            self._pending += 1
+            due = (
+                self._pending >= self.size
+                or time.monotonic() - self._flushed_at >= self.interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            updates, self._updates = self._updates, defaultdict(float)
+            self._pending = 0
+            self._flushed_at = time.monotonic()
+        if not updates:
+            return
+        try:
+            get_store().increment(
+                [(name, field, amount) for (name, field), amount
+                 in updates.items()]
+            )
+        except Exception as e:
+            # Dropped rather than retried: metrics must never back up into
+            # the worker or request being measured
+            logger.warning(f"Dropped {len(updates)} metric updates: {e}")
+
+
+def _escape(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render_counter(metric, data):
+    lines = []
+    for field, value in sorted(data.items()):
+        values = field.split(LABEL_SEPARATOR)
+        lines.append(
+            f"{metric.name}{_labels(metric.labelnames, values)} "
+            f"{_format(value)}"
+        )
+    return lines
+
+
+def render_histogram(metric, data):
+    series = defaultdict(dict)
+    for field, value in data.items():
+        *values, suffix = field.split(LABEL_SEPARATOR)
+        series[tuple(values)][suffix] = value
+
+    lines = []
+    for values, fields in sorted(series.items()):
+        cumulative = 0
+        for bucket in metric.buckets + ("+Inf",):
+            cumulative += fields.get(f"le={bucket}", 0)
+            labels = _labels(metric.labelnames, values, [("le", bucket)])
+            lines.append(
+                f"{metric.name}_bucket{labels} {_format(cumulative)}"
+            )
+        labels = _labels(metric.labelnames, values)
+        lines.append(
+            f"{metric.name}_sum{labels} {_format(fields.get('sum', 0))}"
+        )
+        lines.append(
+            f"{metric.name}_count{labels} {_format(fields.get('count', 0))}"
+        )
+    return lines
+
+
+RENDERERS = {"counter": render_counter, "histogram": render_histogram}
+
+
+def render_queue_lengths():
+    from app.monitor import queue_depths
+
+    lines = [
+        "# HELP celery_queue_length Messages waiting in each Celery queue",
+        "# TYPE celery_queue_length gauge",
+    ]
+    try:
+        depths = queue_depths(connect_timeout=settings.HEALTH_CHECK_TIMEOUT)
+    except Exception:
+        return lines
+    for name, depth in depths.items():
+        lines.append(
+            f"celery_queue_length{_labels(('queue',), (name,))} {depth}"
+        )
+    return lines
+
+
+def render_metrics(store=None):
+    store = store or get_store()
+    lines = render_queue_lengths()
+    for metric in REGISTRY.values():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(RENDERERS[metric.kind](metric, store.read(metric.name)))
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint"""
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
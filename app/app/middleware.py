@@ -0,0 +1,175 @@
+"""
+Per-view request latency and SQL metrics.
+
+Every request records its wall time, database query count and database
+time under its resolved URL name (``users:token_obtain_pair``,
+``health-check``, ...). Observations go to a batch owned by the serving
+thread, so recording never contends on a shared lock, and each batch is
+flushed to the metrics store (app.metrics) every REQUEST_METRICS_BATCH_SIZE
+requests or REQUEST_METRICS_FLUSH_INTERVAL seconds. Only the few slowest
+queries of a request are kept, for the slow request log; a
+REQUEST_QUERY_SAMPLE_RATE fraction of requests capture every query.
+"""
+import os
+import time
+import heapq
+import atexit
+import random
+import logging
+import threading
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+from app.metrics import Batch, Metric, histogram_updates, register
+
+
+logger = logging.getLogger(__name__)
+
+TOP_QUERIES = 5
+UNRESOLVED = "unresolved"
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+REQUEST_DURATION = register(
+    Metric(
+        "http_request_duration_seconds",
+        "histogram",
+        "Request wall time per resolved URL name",
+        ("view", "method"),
+        LATENCY_BUCKETS,
+    )
+)
+REQUEST_QUERIES = register(
+    Metric(
+        "http_request_db_queries",
+        "histogram",
+        "Database queries per request",
+        ("view", "method"),
+        QUERY_COUNT_BUCKETS,
+    )
+)
+REQUEST_DB_TIME = register(
+    Metric(
+        "http_request_db_seconds",
+        "histogram",
+        "Time spent in database queries per request",
+        ("view", "method"),
+        LATENCY_BUCKETS,
+    )
+)
+
+
+class QueryRecorder:
+    """Execute wrapper counting queries and keeping the slowest ones"""
+
+    def __init__(self, capture=False, top=TOP_QUERIES):
+        self.count = 0
+        self.duration = 0.0
+        self.top = top
+        # Min-heap of (duration, sql): the fastest kept query is replaced
+        self.slowest = []
+        self.captured = [] if capture else None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, (elapsed, sql))
+            elif elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (elapsed, sql))
+            if self.captured is not None:
+                self.captured.append((elapsed, sql))
+
+    def top_queries(self):
+        return sorted(self.slowest, reverse=True)
+
+
+_local = threading.local()
+_batches = []
+
+
+def get_batch():
+    """Return the calling thread's batch"""
+    batch = getattr(_local, "batch", None)
+    if batch is None or _local.pid != os.getpid():
+        batch = Batch(
+            settings.REQUEST_METRICS_BATCH_SIZE,
+            settings.REQUEST_METRICS_FLUSH_INTERVAL,
+        )
+        _local.batch, _local.pid = batch, os.getpid()
+        _batches.append((os.getpid(), batch))
+    return batch
+
+
+@atexit.register
+def flush_batches():
+    # Batches inherited from a parent process are the parent's to flush
+    for pid, batch in list(_batches):
+        if pid == os.getpid():
+            batch.flush()
+
+
+def _format_queries(queries):
+    return "\n".join(
+        f"  {elapsed * 1000:.1f}ms {sql[:500]}" for elapsed, sql in queries
+    )
+
+
+class RequestMetricsMiddleware:
+    """Record latency and SQL usage for each request by URL name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_threshold = settings.REQUEST_SLOW_THRESHOLD_MS / 1000
+        self.sample_rate = settings.REQUEST_QUERY_SAMPLE_RATE
+
+    def __call__(self, request):
+        recorder = QueryRecorder(capture=random.random() < self.sample_rate)
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = request.resolver_match
+        labels = (match.view_name if match else UNRESOLVED, request.method)
+        get_batch().add(
+            histogram_updates(REQUEST_DURATION, labels, elapsed)
+            + histogram_updates(REQUEST_QUERIES, labels, recorder.count)
+            + histogram_updates(REQUEST_DB_TIME, labels, recorder.duration)
+        )
+
+        if elapsed >= self.slow_threshold:
+            logger.warning(
+                f"Slow request {request.method} {request.path} "
+                f"({labels[0]}): {elapsed * 1000:.1f}ms, "
+                f"{recorder.count} queries in "
+                f"{recorder.duration * 1000:.1f}ms\n"
+                + _format_queries(recorder.top_queries())
+            )
+        if recorder.captured is not None:
+            self.log_sample(request, labels[0], recorder.captured)
+        return response
+
+    def log_sample(self, request, view, queries):
+        repeated = {
+            sql: count
+            for sql, count in Counter(sql for _, sql in queries).items()
+            if count > 1
+        }
+        logger.info(
+            f"Sampled {request.method} {request.path} ({view}): "
+            f"{len(queries)} queries, {len(repeated)} repeated\n"
+            + _format_queries(queries)
+        )
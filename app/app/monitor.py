@@ -0,0 +1,103 @@
+"""
+Celery broker and worker monitoring for the readiness probe.
+
+Queue depths are read with one passive declare per queue. Worker health
+comes from the heartbeat events workers already publish
+(``worker_send_task_events``), consumed by a background receiver bound to
+``worker.#`` only, so probes never broadcast ``inspect().ping()``.
+"""
+import os
+import time
+import logging
+import threading
+from celery import current_app
+from kombu.exceptions import ChannelError
+
+
+logger = logging.getLogger(__name__)
+
+
+def queue_names(app):
+    """Names of the queues declared in ``task_queues``"""
+    return [
+        getattr(queue, "name", queue) for queue in app.conf.task_queues or ()
+    ]
+
+
+def queue_depths(app=None, connect_timeout=None):
+    """Messages waiting in each declared queue, over a single connection"""
+    app = app or current_app
+    depths = {}
+    with app.connection_for_read(connect_timeout=connect_timeout) as conn:
+        channel = conn.default_channel
+        for name in queue_names(app):
+            try:
+                _, depth, _ = channel.queue_declare(queue=name, passive=True)
+            except (ChannelError,) + tuple(conn.channel_errors):
+                # Not declared yet: nothing has ever been routed to it
+                depth = 0
+            depths[name] = depth
+    return depths
+
+
+class WorkerMonitor:
+    """Keeps worker state up to date from the broker's event stream"""
+
+    def __init__(self, app):
+        self.app = app
+        self.state = app.events.State()
+
+    def start(self):
+        threading.Thread(
+            target=self.run, name="worker-monitor", daemon=True
+        ).start()
+
+    def run(self):
+        while True:
+            try:
+                with self.app.connection_for_read() as conn:
+                    receiver = self.app.events.Receiver(
+                        conn,
+                        handlers={"*": self.state.event},
+                        routing_key="worker.#",
+                    )
+                    # wakeup asks workers for an immediate heartbeat
+                    receiver.capture(limit=None, timeout=None, wakeup=True)
+            except Exception as e:
+                logger.warning(f"Worker event receiver failed: {e}")
+            time.sleep(5)
+
+    def summary(self):
+        """Workers seen on the event stream and whether they are alive"""
+        now = time.time()
+        workers = {}
+        for worker in list(self.state.workers.values()):
+            last = worker.heartbeats[-1] if worker.heartbeats else None
+            workers[worker.hostname] = {
+                "alive": worker.alive,
+                "active": worker.active,
+                "processed": worker.processed,
+                "last_heartbeat_age": (
+                    round(now - last, 1) if last is not None else None
+                ),
+            }
+        return {
+            "alive": sum(worker["alive"] for worker in workers.values()),
+            "workers": workers,
+        }
+
+
+_monitor = None
+_monitor_pid = None
+_monitor_lock = threading.Lock()
+
+
+def get_worker_monitor():
+    """Return this process's monitor, starting its receiver on first use"""
+    global _monitor, _monitor_pid
+    with _monitor_lock:
+        if _monitor is None or _monitor_pid != os.getpid():
+            _monitor = WorkerMonitor(current_app)
+            _monitor_pid = os.getpid()
+            _monitor.start()
+        return _monitor
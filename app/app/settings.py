@@ -1,7 +1,7 @@
 import os
 import dj_database_url
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,9 +48,12 @@ INSTALLED_APPS = [
     "core",
     "users",
     "utils",
+    "benchmarks",
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover every other middleware
+    "app.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -115,6 +118,71 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Without Redis every process keeps its own LocMem cache, so only enable
+# LocMem for local development and tests.
+
+USE_REDIS_CACHE = config("USE_REDIS_CACHE", default=False, cast=bool)
+CACHE_ALIASES = ("default", "throttle", "sessions")
+# Values at least this large are zlib-compressed before going to Redis
+CACHE_COMPRESS_MIN_BYTES = config(
+    "CACHE_COMPRESS_MIN_BYTES", default=1024, cast=int
+)
+
+if USE_REDIS_CACHE:
+    REDIS_CACHE_URL = config("REDIS_CACHE_URL", default="redis://redis:6379/1")
+    # Connections per process, shared by all threads and cache aliases
+    CACHE_MAX_CONNECTIONS = config("CACHE_MAX_CONNECTIONS", default=20, cast=int)
+
+    CACHES = {
+        alias: {
+            "BACKEND": "utils.cache.PooledRedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+            "KEY_PREFIX": alias,
+            "OPTIONS": {
+                "pool_class": "redis.BlockingConnectionPool",
+                "serializer": "utils.cache.CompactJSONSerializer",
+                "max_connections": CACHE_MAX_CONNECTIONS,
+                # Seconds to wait for a free pooled connection
+                "timeout": 2,
+                "socket_connect_timeout": 1,
+                "socket_timeout": 1,
+                "health_check_interval": 30,
+            },
+        }
+        for alias in CACHE_ALIASES
+    }
+
+    # In-process LRU in front of Redis for the default alias, kept coherent
+    # through pub/sub invalidations. CACHE_LOCAL_TIMEOUT bounds staleness
+    # should an invalidation be missed; 0 entries disables the local tier.
+    CACHE_LOCAL_MAX_ENTRIES = config(
+        "CACHE_LOCAL_MAX_ENTRIES", default=1000, cast=int
+    )
+    CACHE_LOCAL_TIMEOUT = config("CACHE_LOCAL_TIMEOUT", default=30, cast=int)
+    if CACHE_LOCAL_MAX_ENTRIES > 0:
+        CACHES["default"]["BACKEND"] = "utils.cache.TwoTierCache"
+        CACHES["default"]["OPTIONS"].update(
+            {
+                "local_max_entries": CACHE_LOCAL_MAX_ENTRIES,
+                "local_timeout": CACHE_LOCAL_TIMEOUT,
+                "channel": "cache:invalidate",
+            }
+        )
+else:
+    CACHES = {
+        alias: {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": alias,
+        }
+        for alias in CACHE_ALIASES
+    }
+
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "sessions"
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -169,6 +237,10 @@ STATICFILES_FINDERS = [
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "users.User"
 
+# Covering indexes (Index.include) are Postgres only; SQLite builds the same
+# indexes without the included columns
+SILENCED_SYSTEM_CHECKS = ["models.W040"]
+
 
 # Email Configuration
 EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
@@ -177,13 +249,39 @@ EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="no-reply@domain.com")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="password")
 EMAIL_PORT = 587
 
+# Batched email delivery: buffer up to EMAIL_BATCH_SIZE messages for at most
+# EMAIL_BATCH_WINDOW seconds and send them over a single SMTP connection
+EMAIL_BATCHING_ENABLED = config(
+    "EMAIL_BATCHING_ENABLED", default=False, cast=bool
+)
+EMAIL_BATCH_SIZE = config("EMAIL_BATCH_SIZE", default=50, cast=int)
+EMAIL_BATCH_WINDOW = config("EMAIL_BATCH_WINDOW", default=2.0, cast=float)
+
+# Transactional email outbox: write email tasks to the database in the
+# request's transaction and let relay_email_outbox publish them. Takes
+# precedence over EMAIL_BATCHING_ENABLED.
+EMAIL_OUTBOX_ENABLED = config("EMAIL_OUTBOX_ENABLED", default=False, cast=bool)
+EMAIL_OUTBOX_BATCH_SIZE = config(
+    "EMAIL_OUTBOX_BATCH_SIZE", default=500, cast=int
+)
+EMAIL_OUTBOX_RETENTION = 24 * 60 * 60  # 1 day in seconds
+
+# Per-worker SMTP connection pool (EMAIL_POOL_SIZE=0 disables pooling)
+EMAIL_POOL_SIZE = config("EMAIL_POOL_SIZE", default=2, cast=int)
+EMAIL_POOL_MAX_AGE = config("EMAIL_POOL_MAX_AGE", default=300, cast=int)
+EMAIL_POOL_MAX_MESSAGES = config(
+    "EMAIL_POOL_MAX_MESSAGES", default=100, cast=int
+)
+# NOOP idle connections older than this many seconds before reusing them
+EMAIL_POOL_NOOP_AFTER = config("EMAIL_POOL_NOOP_AFTER", default=5, cast=int)
+
 
 # Rest Framework Configuration
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
 }
 
@@ -198,6 +296,81 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
 }
 
+# Readiness probes read the latest result of a background prober that
+# checks the database, cache and broker every HEALTH_CHECK_INTERVAL seconds,
+# each bounded by HEALTH_CHECK_TIMEOUT seconds
+HEALTH_CHECK_INTERVAL = config("HEALTH_CHECK_INTERVAL", default=5.0, cast=float)
+HEALTH_CHECK_TIMEOUT = config("HEALTH_CHECK_TIMEOUT", default=2.0, cast=float)
+# Checks that fail readiness when not ok; the rest are only reported. Workers
+# are not critical by default as they start after the app is ready.
+HEALTH_CRITICAL_CHECKS = config(
+    "HEALTH_CRITICAL_CHECKS", default="database,cache,broker", cast=Csv()
+)
+# Report the queues check as failed above this many waiting messages
+# (0 only reports depths)
+HEALTH_QUEUE_MAX_DEPTH = config("HEALTH_QUEUE_MAX_DEPTH", default=0, cast=int)
+
+# Task counters and runtime histograms served on /metrics. "redis" shares
+# them between every web and worker process; "local" keeps them in-process
+METRICS_BACKEND = config("METRICS_BACKEND", default="local")
+METRICS_REDIS_URL = config("METRICS_REDIS_URL", default="redis://redis:6379/2")
+# Worker task instrumentation is aggregated in process and flushed to the
+# metrics store every TASK_INSTRUMENTATION_BATCH_SIZE tasks or
+# TASK_INSTRUMENTATION_FLUSH_INTERVAL seconds, whichever comes first
+TASK_INSTRUMENTATION_BATCH_SIZE = config(
+    "TASK_INSTRUMENTATION_BATCH_SIZE", default=100, cast=int
+)
+TASK_INSTRUMENTATION_FLUSH_INTERVAL = config(
+    "TASK_INSTRUMENTATION_FLUSH_INTERVAL", default=10.0, cast=float
+)
+# long_running_task writes its progress once it moved by
+# TASK_PROGRESS_STEP percent or TASK_PROGRESS_INTERVAL seconds passed, and
+# always at the end (0 writes every item). TASK_PROGRESS_PUBSUB publishes
+# it on the Redis result backend's task-progress:<task id> channel instead
+# of storing it as the task's PROGRESS state.
+TASK_PROGRESS_INTERVAL = config("TASK_PROGRESS_INTERVAL", default=1.0, cast=float)
+TASK_PROGRESS_STEP = config("TASK_PROGRESS_STEP", default=1.0, cast=float)
+TASK_PROGRESS_PUBSUB = config("TASK_PROGRESS_PUBSUB", default=False, cast=bool)
+# long_running_task fans jobs of more items than this out over the workers
+# as a chord of chunks of this many items (0 runs every job in one task)
+LONG_RUNNING_TASK_CHUNK_SIZE = config(
+    "LONG_RUNNING_TASK_CHUNK_SIZE", default=0, cast=int
+)
+# I/O bound task items run at most TASK_IO_CONCURRENCY at a time, each
+# failing after TASK_IO_TIMEOUT seconds (0 waits as long as the soft time
+# limit allows)
+TASK_IO_CONCURRENCY = config("TASK_IO_CONCURRENCY", default=10, cast=int)
+TASK_IO_TIMEOUT = config("TASK_IO_TIMEOUT", default=30.0, cast=float)
+# Helper processes forked by each worker process for CPU-bound task items
+# (below 2 runs items in the task itself). Fewer items than the threshold
+# run inline, and shared inputs from TASK_SHARED_MEMORY_MIN_BYTES go
+# through shared memory instead of being pickled with every chunk.
+TASK_PROCESS_POOL_WORKERS = config(
+    "TASK_PROCESS_POOL_WORKERS", default=0, cast=int
+)
+TASK_PROCESS_POOL_THRESHOLD = 8
+TASK_SHARED_MEMORY_MIN_BYTES = config(
+    "TASK_SHARED_MEMORY_MIN_BYTES", default=1 << 20, cast=int
+)
+# Per-view request metrics are flushed the same way. Requests slower than
+# REQUEST_SLOW_THRESHOLD_MS are logged with their slowest queries and a
+# REQUEST_QUERY_SAMPLE_RATE fraction of requests log every query
+REQUEST_METRICS_BATCH_SIZE = config(
+    "REQUEST_METRICS_BATCH_SIZE", default=100, cast=int
+)
+REQUEST_METRICS_FLUSH_INTERVAL = config(
+    "REQUEST_METRICS_FLUSH_INTERVAL", default=10.0, cast=float
+)
+REQUEST_SLOW_THRESHOLD_MS = config(
+    "REQUEST_SLOW_THRESHOLD_MS", default=500, cast=int
+)
+REQUEST_QUERY_SAMPLE_RATE = config(
+    "REQUEST_QUERY_SAMPLE_RATE", default=0.01, cast=float
+)
+
+# Seconds the generated OpenAPI schema is served from the cache
+SCHEMA_CACHE_TIMEOUT = config("SCHEMA_CACHE_TIMEOUT", default=300, cast=int)
+
 
 # To allow POST request from frontend
 CSRF_TRUSTED_ORIGINS = [
@@ -245,6 +418,29 @@ SESSION_COOKIE_SECURE = False
 SECURE_REFERRER_POLICY = "no-referrer-when-downgrade"
 
 
+# Seconds a user snapshot resolved from a JWT is served from the cache
+USER_AUTH_CACHE_TIMEOUT = config("USER_AUTH_CACHE_TIMEOUT", default=60, cast=int)
+
+# Seconds a serialized user detail/profile response is cached per version
+USER_RESPONSE_CACHE_TIMEOUT = config(
+    "USER_RESPONSE_CACHE_TIMEOUT", default=300, cast=int
+)
+
+# Rows fetched per round trip by the streaming users export
+USER_EXPORT_CHUNK_SIZE = 2000
+
+# Bulk user creation
+USER_BULK_MAX_ROWS = 5000
+USER_BULK_INSERT_BATCH_SIZE = 500
+# Processes hashing passwords, started on demand from a forkserver the
+# gunicorn worker starts at boot (gunicorn.conf.py); batches smaller than
+# the threshold are hashed inline
+USER_BULK_HASH_WORKERS = config(
+    "USER_BULK_HASH_WORKERS", default=os.cpu_count() or 1, cast=int
+)
+USER_BULK_HASH_POOL_THRESHOLD = 8
+
+
 # Password Reset Settings
 PASSWORD_RESET_TIMEOUT = 3600  # 1 hour in seconds
 
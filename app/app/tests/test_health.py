@@ -0,0 +1,148 @@
+import time
+import threading
+from unittest.mock import MagicMock, patch
+from django.urls import reverse
+from django.utils import timezone
+from django.test import SimpleTestCase, override_settings
+
+from app.health import HealthProber
+
+
+def make_result(status="ok", age=0):
+    return {
+        "checks": {
+            "database": {"status": status},
+            "cache": {"status": "ok"},
+            "broker": {"status": "ok"},
+        },
+        "checked_at": timezone.now(),
+        "monotonic": time.monotonic() - age,
+    }
+
+
+class HealthEndpointTests(SimpleTestCase):
+    """Test suite for the liveness and readiness endpoints"""
+
+    def setUp(self):
+        self.prober = MagicMock(result=make_result())
+        patcher = patch("app.health.get_prober", return_value=self.prober)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_liveness_touches_nothing(self):
+        """Test that liveness never reads the prober"""
+        response = self.client.get(reverse("health-live"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "alive"})
+
+    def test_readiness_reads_cached_result(self):
+        """Test that readiness reports the last probe without probing"""
+        response = self.client.get(reverse("health-ready"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "healthy")
+        self.prober.probe.assert_not_called()
+
+    def test_failed_check_is_unready(self):
+        """Test that any failed check makes the app unready"""
+        self.prober.result = make_result(status="timeout")
+
+        response = self.client.get(reverse("health-ready"))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.json()["checks"]["database"]["status"], "timeout"
+        )
+
+    def test_non_critical_failure_is_reported_only(self):
+        """Test that worker and queue failures do not fail readiness"""
+        self.prober.result["checks"]["workers"] = {
+            "status": "error", "error": "no worker heartbeat received"
+        }
+
+        response = self.client.get(reverse("health-ready"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["checks"]["workers"]["status"], "error"
+        )
+
+    @override_settings(
+        HEALTH_CRITICAL_CHECKS=["database", "cache", "broker", "workers"]
+    )
+    def test_critical_workers_check(self):
+        """Test that workers can be made part of readiness"""
+        self.prober.result["checks"]["workers"] = {"status": "error"}
+
+        response = self.client.get(reverse("health-ready"))
+
+        self.assertEqual(response.status_code, 503)
+
+    @override_settings(HEALTH_CHECK_INTERVAL=5, HEALTH_CHECK_TIMEOUT=2)
+    def test_stale_result_is_unready(self):
+        """Test that a prober that stopped reporting fails readiness"""
+        self.prober.result = make_result(age=60)
+
+        response = self.client.get(reverse("health-ready"))
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_no_result_yet(self):
+        """Test that readiness fails until the first probe completes"""
+        self.prober.result = None
+
+        response = self.client.get(reverse("health-check"))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "starting")
+
+
+class HealthProberTests(SimpleTestCase):
+    """Test suite for HealthProber"""
+
+    def test_checks_run_concurrently(self):
+        """Test that slow checks overlap instead of adding up"""
+        # Each check waits for the other two; run one after another they
+        # would break the barrier and fail
+        barrier = threading.Barrier(3, timeout=0.5)
+
+        def check():
+            barrier.wait()
+
+        checks = {name: check for name in ("a", "b", "c")}
+        prober = HealthProber(checks, interval=5, timeout=1)
+
+        result = prober.probe()
+
+        self.assertTrue(
+            all(c["status"] == "ok" for c in result["checks"].values())
+        )
+
+    def test_timeouts_and_errors_reported(self):
+        """Test that hung and failing checks are reported, not raised"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fail():
+            raise ConnectionError("refused")
+
+        hung_calls = []
+
+        def hang():
+            hung_calls.append(1)
+            release.wait(5)
+
+        prober = HealthProber(
+            {"hung": hang, "failing": fail}, interval=5, timeout=0.1
+        )
+
+        first = prober.probe()["checks"]
+        second = prober.probe()["checks"]
+
+        self.assertEqual(first["hung"], {"status": "timeout"})
+        self.assertEqual(first["failing"]["status"], "error")
+        self.assertEqual(first["failing"]["error"], "refused")
+        self.assertEqual(second["hung"], {"status": "timeout"})
+        # The hung check is never stacked up behind itself
+        self.assertEqual(len(hung_calls), 1)
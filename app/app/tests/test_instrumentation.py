@@ -0,0 +1,126 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+from celery import Celery
+from django.test import SimpleTestCase
+
+from app import instrumentation, metrics
+from app.celery import app as celery_app
+from core.tasks import add
+
+
+class QueueWaitTests(SimpleTestCase):
+    """Test suite for queue_wait"""
+
+    def test_wait_from_sent_at(self):
+        """Test that the wait is measured from the publish time"""
+        request = SimpleNamespace(sent_at=100.0, eta=None)
+
+        self.assertEqual(instrumentation.queue_wait(request, 102.5), 2.5)
+
+    def test_wait_from_eta(self):
+        """Test that a countdown is not counted as queue wait"""
+        request = SimpleNamespace(
+            sent_at=100.0, eta="1970-01-01T00:02:00+00:00"
+        )
+
+        self.assertEqual(instrumentation.queue_wait(request, 121.0), 1.0)
+
+    def test_unstamped_message(self):
+        """Test that messages from older producers are skipped"""
+        self.assertIsNone(
+            instrumentation.queue_wait(SimpleNamespace(), time.time())
+        )
+
+    def test_publish_stamps_header(self):
+        """Test that published messages carry their send time"""
+        app = Celery("test", broker="memory://", set_as_current=False)
+        app.conf.task_queues = celery_app.conf.task_queues
+
+        before = time.time()
+        app.send_task("core.tasks.add", args=(1, 2), queue="default")
+        with app.connection_for_read() as conn:
+            queue = conn.SimpleQueue("default", no_ack=True)
+            message = queue.get(timeout=1)
+            queue.close()
+
+        self.assertGreaterEqual(message.headers["sent_at"], before)
+
+
+class TaskInstrumentationTests(SimpleTestCase):
+    """Test suite for the task signal handlers"""
+
+    def setUp(self):
+        self.store = metrics.LocalStore()
+        self.batch = instrumentation.Batch(size=1, interval=60)
+        patchers = [
+            patch("app.metrics.get_store", return_value=self.store),
+            patch(
+                "app.instrumentation.get_batch", return_value=self.batch
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_task_run_recorded(self):
+        """Test that runtime and payload size are recorded per task"""
+        add.apply(args=(1, 2))
+
+        runtime = self.store.read("celery_task_runtime_seconds")
+        payload = self.store.read("celery_task_payload_bytes")
+        self.assertEqual(runtime["core.tasks.add|count"], 1)
+        self.assertEqual(payload["core.tasks.add|sum"], len("[[1, 2], {}]"))
+        self.assertEqual(
+            self.store.read("celery_task_rss_delta_bytes")[
+                "core.tasks.add|count"
+            ],
+            1,
+        )
+
+    def test_memory_growth_recorded(self):
+        """Test that RSS and peak RSS growth are attributed to the task"""
+        with patch(
+            "app.instrumentation.current_rss", side_effect=[100, 5000]
+        ), patch("app.instrumentation.peak_rss", side_effect=[1000, 9000]):
+            add.apply(args=(1, 2))
+
+        rss = self.store.read("celery_task_rss_delta_bytes")
+        self.assertEqual(rss["core.tasks.add|sum"], 4900)
+        self.assertEqual(rss["core.tasks.add|le=16384"], 1)
+        self.assertEqual(
+            self.store.read("celery_task_peak_rss_growth_bytes_total"),
+            {"core.tasks.add": 8000},
+        )
+
+    def test_failures_and_retries_by_exception(self):
+        """Test that failing exceptions are counted with their outcome"""
+        instrumentation.on_task_failure(
+            sender=add, exception=ValueError("bad")
+        )
+        instrumentation.on_task_retry(
+            sender=add, reason=SimpleNamespace(exc=ConnectionError())
+        )
+
+        self.assertEqual(
+            self.store.read("celery_task_errors_total"),
+            {
+                "core.tasks.add|ValueError|failed": 1,
+                "core.tasks.add|ConnectionError|retried": 1,
+            },
+        )
+
+    def test_outcomes_batched(self):
+        """Test that task outcomes share one store round trip per batch"""
+        self.batch.size = 3
+        with patch.object(
+            self.store, "increment", wraps=self.store.increment
+        ) as increment:
+            for _ in range(3):
+                instrumentation.on_task_success(sender=add)
+
+        increment.assert_called_once()
+        self.assertEqual(
+            self.store.read("celery_tasks_total"),
+            {"core.tasks.add|succeeded": 3},
+        )
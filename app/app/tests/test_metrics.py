@@ -0,0 +1,172 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+from django.urls import reverse
+from django.test import SimpleTestCase
+
+from app import instrumentation, metrics
+from core.tasks import add, unreliable_task
+
+
+class MetricsTests(SimpleTestCase):
+    """Test suite for the /metrics endpoint"""
+
+    def setUp(self):
+        self.store = metrics.LocalStore()
+        patchers = [
+            patch("app.metrics.get_store", return_value=self.store),
+            patch(
+                "app.instrumentation.get_batch",
+                return_value=metrics.Batch(size=1, interval=60),
+            ),
+            patch(
+                "app.monitor.queue_depths",
+                return_value={"default": 3, "high_priority": 0},
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def scrape(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def test_queue_lengths(self):
+        """Test that every queue's length is exported as a gauge"""
+        body = self.scrape()
+
+        self.assertIn("# TYPE celery_queue_length gauge", body)
+        self.assertIn('celery_queue_length{queue="default"} 3', body)
+        self.assertIn('celery_queue_length{queue="high_priority"} 0', body)
+
+    def test_unreachable_broker_still_scrapes(self):
+        """Test that a broker outage only drops the queue lengths"""
+        with patch(
+            "app.monitor.queue_depths", side_effect=ConnectionError
+        ):
+            body = self.scrape()
+
+        self.assertNotIn("celery_queue_length{", body)
+        self.assertIn("# TYPE celery_tasks_total counter", body)
+
+    def test_task_outcomes_counted(self):
+        """Test that succeeded and failed tasks are counted per task"""
+        add.apply(args=(1, 2))
+        add.apply(args=(3, 4))
+        with patch("core.tasks.random.random", return_value=0):
+            unreliable_task.apply()
+        instrumentation.on_task_received(
+            request=SimpleNamespace(name=add.name)
+        )
+
+        body = self.scrape()
+
+        self.assertIn(
+            'celery_tasks_total{task="core.tasks.add",state="succeeded"} 2',
+            body,
+        )
+        self.assertIn(
+            'celery_tasks_total{task="core.tasks.add",state="received"} 1',
+            body,
+        )
+        self.assertIn(
+            'celery_tasks_total{task="core.tasks.unreliable_task",'
+            'state="failed"} 1',
+            body,
+        )
+
+    def test_retries_counted(self):
+        """Test that a retry is counted against its task"""
+        instrumentation.on_task_retry(sender=add, reason=ValueError())
+
+        self.assertIn(
+            'celery_tasks_total{task="core.tasks.add",state="retried"} 1',
+            self.scrape(),
+        )
+
+    def test_runtime_histogram(self):
+        """Test that runtimes land in cumulative buckets"""
+        for value in (0.003, 0.2, 0.2, 1000):
+            self.store.increment(
+                metrics.histogram_updates(
+                    metrics.TASK_RUNTIME, ("core.tasks.add",), value
+                )
+            )
+
+        body = self.scrape()
+
+        name = "celery_task_runtime_seconds"
+        labels = 'task="core.tasks.add"'
+        self.assertIn(f'{name}_bucket{{{labels},le="0.005"}} 1', body)
+        self.assertIn(f'{name}_bucket{{{labels},le="0.1"}} 1', body)
+        self.assertIn(f'{name}_bucket{{{labels},le="0.25"}} 3', body)
+        self.assertIn(f'{name}_bucket{{{labels},le="300"}} 3', body)
+        self.assertIn(f'{name}_bucket{{{labels},le="+Inf"}} 4', body)
+        self.assertIn(f"{name}_count{{{labels}}} 4", body)
+        self.assertIn(f"{name}_sum{{{labels}}} 1000.403", body)
+
+    def test_label_values_escaped(self):
+        """Test that quotes in label values cannot break the format"""
+        self.store.increment(
+            metrics.counter_updates(metrics.TASKS_TOTAL, ('a"b', "failed"))
+        )
+
+        self.assertIn(
+            'celery_tasks_total{task="a\\"b",state="failed"} 1',
+            self.scrape(),
+        )
+
+    def test_store_failure_never_raises(self):
+        """Test that an unreachable store cannot fail a task"""
+        with patch.object(
+            self.store, "increment", side_effect=ConnectionError
+        ):
+            self.assertEqual(add.apply(args=(1, 2)).get(), 3)
+
+
+class BatchTests(SimpleTestCase):
+    """Test suite for the in-process aggregation batch"""
+
+    def setUp(self):
+        self.store = metrics.LocalStore()
+        patcher = patch("app.metrics.get_store", return_value=self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_aggregates_until_size(self):
+        """Test that observations are merged and written once per batch"""
+        batch = metrics.Batch(size=3, interval=60)
+        with patch.object(
+            self.store, "increment", wraps=self.store.increment
+        ) as increment:
+            for _ in range(3):
+                batch.add([("m", "a", 1), ("m", "b", 0.5)])
+
+        increment.assert_called_once()
+        self.assertEqual(self.store.read("m"), {"a": 3, "b": 1.5})
+
+    def test_flushes_after_interval(self):
+        """Test that a quiet worker still flushes within the interval"""
+        batch = metrics.Batch(size=100, interval=0.05)
+        batch.add([("m", "a", 1)])
+        self.assertEqual(self.store.read("m"), {})
+
+        time.sleep(0.06)
+        batch.add([("m", "a", 1)])
+
+        self.assertEqual(self.store.read("m"), {"a": 2})
+
+    def test_store_failure_drops_batch(self):
+        """Test that an unreachable store never raises into the task"""
+        batch = metrics.Batch(size=1, interval=60)
+        with patch.object(
+            self.store, "increment", side_effect=ConnectionError
+        ):
+            with self.assertLogs("app.metrics", "WARNING"):
+                batch.add([("m", "a", 1)])
+
+        batch.flush()
+        self.assertEqual(self.store.read("m"), {})
@@ -0,0 +1,114 @@
+import time
+from unittest.mock import patch
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from app import metrics
+from app.middleware import QueryRecorder
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    """Test suite for RequestMetricsMiddleware"""
+
+    def setUp(self):
+        self.store = metrics.LocalStore()
+        patchers = [
+            patch("app.metrics.get_store", return_value=self.store),
+            patch(
+                "app.middleware.get_batch",
+                return_value=metrics.Batch(size=1, interval=60),
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def login(self):
+        return self.client.post(
+            reverse("users:token_obtain_pair"),
+            {"email": "nobody@example.com", "password": "wrong"},
+        )
+
+    def test_recorded_by_url_name(self):
+        """Test that time and queries are recorded under the URL name"""
+        self.login()
+
+        prefix = "users:token_obtain_pair|POST"
+        queries = self.store.read("http_request_db_queries")
+        self.assertEqual(queries[f"{prefix}|count"], 1)
+        self.assertGreaterEqual(queries[f"{prefix}|sum"], 1)
+        self.assertGreater(
+            self.store.read("http_request_db_seconds")[f"{prefix}|sum"], 0
+        )
+        self.assertEqual(
+            self.store.read("http_request_duration_seconds")[
+                f"{prefix}|count"
+            ],
+            1,
+        )
+
+    def test_unresolved_path(self):
+        """Test that 404s share one label instead of one per path"""
+        self.client.get("/no/such/page/")
+
+        self.assertEqual(
+            self.store.read("http_request_db_queries"),
+            {
+                "unresolved|GET|le=0": 1,
+                "unresolved|GET|sum": 0,
+                "unresolved|GET|count": 1,
+            },
+        )
+
+    @override_settings(REQUEST_SLOW_THRESHOLD_MS=0)
+    def test_slow_request_logged_with_queries(self):
+        """Test that slow requests are logged with their top queries"""
+        with self.assertLogs("app.middleware", "WARNING") as logs:
+            self.login()
+
+        self.assertIn("Slow request POST", logs.output[0])
+        self.assertIn("users:token_obtain_pair", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+    @override_settings(REQUEST_QUERY_SAMPLE_RATE=1)
+    def test_sampled_request_captures_queries(self):
+        """Test that sampled requests log every query"""
+        with self.assertLogs("app.middleware", "INFO") as logs:
+            self.login()
+
+        self.assertIn("Sampled POST", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+
+class QueryRecorderTests(SimpleTestCase):
+    """Test suite for QueryRecorder"""
+
+    def run_query(self, recorder, sql, duration):
+        def execute(*args):
+            time.sleep(duration)
+
+        recorder(execute, sql, None, False, {})
+
+    def test_keeps_only_slowest(self):
+        """Test that only the slowest queries are kept when not sampled"""
+        recorder = QueryRecorder(top=2)
+        for sql, duration in (("a", 0.001), ("b", 0.03), ("c", 0.02)):
+            self.run_query(recorder, sql, duration)
+
+        self.assertEqual(recorder.count, 3)
+        self.assertIsNone(recorder.captured)
+        self.assertEqual(
+            [sql for _, sql in recorder.top_queries()], ["b", "c"]
+        )
+
+    def test_failed_query_counted(self):
+        """Test that queries raising errors are still counted"""
+        recorder = QueryRecorder()
+
+        def execute(*args):
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            recorder(execute, "SELECT 1", None, False, {})
+
+        self.assertEqual(recorder.count, 1)
@@ -0,0 +1,108 @@
+import time
+from unittest.mock import patch
+from celery import Celery
+from django.test import SimpleTestCase, override_settings
+
+from app.celery import app as celery_app
+from app.health import check_queues, check_workers
+from app.monitor import WorkerMonitor, queue_depths, queue_names
+
+
+def heartbeat(hostname, received, **fields):
+    return {
+        "type": "worker-heartbeat",
+        "hostname": hostname,
+        "timestamp": received,
+        "local_received": received,
+        "freq": 2.0,
+        "active": 1,
+        "processed": 10,
+        **fields,
+    }
+
+
+class QueueDepthTests(SimpleTestCase):
+    """Test suite for queue_depths"""
+
+    def setUp(self):
+        self.app = Celery("test", broker="memory://", set_as_current=False)
+        self.app.conf.task_queues = celery_app.conf.task_queues
+        self.app.conf.task_default_queue = "default"
+
+    def test_depths_per_declared_queue(self):
+        """Test that every task_queues entry reports its waiting messages"""
+        for _ in range(3):
+            self.app.send_task("core.tasks.example", queue="default")
+        self.app.send_task("core.tasks.example", queue="high_priority")
+        self.addCleanup(self.purge)
+
+        depths = queue_depths(self.app)
+
+        self.assertEqual(depths, {"default": 3, "high_priority": 1})
+
+    def test_undeclared_queue_is_empty(self):
+        """Test that a queue nothing was routed to reports zero"""
+        self.app.conf.task_queues = {"never_used": {}}
+
+        self.assertEqual(queue_depths(self.app), {"never_used": 0})
+
+    def test_project_queues(self):
+        """Test that the queues come from app/celery.py"""
+        self.assertEqual(
+            queue_names(celery_app), ["default", "high_priority"]
+        )
+
+    def purge(self):
+        with self.app.connection_for_write() as conn:
+            for name in queue_names(self.app):
+                conn.default_channel.queue_purge(name)
+
+    @override_settings(HEALTH_QUEUE_MAX_DEPTH=5)
+    def test_backed_up_queue_fails_check(self):
+        """Test that a queue over the limit fails the queues check"""
+        with patch(
+            "app.health.queue_depths",
+            return_value={"default": 6, "high_priority": 0},
+        ):
+            with self.assertRaisesMessage(RuntimeError, "default above 5"):
+                check_queues()
+
+
+class WorkerMonitorTests(SimpleTestCase):
+    """Test suite for WorkerMonitor"""
+
+    def setUp(self):
+        self.monitor = WorkerMonitor(celery_app)
+
+    def test_summary_from_heartbeats(self):
+        """Test that heartbeat events mark workers alive"""
+        now = time.time()
+        self.monitor.state.event(heartbeat("celery@a", now))
+        self.monitor.state.event(heartbeat("celery@b", now - 600))
+
+        summary = self.monitor.summary()
+
+        self.assertEqual(summary["alive"], 1)
+        self.assertTrue(summary["workers"]["celery@a"]["alive"])
+        self.assertFalse(summary["workers"]["celery@b"]["alive"])
+        self.assertEqual(summary["workers"]["celery@a"]["processed"], 10)
+
+    def test_offline_event(self):
+        """Test that a worker going offline is no longer alive"""
+        self.monitor.state.event(heartbeat("celery@a", time.time()))
+        self.monitor.state.event(
+            heartbeat("celery@a", time.time(), type="worker-offline")
+        )
+
+        self.assertEqual(self.monitor.summary()["alive"], 0)
+
+    def test_no_workers_fails_check(self):
+        """Test that the workers check fails without live heartbeats"""
+        with patch(
+            "app.health.get_worker_monitor", return_value=self.monitor
+        ):
+            with self.assertRaises(RuntimeError):
+                check_workers()
+
+            self.monitor.state.event(heartbeat("celery@a", time.time()))
+            self.assertEqual(check_workers()["alive"], 1)
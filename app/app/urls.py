@@ -15,11 +15,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from app.health import health_check
+from app.health import health_check, liveness, readiness
+from app.metrics import metrics_view
 from django.urls import path, include
 
+from utils.views import CachedSpectacularAPIView
 from drf_spectacular.views import (
-    SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
@@ -29,9 +30,16 @@ urlpatterns = [
     path("", include("rest_framework.urls")),
 
     path("health/", health_check, name="health-check"),
+    path("health/live/", liveness, name="health-live"),
+    path("health/ready/", readiness, name="health-ready"),
+    path("metrics", metrics_view, name="metrics"),
     path("users/", include(("users.urls", "users"), namespace="users")),
 
-    path("api/docs/schema/", SpectacularAPIView.as_view(), name="api-schema"),
+    path(
+        "api/docs/schema/",
+        CachedSpectacularAPIView.as_view(),
+        name="api-schema",
+    ),
     path(
         "api/docs/swagger/",
         SpectacularSwaggerView.as_view(url_name="api-schema"),
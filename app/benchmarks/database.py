@@ -0,0 +1,30 @@
+"""
+Throwaway copy of the configured database for the benchmark commands
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from django.db import connection
+
+
+@contextmanager
+def throwaway_database(name, keepdb=False):
+    """
+    Run the block against a fresh, migrated copy of the configured
+    database, destroyed afterwards unless ``keepdb``. SQLite copies are a
+    file named after ``name`` so other processes can open them too.
+    """
+    test_settings = connection.settings_dict["TEST"]
+    if connection.vendor == "sqlite" and not test_settings["NAME"]:
+        test_settings["NAME"] = os.path.join(
+            tempfile.gettempdir(), f"{name}.sqlite3"
+        )
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb
+        )
@@ -0,0 +1,152 @@
+"""
+Ways of sending a request to the app for the HTTP benchmark.
+
+``WSGIDriver`` calls the WSGI application in this process, so it measures
+the full middleware and view stack without any network. ``GunicornDriver``
+serves the same database from a local gunicorn and talks to it over
+keep-alive HTTP connections, one per client thread.
+"""
+import io
+import os
+import sys
+import time
+import socket
+import threading
+import subprocess
+import http.client
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+
+class WSGIDriver:
+    name = "wsgi"
+
+    def __init__(self):
+        self.application = get_wsgi_application()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def request(self, method, path, body=b"", headers=None):
+        """Return the status code and body of one request"""
+        path, _, query = path.partition("?")
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in (headers or {}).items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+
+        status = []
+
+        def start_response(line, response_headers, exc_info=None):
+            status.append(int(line.split(" ", 1)[0]))
+
+        response = self.application(environ, start_response)
+        try:
+            content = b"".join(response)
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+        return status[0], content
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class GunicornDriver:
+    name = "gunicorn"
+
+    def __init__(self, workers=2, threads=1, env=None, verbose=False):
+        self.workers = workers
+        self.threads = threads
+        self.env = env or {}
+        self.verbose = verbose
+        self.port = free_port()
+        self.process = None
+        self._local = threading.local()
+
+    def start(self, timeout=30):
+        """Start gunicorn and wait until it serves the liveness probe"""
+        output = None if self.verbose else subprocess.DEVNULL
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn", "app.wsgi:application",
+                "--bind", f"127.0.0.1:{self.port}",
+                "--workers", str(self.workers),
+                "--threads", str(self.threads),
+            ],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, **self.env},
+            stdout=output,
+            stderr=output,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(
+                    f"gunicorn exited with status {self.process.returncode}"
+                )
+            try:
+                if self.request("GET", "/health/live/")[0] == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"gunicorn did not start within {timeout}s")
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = http.client.HTTPConnection(
+                "127.0.0.1", self.port, timeout=30
+            )
+            self._local.connection = connection
+        return connection
+
+    def request(self, method, path, body=b"", headers=None):
+        """Return the status code and body of one request"""
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        connection = self._connection()
+        for attempt in range(2):
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError):
+                # The server closed an idle keep-alive connection; reconnect
+                connection.close()
+                if attempt:
+                    raise
+            except Exception:
+                connection.close()
+                raise
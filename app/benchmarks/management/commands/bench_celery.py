@@ -0,0 +1,240 @@
+"""
+Benchmark Celery task throughput across worker pools and settings
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+
+from app.celery import app as celery_app
+from benchmarks import stats
+from benchmarks.workers import (
+    WorkerProcess,
+    broker_environment,
+    run_case,
+    transport_options,
+)
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[2]
+POOLS = ("prefork", "threads", "solo")
+COLUMNS = (
+    "operations", "errors", "throughput", "p50_ms", "p95_ms",
+    "queue_wait_p50_ms", "queue_wait_p95_ms", "fetch_p50_ms", "fetch_p95_ms",
+)
+# Task name -> arguments of the n-th task given the command's options
+TASKS = {
+    "core.tasks.add": lambda number, options: (number, number),
+    "core.tasks.process_urgent_data": lambda number, options: (
+        f"payload-{number}",
+    ),
+    "core.tasks.long_running_task": lambda number, options: (
+        [f"item-{number}-{item}" for item in range(options["items"])],
+        options["chunk_size"],
+    ),
+    "core.tasks.concurrent_io_task": lambda number, options: (
+        [f"item-{number}-{item}" for item in range(options["items"])],
+    ),
+    "core.tasks.cpu_bound_task": lambda number, options: (
+        [f"item-{number}-{item}" for item in range(options["items"])],
+    ),
+}
+DEFAULT_COUNTS = {
+    "core.tasks.add": 500,
+    "core.tasks.process_urgent_data": 100,
+    "core.tasks.long_running_task": 8,
+    "core.tasks.concurrent_io_task": 8,
+    "core.tasks.cpu_bound_task": 8,
+}
+
+
+def integers(value):
+    return [int(number) for number in value.split(",")]
+
+
+def task_count(value):
+    name, _, count = value.partition("=")
+    name = name if name.startswith("core.tasks.") else f"core.tasks.{name}"
+    if name not in TASKS or not count.isdigit():
+        raise ValueError(value)
+    return name, int(count)
+
+
+class Command(BaseCommand):
+    """
+    Start a worker for every pool, concurrency and prefetch multiplier,
+    push each task through it and report end-to-end throughput, enqueue
+    to start latency and result fetch latency. Runs offline against
+    kombu's filesystem transport and Celery's file result backend unless
+    --broker-url is given.
+    """
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pool",
+            action="append",
+            choices=POOLS,
+            help="Pool to run, repeatable (default: all)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=integers,
+            default=[1, 4],
+            help="Comma separated worker concurrencies to sweep",
+        )
+        parser.add_argument(
+            "--prefetch",
+            type=integers,
+            default=[1, 4],
+            help="Comma separated worker_prefetch_multiplier values",
+        )
+        parser.add_argument(
+            "--count",
+            type=task_count,
+            action="append",
+            default=[],
+            help="Tasks to push as name=count, e.g. add=2000, repeatable",
+        )
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=4,
+            help="Items per batch task (long_running, concurrent_io, ...)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=0,
+            help="Fan long_running_task out in chunks of this many items",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=300,
+            help="Seconds to wait for the results of one case",
+        )
+        parser.add_argument(
+            "--broker-url",
+            help=(
+                "Broker, also used as result backend, instead of the "
+                "filesystem stand-in, e.g. redis://localhost:6379/15"
+            ),
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=BENCHMARKS_DIR / "results" / "celery.json",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        counts = {**DEFAULT_COUNTS, **dict(options["count"])}
+        configurations = self.configurations(options)
+        directory = tempfile.mkdtemp(prefix="bench_celery-")
+        # The workers inherit the environment and read the broker from it.
+        # This process loads its configuration first so the values set
+        # below override the project's.
+        celery_app.conf.finalize()
+        if options["broker_url"]:
+            os.environ.update(
+                CELERY_BROKER_URL=options["broker_url"],
+                CELERY_RESULT_BACKEND=options["broker_url"],
+            )
+            celery_app.conf.update(
+                broker_url=options["broker_url"],
+                result_backend=options["broker_url"],
+            )
+        else:
+            environment = broker_environment(directory)
+            os.environ.update(environment)
+            celery_app.conf.update(
+                broker_url=environment["CELERY_BROKER_URL"],
+                result_backend=environment["CELERY_RESULT_BACKEND"],
+                # Publishes are written atomically for the worker to read
+                broker_transport=(
+                    "benchmarks.workers:AtomicFilesystemTransport"
+                ),
+                broker_transport_options=transport_options(directory),
+            )
+            if any(pool != "solo" for pool, _, _ in configurations):
+                self.stderr.write(
+                    self.style.WARNING(
+                        "The filesystem stand-in is consumed synchronously: "
+                        "prefork and threads workers only fetch more tasks "
+                        "every 2s once their prefetch window is full. Use "
+                        "--broker-url to compare pools."
+                    )
+                )
+
+        results = {}
+        try:
+            for pool, concurrency, prefetch in configurations:
+                worker = WorkerProcess(
+                    pool,
+                    concurrency,
+                    prefetch,
+                    directory,
+                    verbose=options["verbosity"] > 1,
+                )
+                worker.start(celery_app)
+                try:
+                    for name, count in counts.items():
+                        case = f"{pool}/c{concurrency}/p{prefetch}/{name}"
+                        self.stdout.write(f"{case} x{count}...")
+                        results[case] = run_case(
+                            celery_app,
+                            name,
+                            lambda number: TASKS[name](number, options),
+                            count,
+                            worker,
+                            options["timeout"],
+                        )
+                except TimeoutError as e:
+                    raise CommandError(f"{case}: {e}")
+                finally:
+                    worker.stop()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        self.stdout.write(stats.format_table(results, COLUMNS))
+        self.report_best(results)
+        stats.write_results(
+            options["output"],
+            results,
+            cpus=os.cpu_count(),
+            items=options["items"],
+            chunk_size=options["chunk_size"],
+            broker=celery_app.conf.broker_url.split(":", 1)[0],
+        )
+        self.stdout.write(f"Results written to {options['output']}")
+
+    def configurations(self, options):
+        """Every pool, concurrency and prefetch combination, once"""
+        configurations = []
+        for pool in options["pool"] or POOLS:
+            # The solo pool runs one task at a time whatever its concurrency
+            concurrencies = [1] if pool == "solo" else options["concurrency"]
+            for concurrency in concurrencies:
+                for prefetch in options["prefetch"]:
+                    configurations.append((pool, concurrency, prefetch))
+        return configurations
+
+    def report_best(self, results):
+        """The highest throughput setting per task"""
+        best = {}
+        for case, summary in results.items():
+            name = case.rsplit("/", 1)[1]
+            if summary.get("errors"):
+                continue
+            if summary["throughput"] > best.get(name, ("", 0))[1]:
+                best[name] = (case, summary["throughput"])
+        for name, (case, throughput) in sorted(best.items()):
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Best for {name}: {case.rsplit('/', 1)[0]} "
+                    f"({throughput}/s)"
+                )
+            )
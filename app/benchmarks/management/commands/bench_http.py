@@ -0,0 +1,205 @@
+"""
+Benchmark the users API and health probe in process and through gunicorn
+"""
+import os
+from pathlib import Path
+from django.db import connection
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import stats
+from benchmarks.database import throwaway_database
+from benchmarks.drivers import GunicornDriver, WSGIDriver
+from benchmarks.scenarios import SCENARIOS, Fixture, run
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[2]
+COLUMNS = (
+    "operations", "errors", "throughput", "p50_ms", "p95_ms", "p99_ms",
+)
+
+
+class Command(BaseCommand):
+    """
+    Run each scenario against a throwaway copy of the database with an
+    in-memory broker, write the median of the runs as JSON and fail when
+    a request failed or a metric regressed past the threshold compared
+    with the committed baseline
+    """
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mode",
+            choices=("wsgi", "gunicorn", "all"),
+            default="wsgi",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(SCENARIOS),
+            help="Scenario to run, repeatable (default: all)",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=3,
+            help="Runs per scenario, reported as their median",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=2000,
+            help="Users created in addition to the benchmark user",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=2, help="gunicorn workers"
+        )
+        parser.add_argument(
+            "--threads", type=int, default=1, help="gunicorn threads"
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=BENCHMARKS_DIR / "results" / "http.json",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=BENCHMARKS_DIR / "baselines" / "http.json",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=20.0,
+            help="Percent a metric may worsen before it is a regression",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Store the results as the new baseline",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the benchmark database between runs",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        # Publishes stay in process and nothing consumes them. Celery reads
+        # these variables before its configuration; gunicorn inherits them.
+        os.environ["CELERY_BROKER_URL"] = "memory://"
+        os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
+        # A file for SQLite, so the gunicorn workers can open it too
+        with throwaway_database("bench_http", keepdb=options["keepdb"]):
+            results = self.benchmark(options)
+
+        self.stdout.write(stats.format_table(results, COLUMNS))
+        extra = {
+            name: options[name]
+            for name in ("mode", "requests", "concurrency", "workers", "runs")
+        }
+        extra["database"] = connection.vendor
+        failed = sorted(
+            case for case, metrics in results.items() if metrics["errors"]
+        )
+        if options["update_baseline"]:
+            if failed:
+                raise CommandError(
+                    f"Requests failed in {', '.join(failed)}; a baseline "
+                    "must be recorded from a clean run"
+                )
+            stats.write_results(options["baseline"], results, **extra)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Baseline written to {options['baseline']}"
+                )
+            )
+            return
+
+        stats.write_results(options["output"], results, **extra)
+        self.stdout.write(f"Results written to {options['output']}")
+        if failed:
+            raise CommandError(f"Requests failed in {', '.join(failed)}")
+        self.check_regressions(results, options)
+
+    def benchmark(self, options):
+        fixture = Fixture(options["users"])
+        drivers = []
+        if options["mode"] in ("wsgi", "all"):
+            drivers.append(WSGIDriver())
+        if options["mode"] in ("gunicorn", "all"):
+            drivers.append(
+                GunicornDriver(
+                    workers=options["workers"],
+                    threads=options["threads"],
+                    env={
+                        "DJANGO_SETTINGS_MODULE": "benchmarks.settings",
+                        "BENCH_DATABASE_NAME": str(
+                            connection.settings_dict["NAME"]
+                        ),
+                    },
+                    verbose=options["verbosity"] > 1,
+                )
+            )
+
+        results = {}
+        for driver in drivers:
+            driver.start()
+            try:
+                for name in options["scenario"] or SCENARIOS:
+                    scenario = SCENARIOS[name]
+                    concurrency = options["concurrency"]
+                    # SQLite fails concurrent writers with "database is
+                    # locked" rather than queueing them
+                    if scenario.writes and connection.vendor == "sqlite":
+                        concurrency = 1
+                    self.stdout.write(f"{driver.name}/{name}...")
+                    summaries = [
+                        run(
+                            driver,
+                            scenario,
+                            fixture,
+                            requests=options["requests"],
+                            concurrency=concurrency,
+                            warmup=options["warmup"],
+                        )
+                        for _ in range(options["runs"])
+                    ]
+                    results[f"{driver.name}/{name}"] = {
+                        **stats.median_summary(summaries),
+                        "concurrency": concurrency,
+                    }
+            finally:
+                driver.stop()
+        return results
+
+    def check_regressions(self, results, options):
+        # A run that compares nothing must not pass as "no regressions"
+        baseline = stats.load_results(options["baseline"])
+        missing = sorted(set(results) - set(baseline))
+        if missing:
+            raise CommandError(
+                f"No baseline for {', '.join(missing)} in "
+                f"{options['baseline']}; record one with --update-baseline"
+            )
+
+        regressions = stats.compare(
+            results, baseline, options["threshold"] / 100
+        )
+        for case, metric, old, new, change in regressions:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"{case} {metric}: {old} -> {new} ({change:+.1%})"
+                )
+            )
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} metrics regressed by more than "
+                f"{options['threshold']}%"
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions"))
@@ -0,0 +1,92 @@
+"""
+Benchmark the CPU time of a login, single-pass against the previous flow
+"""
+import time
+from pathlib import Path
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management.base import BaseCommand
+
+from benchmarks import stats
+from benchmarks.database import throwaway_database
+from users.serializers import CustomTokenObtainPairSerializer
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[2]
+COLUMNS = ("operations", "cpu_mean_ms", "cpu_p50_ms", "cpu_p95_ms", "ratio")
+EMAIL = "bench-login@test.com"
+PASSWORD = "bench-login-pass"
+
+
+def check_then_authenticate():
+    """The previous flow: verify the password, then authenticate() again"""
+    user = get_user_model().objects.filter(email__lower=EMAIL).first()
+    user.check_password(PASSWORD)
+    user = authenticate(email=EMAIL, password=PASSWORD)
+    str(CustomTokenObtainPairSerializer.get_token(user).access_token)
+
+
+def single_pass():
+    """The token obtain serializer, verifying the password once"""
+    serializer = CustomTokenObtainPairSerializer(
+        data={"email": EMAIL, "password": PASSWORD}
+    )
+    serializer.is_valid(raise_exception=True)
+
+
+CASES = {
+    "check_then_authenticate": check_then_authenticate,
+    "single_pass": single_pass,
+}
+
+
+class Command(BaseCommand):
+    """
+    Log a user in repeatedly through each flow with the configured
+    password hashers, against a throwaway copy of the database, and report
+    the CPU time per login
+    """
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20)
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=BENCHMARKS_DIR / "results" / "login.json",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        with throwaway_database("bench_login"):
+            get_user_model().objects.create_user(
+                email=EMAIL, password=PASSWORD
+            )
+            results = {
+                case: self.run_case(login, options["logins"])
+                for case, login in CASES.items()
+            }
+
+        reference = results["check_then_authenticate"]["cpu_mean_ms"]
+        for metrics in results.values():
+            metrics["ratio"] = round(metrics["cpu_mean_ms"] / reference, 3)
+
+        self.stdout.write(stats.format_table(results, COLUMNS))
+        stats.write_results(
+            options["output"], results, logins=options["logins"]
+        )
+        self.stdout.write(f"Results written to {options['output']}")
+
+    def run_case(self, login, logins):
+        # The first login warms the hasher and query caches
+        login()
+        durations = []
+        for _ in range(logins):
+            started = time.process_time()
+            login()
+            durations.append(time.process_time() - started)
+        return {
+            "operations": logins,
+            "cpu_mean_ms": stats.ms(sum(durations) / logins),
+            **stats.percentiles_ms(durations, prefix="cpu_"),
+        }
@@ -0,0 +1,137 @@
+"""
+Benchmark the helper process pool used by CPU-bound tasks
+"""
+import os
+import zlib
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from benchmarks import stats
+from core.processes import map_in_processes, shutdown_process_pool
+from core.tasks import crunch_item
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[2]
+COLUMNS = ("operations", "elapsed_ms", "throughput", "speedup")
+
+
+def echo(item):
+    return item
+
+
+def checksum(data, bounds):
+    start, end = bounds
+    return zlib.crc32(data[start:end])
+
+
+def integers(value):
+    return [int(number) for number in value.split(",")]
+
+
+class Command(BaseCommand):
+    """
+    Time forking the helper pool against reusing it, CPU-bound items
+    (core.tasks.crunch_item) across pool sizes against running them in
+    the task, and a large input passed through shared memory against
+    pickling it with every chunk.
+    """
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=integers,
+            default=sorted({2, os.cpu_count() or 2}),
+            help=(
+                "Comma separated pool sizes, from 2, to compare with "
+                "inline runs"
+            ),
+        )
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=64,
+            help="crunch_item calls per run, about 50ms each",
+        )
+        parser.add_argument(
+            "--shared-mb",
+            type=int,
+            default=64,
+            help="Size of the input shared by every item, in megabytes",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=BENCHMARKS_DIR / "results" / "processes.json",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        pool_sizes = [workers for workers in options["workers"] if workers > 1]
+        if not pool_sizes:
+            raise CommandError("Pool sizes below 2 run inline")
+        results = {}
+        baseline = self.measure(
+            "crunch/inline", 1, crunch_item, range(options["items"])
+        )
+        results["crunch/inline"] = baseline
+        for workers in pool_sizes:
+            results[f"startup/w{workers}"] = self.measure(
+                "startup", workers, echo, range(workers * 8), fresh=True
+            )
+            results[f"reuse/w{workers}"] = self.measure(
+                "reuse", workers, echo, range(workers * 8)
+            )
+            crunch = self.measure(
+                f"crunch/w{workers}",
+                workers,
+                crunch_item,
+                range(options["items"]),
+            )
+            crunch["speedup"] = round(
+                baseline["elapsed_ms"] / crunch["elapsed_ms"], 2
+            )
+            results[f"crunch/w{workers}"] = crunch
+
+        workers = max(pool_sizes)
+        data = os.urandom(options["shared_mb"] << 20)
+        step = len(data) // (workers * 16)
+        bounds = [(start, start + step) for start in range(0, len(data), step)]
+        for case, min_bytes in (("pickled", len(data) + 1), ("shared", 1)):
+            with override_settings(TASK_SHARED_MEMORY_MIN_BYTES=min_bytes):
+                results[f"input/{case}/w{workers}"] = self.measure(
+                    f"input/{case}", workers, checksum, bounds, shared=data
+                )
+        shutdown_process_pool()
+
+        self.stdout.write(stats.format_table(results, COLUMNS))
+        stats.write_results(
+            options["output"],
+            results,
+            cpus=os.cpu_count(),
+            items=options["items"],
+            shared_mb=options["shared_mb"],
+        )
+        self.stdout.write(f"Results written to {options['output']}")
+
+    def measure(self, case, workers, func, items, shared=None, fresh=False):
+        """Time one map_in_processes run over ``workers`` helpers"""
+        self.stdout.write(f"{case} with {workers} workers...")
+        items = list(items)
+        with override_settings(TASK_PROCESS_POOL_WORKERS=workers):
+            if fresh:
+                shutdown_process_pool()
+            else:
+                # Fork the pool first, only its use is measured
+                list(map_in_processes(echo, range(workers * 8)))
+            started = time.perf_counter()
+            list(map_in_processes(func, items, shared=shared))
+            elapsed = time.perf_counter() - started
+        return {
+            "operations": len(items),
+            "elapsed_ms": stats.ms(elapsed),
+            "throughput": round(len(items) / elapsed, 2),
+        }
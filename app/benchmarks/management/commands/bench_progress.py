@@ -0,0 +1,127 @@
+"""
+Benchmark the result backend writes saved by throttled progress reporting
+"""
+import os
+import time
+import uuid
+import shutil
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.celery import app as celery_app
+from benchmarks import stats
+from core.progress import ProgressReporter
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[2]
+COLUMNS = (
+    "updates", "writes", "saved", "saved_pct", "elapsed_s", "us_per_update",
+)
+
+
+class ReportingTask:
+    """The parts of a bound task a ProgressReporter uses"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.request = SimpleNamespace(id=str(uuid.uuid4()))
+
+    def update_state(self, task_id=None, state=None, meta=None):
+        self.backend.store_result(task_id or self.request.id, meta, state)
+
+
+class Command(BaseCommand):
+    """
+    Report progress for every item of a simulated long_running_task, once
+    per item and throttled as configured, against a real result backend
+    and report the writes saved. Uses Celery's file result backend in a
+    temporary folder unless --backend-url is given; publishing progress
+    is measured too when that is a Redis URL.
+    """
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=20000,
+            help="Items, hence progress updates, per run",
+        )
+        parser.add_argument(
+            "--work-ms",
+            type=float,
+            default=0.0,
+            help="Simulated processing time per item",
+        )
+        parser.add_argument(
+            "--backend-url",
+            help="Result backend, e.g. redis://localhost:6379/15",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=BENCHMARKS_DIR / "results" / "progress.json",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        directory = tempfile.mkdtemp(prefix="bench_progress-")
+        # Celery reads this variable before its configuration
+        os.environ["CELERY_RESULT_BACKEND"] = (
+            options["backend_url"] or f"file://{directory}"
+        )
+        backend = celery_app.backend
+
+        cases = {
+            "every_item": {"interval": 0, "step": 0, "pubsub": False},
+            "throttled": {"pubsub": False},
+        }
+        if hasattr(getattr(backend, "client", None), "publish"):
+            cases["throttled_pubsub"] = {"pubsub": True}
+
+        results = {}
+        try:
+            for case, throttling in cases.items():
+                self.stdout.write(f"{case} x{options['items']}...")
+                results[case] = self.run_case(
+                    backend,
+                    options["items"],
+                    options["work_ms"] / 1000,
+                    throttling,
+                )
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        self.stdout.write(stats.format_table(results, COLUMNS))
+        stats.write_results(
+            options["output"],
+            results,
+            backend=type(backend).__name__,
+            items=options["items"],
+            work_ms=options["work_ms"],
+            interval=settings.TASK_PROGRESS_INTERVAL,
+            step=settings.TASK_PROGRESS_STEP,
+        )
+        self.stdout.write(f"Results written to {options['output']}")
+
+    def run_case(self, backend, items, work, throttling):
+        task = ReportingTask(backend)
+        progress = ProgressReporter(task, items, **throttling)
+        started = time.perf_counter()
+        for current in range(1, items + 1):
+            progress.update(current)
+            if work:
+                time.sleep(work)
+        elapsed = time.perf_counter() - started - work * items
+        return {
+            "updates": progress.updates,
+            "writes": progress.writes,
+            "saved": progress.saved,
+            "saved_pct": round(100 * progress.saved / items, 2),
+            "elapsed_s": round(time.perf_counter() - started, 3),
+            "us_per_update": round(elapsed / items * 1e6, 2),
+        }
@@ -0,0 +1,50 @@
+"""
+Task start times recorded inside a benchmark worker.
+
+Imported only by workers started by ``manage.py bench_celery`` (through
+CELERY_IMPORTS in benchmarks.settings). Every pool process appends one
+``task_id, started`` line per task, as a wall-clock timestamp, to its own
+file in BENCH_TIMINGS_DIR, so the harness can tell how long each task
+waited between being published and starting.
+"""
+import os
+import time
+import threading
+from celery.signals import task_prerun
+from django.conf import settings
+
+
+_files = {}
+_lock = threading.Lock()
+
+
+def timings_file():
+    pid = os.getpid()
+    if pid not in _files:
+        path = os.path.join(settings.BENCH_TIMINGS_DIR, f"{pid}.tsv")
+        _files[pid] = open(path, "a", buffering=1)
+    return _files[pid]
+
+
+@task_prerun.connect
+def on_task_prerun(task_id=None, **kwargs):
+    started = time.time()
+    with _lock:
+        timings_file().write(f"{task_id}\t{started}\n")
+
+
+def read_start_times(directory):
+    """
+    ``{task_id: started}`` from every pool process. A task replaced by a
+    chord shares its id with the chord's callback, so the first start is
+    kept.
+    """
+    started = {}
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name)) as lines:
+            for line in lines:
+                fields = line.split()
+                if len(fields) == 2:
+                    task_id, at = fields[0], float(fields[1])
+                    started[task_id] = min(started.get(task_id, at), at)
+    return started
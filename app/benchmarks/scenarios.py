@@ -0,0 +1,189 @@
+"""
+HTTP benchmark scenarios for the users API and the health probe.
+
+Each scenario builds one request per iteration from a shared fixture (an
+active admin with a password and tokens, plus ``size`` other users whose
+details are read) and is timed from the client side. Requests are
+spread over ``concurrency`` client threads.
+"""
+import json
+import time
+import uuid
+import threading
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from benchmarks.stats import summarize
+
+
+PASSWORD = "benchpass123"
+
+
+class Fixture:
+    """Data every scenario reads, created through the ORM"""
+
+    def __init__(self, size):
+        User = get_user_model()
+        self.run_id = uuid.uuid4().hex[:8]
+        self.email = f"bench-{self.run_id}@bench.local"
+        self.user = User.objects.create_user(
+            email=self.email,
+            password=PASSWORD,
+            is_active=True,
+            is_staff=True,
+        )
+        members = User.objects.bulk_create(
+            (
+                User(
+                    email=f"member-{self.run_id}-{number}@bench.local",
+                    first_name="Member",
+                    last_name=str(number),
+                )
+                for number in range(size)
+            ),
+            batch_size=500,
+        )
+        # Users no request has read yet, so their responses are not cached
+        self.unread_members = iter([str(member.pk) for member in members])
+        refresh = RefreshToken.for_user(self.user)
+        self.refresh = str(refresh)
+        self.access = str(refresh.access_token)
+
+
+class Scenario:
+    """
+    ``build(fixture, iteration)`` returns the ``(body, headers)`` of one
+    request, the body as a JSON-serializable object or None. ``path`` is
+    a string or, when it varies, ``path(fixture, iteration)``. ``writes``
+    marks scenarios that write to the database.
+    """
+
+    def __init__(
+        self, name, method, path, build, expected_status=200, writes=False
+    ):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.build = build
+        self.expected_status = expected_status
+        self.writes = writes
+
+    def send(self, driver, fixture, iteration):
+        body, headers = self.build(fixture, iteration)
+        payload = json.dumps(body).encode() if body is not None else b""
+        path = self.path
+        if callable(path):
+            path = path(fixture, iteration)
+        status, _ = driver.request(self.method, path, payload, headers)
+        return status == self.expected_status
+
+
+def bearer(fixture):
+    return {"Authorization": f"Bearer {fixture.access}"}
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            "signup",
+            "POST",
+            "/users/",
+            lambda fixture, iteration: (
+                {
+                    "email": (
+                        f"signup-{fixture.run_id}-{uuid.uuid4().hex}"
+                        "@bench.local"
+                    ),
+                    "password": PASSWORD,
+                    "first_name": "Bench",
+                },
+                {},
+            ),
+            expected_status=201,
+            writes=True,
+        ),
+        Scenario(
+            "token_obtain",
+            "POST",
+            "/users/token/",
+            lambda fixture, iteration: (
+                {"email": fixture.email, "password": PASSWORD}, {}
+            ),
+        ),
+        Scenario(
+            "token_refresh",
+            "POST",
+            "/users/token/refresh/",
+            lambda fixture, iteration: ({"refresh": fixture.refresh}, {}),
+        ),
+        Scenario(
+            "profile",
+            "GET",
+            "/users/me/",
+            lambda fixture, iteration: (None, bearer(fixture)),
+        ),
+        # The same user every time, served from the response cache
+        Scenario(
+            "user_detail_cached",
+            "GET",
+            lambda fixture, iteration: f"/users/{fixture.user.pk}/",
+            lambda fixture, iteration: (None, {}),
+        ),
+        # A user not read before every time, so every response is built.
+        # Needs --users above the requests of all modes and runs.
+        Scenario(
+            "user_detail_uncached",
+            "GET",
+            lambda fixture, iteration: (
+                f"/users/{next(fixture.unread_members)}/"
+            ),
+            lambda fixture, iteration: (None, {}),
+        ),
+        Scenario(
+            "health",
+            "GET",
+            "/health/",
+            lambda fixture, iteration: (None, {}),
+        ),
+    )
+}
+
+
+def run(driver, scenario, fixture, requests, concurrency, warmup=0):
+    """
+    Send ``warmup`` untimed then ``requests`` timed requests from
+    ``concurrency`` threads and summarize them
+    """
+    for iteration in range(warmup):
+        scenario.send(driver, fixture, iteration)
+
+    latencies = []
+    errors = []
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                iteration = next(counter, None)
+            if iteration is None:
+                return
+            started = time.perf_counter()
+            try:
+                ok = scenario.send(driver, fixture, iteration)
+            except Exception:
+                ok = False
+            latency = time.perf_counter() - started
+            with lock:
+                latencies.append(latency)
+                if not ok:
+                    errors.append(iteration)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - started, len(errors))
@@ -0,0 +1,24 @@
+"""
+Settings of the gunicorn process started by ``manage.py bench_http``, which
+serves the benchmark's database named in BENCH_DATABASE_NAME
+"""
+from decouple import config
+
+from app.settings import *  # noqa: F401,F403
+from app.settings import DATABASES
+
+DATABASES["default"]["NAME"] = config(
+    "BENCH_DATABASE_NAME", default=DATABASES["default"]["NAME"]
+)
+
+# Set by manage.py bench_celery for the worker it starts
+BENCH_BROKER_DIR = config("BENCH_BROKER_DIR", default="")
+BENCH_TIMINGS_DIR = config("BENCH_TIMINGS_DIR", default="")
+
+if BENCH_BROKER_DIR:
+    from benchmarks.workers import transport_options
+
+    CELERY_BROKER_TRANSPORT_OPTIONS = transport_options(BENCH_BROKER_DIR)
+
+if BENCH_TIMINGS_DIR:
+    CELERY_IMPORTS = ("benchmarks.probes",)
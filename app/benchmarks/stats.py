@@ -0,0 +1,144 @@
+"""
+Latency summaries and baseline comparison shared by the benchmarks.
+
+A result is a flat dict of numbers per case (``throughput`` in operations
+per second and latency percentiles in milliseconds), from one run or the
+median of several. Results are written as JSON next to the environment
+they were measured in and compared case by case against a committed
+baseline.
+"""
+import json
+import math
+import platform
+import statistics
+from datetime import datetime, timezone
+
+
+# Metric name -> whether a higher value is better. p95 and p99 rest on the
+# few slowest requests of a run, which scheduling alone moves by more than
+# any useful threshold, so they are reported but not compared.
+COMPARED_METRICS = {
+    "throughput": True,
+    "p50_ms": False,
+}
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty list"""
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def percentiles_ms(latencies, prefix=""):
+    """p50, p95 and p99 of ``latencies`` (in seconds) in milliseconds"""
+    ordered = sorted(latencies)
+    if not ordered:
+        return {}
+    return {
+        f"{prefix}p{round(fraction * 100)}_ms": ms(
+            percentile(ordered, fraction)
+        )
+        for fraction in (0.50, 0.95, 0.99)
+    }
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Throughput and latency percentiles of ``latencies`` (in seconds)"""
+    if not latencies:
+        return {"operations": 0, "errors": errors}
+    return {
+        "operations": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": ms(sum(latencies) / len(latencies)),
+        **percentiles_ms(latencies),
+        "max_ms": ms(max(latencies)),
+    }
+
+
+def median_summary(summaries):
+    """
+    One summary of several runs of a case: the median of every metric,
+    which a single slow run cannot move, and the errors of all runs
+    """
+    metrics = {name for summary in summaries for name in summary}
+    combined = {}
+    for name in sorted(metrics):
+        values = [summary[name] for summary in summaries if name in summary]
+        if name == "errors":
+            combined[name] = sum(values)
+        else:
+            combined[name] = round(statistics.median(values), 3)
+    combined["runs"] = len(summaries)
+    return combined
+
+
+def environment(**extra):
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        **extra,
+    }
+
+
+def write_results(path, results, **extra):
+    """Write ``results`` with the environment they were measured in"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(**extra),
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+    return document
+
+
+def load_results(path):
+    """Results stored at ``path``, empty when there is no such file"""
+    try:
+        return json.loads(path.read_text()).get("results", {})
+    except FileNotFoundError:
+        return {}
+
+
+def compare(results, baseline, threshold):
+    """
+    Regressions of ``results`` against ``baseline``, as
+    ``(case, metric, baseline value, value, change)`` tuples. A metric
+    regresses when it is worse by more than ``threshold`` (a fraction);
+    cases or metrics missing from either side are not compared.
+    """
+    regressions = []
+    for case, metrics in sorted(results.items()):
+        reference = baseline.get(case, {})
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = reference.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append((case, metric, old, new, change))
+    return regressions
+
+
+def format_table(results, columns):
+    """Plain text table of ``results`` with one row per case"""
+    header = ["case", *columns]
+    rows = [
+        [case, *(str(metrics.get(column, "-")) for column in columns)]
+        for case, metrics in sorted(results.items())
+    ]
+    widths = [
+        max(len(row[index]) for row in [header, *rows])
+        for index in range(len(header))
+    ]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths))
+        for row in [header, *rows]
+    )
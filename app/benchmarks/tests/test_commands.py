@@ -0,0 +1,78 @@
+"""
+Smoke tests running the benchmark commands on a tiny workload
+"""
+import os
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from contextlib import nullcontext
+from unittest.mock import patch
+from django.test import TestCase
+from django.core.management import CommandError, call_command
+
+
+class BenchmarkCommandTests(TestCase):
+    """Each benchmark command must run end to end"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp(prefix="bench-test-")
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.output = Path(directory) / "results.json"
+
+    def run_command(self, name, *args):
+        call_command(
+            name, *args, "--output", str(self.output), stdout=StringIO()
+        )
+        return json.loads(self.output.read_text())["results"]
+
+    @patch.dict(os.environ)
+    @patch(
+        "benchmarks.management.commands.bench_http.throwaway_database",
+        return_value=nullcontext(),
+    )
+    @patch(
+        "benchmarks.management.commands.bench_http.Command.benchmark",
+        return_value={"wsgi/health": {"operations": 10, "errors": 1}},
+    )
+    def test_bench_http_fails_on_errors(self, mock_benchmark, mock_database):
+        """Test that failed requests fail the run and are no baseline"""
+        baseline = self.output.with_name("baseline.json")
+        for args in ((), ("--update-baseline",)):
+            with self.assertRaisesMessage(
+                CommandError, "Requests failed in wsgi/health"
+            ):
+                call_command(
+                    "bench_http",
+                    *args,
+                    "--output",
+                    str(self.output),
+                    "--baseline",
+                    str(baseline),
+                    stdout=StringIO(),
+                )
+
+        self.assertFalse(baseline.exists())
+
+    @patch(
+        "benchmarks.management.commands.bench_login.throwaway_database",
+        return_value=nullcontext(),
+    )
+    def test_bench_login(self, mock_database):
+        """Test that both login flows are measured against each other"""
+        results = self.run_command("bench_login", "--logins", "1")
+
+        self.assertEqual(
+            set(results), {"check_then_authenticate", "single_pass"}
+        )
+        self.assertEqual(results["check_then_authenticate"]["ratio"], 1.0)
+
+    @patch.dict(os.environ)
+    def test_bench_progress(self):
+        """Test that throttling saves writes against a real result backend"""
+        results = self.run_command("bench_progress", "--items", "1000")
+
+        self.assertEqual(results["every_item"]["saved"], 0)
+        self.assertEqual(results["throttled"]["updates"], 1000)
+        self.assertLess(results["throttled"]["writes"], 1000)
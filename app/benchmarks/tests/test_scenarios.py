@@ -0,0 +1,73 @@
+import json
+from django.test import SimpleTestCase
+
+from benchmarks.drivers import WSGIDriver
+from benchmarks.scenarios import SCENARIOS, Scenario, run
+
+
+class FakeDriver:
+    def __init__(self, statuses):
+        self.statuses = iter(statuses)
+        self.requests = []
+
+    def request(self, method, path, body=b"", headers=None):
+        self.requests.append((method, path, body, headers))
+        return next(self.statuses), b""
+
+
+class RunTests(SimpleTestCase):
+    """Test suite for the HTTP benchmark runner"""
+
+    def test_run_counts_requests_and_errors(self):
+        """Test that warmup is untimed and unexpected statuses are errors"""
+        driver = FakeDriver([200, 200] + [200] * 8 + [500, 503])
+
+        summary = run(
+            driver, SCENARIOS["health"], None, requests=10,
+            concurrency=3, warmup=2,
+        )
+
+        self.assertEqual(len(driver.requests), 12)
+        self.assertEqual(summary["operations"], 10)
+        self.assertEqual(summary["errors"], 2)
+
+    def test_scenario_sends_json_body(self):
+        """Test that a scenario serializes its body and headers"""
+        scenario = Scenario(
+            "echo", "POST", "/echo/",
+            lambda fixture, iteration: ({"n": iteration}, {"X-Test": "1"}),
+        )
+        driver = FakeDriver([200])
+
+        self.assertTrue(scenario.send(driver, None, 7))
+        body = json.dumps({"n": 7}).encode()
+        self.assertEqual(
+            driver.requests, [("POST", "/echo/", body, {"X-Test": "1"})]
+        )
+
+    def test_scenario_path_per_iteration(self):
+        """Test that a callable path is built for every request"""
+        scenario = Scenario(
+            "item", "GET", lambda fixture, iteration: f"/items/{iteration}/",
+            lambda fixture, iteration: (None, {}),
+        )
+        driver = FakeDriver([200, 200])
+
+        scenario.send(driver, None, 1)
+        scenario.send(driver, None, 2)
+
+        self.assertEqual(
+            [request[1] for request in driver.requests],
+            ["/items/1/", "/items/2/"],
+        )
+
+
+class WSGIDriverTests(SimpleTestCase):
+    """Test suite for the in-process WSGI driver"""
+
+    def test_request_goes_through_the_wsgi_application(self):
+        """Test that the driver returns the status and body of a view"""
+        status, body = WSGIDriver().request("GET", "/health/live/")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {"status": "alive"})
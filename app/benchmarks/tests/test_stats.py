@@ -0,0 +1,76 @@
+from django.test import SimpleTestCase
+
+from benchmarks.stats import compare, median_summary, percentile, summarize
+
+
+class StatsTests(SimpleTestCase):
+    """Test suite for the benchmark summaries and baseline comparison"""
+
+    def test_percentile_nearest_rank(self):
+        """Test that percentiles pick the nearest rank"""
+        ordered = list(range(1, 101))
+
+        self.assertEqual(percentile(ordered, 0.50), 50)
+        self.assertEqual(percentile(ordered, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_summarize(self):
+        """Test throughput and latency percentiles in milliseconds"""
+        summary = summarize([0.001 * n for n in range(1, 101)], 2.0, 3)
+
+        self.assertEqual(summary["operations"], 100)
+        self.assertEqual(summary["errors"], 3)
+        self.assertEqual(summary["throughput"], 50.0)
+        self.assertEqual(summary["p50_ms"], 50.0)
+        self.assertEqual(summary["p95_ms"], 95.0)
+        self.assertEqual(summary["max_ms"], 100.0)
+
+    def test_summarize_nothing(self):
+        """Test that a run without operations has no percentiles"""
+        self.assertEqual(
+            summarize([], 1.0, 2), {"operations": 0, "errors": 2}
+        )
+
+    def test_median_summary(self):
+        """Test that runs combine into medians and their total errors"""
+        summaries = [
+            {"operations": 10, "errors": 0, "p50_ms": 2.0},
+            {"operations": 10, "errors": 1, "p50_ms": 9.0},
+            {"operations": 10, "errors": 0, "p50_ms": 3.0},
+        ]
+
+        self.assertEqual(
+            median_summary(summaries),
+            {"operations": 10, "errors": 1, "p50_ms": 3.0, "runs": 3},
+        )
+
+    def test_compare_flags_regressions_past_threshold(self):
+        """Test that only metrics worse than the threshold regress"""
+        baseline = {"wsgi/health": {"throughput": 1000, "p50_ms": 2.0}}
+        results = {"wsgi/health": {"throughput": 850, "p50_ms": 2.6}}
+
+        regressions = compare(results, baseline, 0.2)
+
+        self.assertEqual(len(regressions), 1)
+        case, metric, old, new, change = regressions[0]
+        self.assertEqual(
+            (case, metric, old, new), ("wsgi/health", "p50_ms", 2.0, 2.6)
+        )
+        self.assertAlmostEqual(change, 0.3)
+
+    def test_compare_ignores_tail_percentiles(self):
+        """Test that p95 and p99 are reported but never regress"""
+        baseline = {"wsgi/health": {"p95_ms": 2.0, "p99_ms": 2.0}}
+        results = {"wsgi/health": {"p95_ms": 4.0, "p99_ms": 8.0}}
+
+        self.assertEqual(compare(results, baseline, 0.2), [])
+
+    def test_compare_ignores_improvements_and_new_cases(self):
+        """Test that faster results and unknown cases never regress"""
+        baseline = {"wsgi/health": {"throughput": 1000, "p95_ms": 2.0}}
+        results = {
+            "wsgi/health": {"throughput": 2000, "p95_ms": 1.0},
+            "wsgi/signup": {"throughput": 1, "p95_ms": 900.0},
+        }
+
+        self.assertEqual(compare(results, baseline, 0.2), [])
@@ -0,0 +1,79 @@
+import os
+import tempfile
+from datetime import datetime, timezone
+from celery.backends.filesystem import FilesystemBackend
+from django.test import SimpleTestCase
+
+from app.celery import app as celery_app
+from benchmarks.management.commands.bench_celery import Command, task_count
+from benchmarks.probes import read_start_times
+from benchmarks.workers import done_at, wait_for_results
+
+
+class CeleryBenchmarkTests(SimpleTestCase):
+    """Test suite for the Celery worker benchmark harness"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_task_count(self):
+        """Test that counts accept short and full task names"""
+        self.assertEqual(task_count("add=20"), ("core.tasks.add", 20))
+        self.assertEqual(
+            task_count("core.tasks.long_running_task=3"),
+            ("core.tasks.long_running_task", 3),
+        )
+        for value in ("add", "add=x", "unknown=3"):
+            with self.assertRaises(ValueError):
+                task_count(value)
+
+    def test_configurations_run_solo_once_per_prefetch(self):
+        """Test that the solo pool is not swept over concurrency"""
+        configurations = Command().configurations(
+            {"pool": None, "concurrency": [1, 4], "prefetch": [1, 8]}
+        )
+
+        self.assertIn(("prefork", 4, 8), configurations)
+        self.assertIn(("threads", 1, 1), configurations)
+        self.assertEqual(
+            [c for c in configurations if c[0] == "solo"],
+            [("solo", 1, 1), ("solo", 1, 8)],
+        )
+
+    def test_read_start_times(self):
+        """Test that start times are merged across pool processes"""
+        for pid, lines in ((1, "a\t10.5\n"), (2, "b\t11.0\na\t12\nc\t")):
+            path = os.path.join(self.directory.name, f"{pid}.tsv")
+            with open(path, "w") as timings:
+                timings.write(lines)
+
+        self.assertEqual(
+            read_start_times(self.directory.name), {"a": 10.5, "b": 11.0}
+        )
+
+    def test_done_at(self):
+        """Test that naive and serialized completion times are UTC"""
+        done = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+        self.assertEqual(
+            done_at({"date_done": done.replace(tzinfo=None)}),
+            done.timestamp(),
+        )
+        self.assertEqual(
+            done_at({"date_done": done.isoformat()}), done.timestamp()
+        )
+
+    def test_wait_for_results_from_files(self):
+        """Test that ready results are yielded and missing ones time out"""
+        backend = FilesystemBackend(
+            app=celery_app, url=f"file://{self.directory.name}"
+        )
+        backend.mark_as_done("done", 4)
+        backend.mark_as_started("started")
+
+        ready = wait_for_results(backend, ["done", "started"], timeout=0.05)
+        task_id, _, meta = next(ready)
+        self.assertEqual((task_id, meta["result"]), ("done", 4))
+        with self.assertRaises(TimeoutError):
+            next(ready)
@@ -0,0 +1,222 @@
+"""
+Celery worker benchmark harness.
+
+A real ``celery worker`` is started on this machine for each pool,
+concurrency and prefetch setting. By default it talks to kombu's
+filesystem transport and Celery's file result backend in a temporary
+folder, so no broker or Redis is needed; any broker URL the worker can
+reach may be used instead. The worker runs with benchmarks.settings, whose
+probe (benchmarks.probes) records when each task started; together with
+the publish time, the result's ``date_done`` and the fetch time seen here
+it splits a task's latency into enqueue to start, run, and result fetch.
+"""
+import os
+import sys
+import time
+import uuid
+import subprocess
+from datetime import timezone
+from celery import states
+from celery.backends.filesystem import FilesystemBackend
+from celery.exceptions import TimeoutError as ResultTimeoutError
+from kombu.exceptions import DecodeError
+from kombu.transport import filesystem
+from kombu.utils.json import dumps
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+from app.monitor import queue_names
+from benchmarks.probes import read_start_times
+from benchmarks.stats import percentiles_ms, summarize
+
+
+class AtomicChannel(filesystem.Channel):
+    """
+    Writes each message under a temporary name and renames it into the
+    queue. The stock channel creates the final file before writing it, so
+    a worker polling the folder can take and drop a half written message.
+    """
+
+    def _put(self, queue, payload, **kwargs):
+        # Named like the stock channel's files, which sort by age
+        filename = (
+            f"{round(time.monotonic() * 1000)}_{uuid.uuid4()}.{queue}.msg"
+        )
+        staging = os.path.join(self.data_folder_out, f"{uuid.uuid4()}.tmp")
+        with open(staging, "wb") as message:
+            message.write(dumps(payload).encode())
+        os.rename(staging, os.path.join(self.data_folder_out, filename))
+
+
+class AtomicFilesystemTransport(filesystem.Transport):
+    Channel = AtomicChannel
+
+
+def transport_options(directory):
+    """Filesystem transport options for a broker living in ``directory``"""
+    queue = os.path.join(directory, "queue")
+    return {
+        "data_folder_in": queue,
+        "data_folder_out": queue,
+        "control_folder": os.path.join(directory, "control"),
+        # Empty queues are polled this often, in seconds
+        "polling_interval": 0.01,
+    }
+
+
+def broker_environment(directory):
+    """Environment pointing Celery at the stand-in broker and backend"""
+    results = os.path.join(directory, "results")
+    for path in (*transport_options(directory).values(), results):
+        if isinstance(path, str):
+            os.makedirs(path, exist_ok=True)
+    return {
+        "CELERY_BROKER_URL": "filesystem://",
+        "CELERY_RESULT_BACKEND": f"file://{results}",
+        "BENCH_BROKER_DIR": directory,
+    }
+
+
+class WorkerProcess:
+    def __init__(self, pool, concurrency, prefetch, directory, verbose=False):
+        self.pool = pool
+        self.concurrency = concurrency
+        self.prefetch = prefetch
+        self.directory = directory
+        self.timings_dir = os.path.join(
+            directory, "timings", f"{pool}-{concurrency}-{prefetch}"
+        )
+        self.verbose = verbose
+        self.process = None
+
+    def start(self, app):
+        """Start the worker and wait until it has run a task"""
+        os.makedirs(self.timings_dir, exist_ok=True)
+        output = None if self.verbose else subprocess.DEVNULL
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "celery", "-A", "app", "worker",
+                "--pool", self.pool,
+                "--concurrency", str(self.concurrency),
+                "--prefetch-multiplier", str(self.prefetch),
+                "--queues", ",".join(queue_names(app)),
+                "--loglevel", "WARNING",
+                "--without-mingle",
+                "--without-gossip",
+            ],
+            cwd=settings.BASE_DIR,
+            # The broker variables set by the caller are inherited
+            env={
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": "benchmarks.settings",
+                "BENCH_TIMINGS_DIR": self.timings_dir,
+            },
+            stdout=output,
+            stderr=output,
+        )
+        result = app.send_task("core.tasks.add", (0, 0))
+        try:
+            for _ in wait_for_results(app.backend, [result.id], timeout=60):
+                pass
+        except TimeoutError:
+            self.stop()
+            raise RuntimeError(f"{self.pool} worker did not start within 60s")
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+def wait_for_results(backend, task_ids, timeout, interval=0.005):
+    """Yield ``(task_id, fetched_at, meta)`` as each task becomes ready"""
+    if not isinstance(backend, FilesystemBackend):
+        try:
+            for task_id, meta in backend.get_many(
+                task_ids, timeout=timeout, interval=interval
+            ):
+                yield task_id, time.time(), meta
+        except ResultTimeoutError as e:
+            raise TimeoutError(str(e))
+        return
+
+    # Only result files that exist are read, and one written while being
+    # read is retried on the next pass
+    pending = {
+        backend.get_key_for_task(task_id): task_id for task_id in task_ids
+    }
+    deadline = time.monotonic() + timeout
+    while pending:
+        written = set(os.listdir(backend.path))
+        for key in [key for key in pending if key in written]:
+            try:
+                meta = backend.decode_result(backend.get(key))
+            except DecodeError:
+                continue
+            if meta["status"] in states.READY_STATES:
+                yield pending.pop(key), time.time(), meta
+        if pending and time.monotonic() > deadline:
+            raise TimeoutError(f"{len(pending)} tasks still pending")
+        time.sleep(interval)
+
+
+def done_at(meta):
+    """When the worker stored the result, as a timestamp"""
+    done = meta["date_done"]
+    if isinstance(done, str):
+        done = parse_datetime(done)
+    if done.tzinfo is None:
+        done = done.replace(tzinfo=timezone.utc)
+    return done.timestamp()
+
+
+def run_case(app, task_name, arguments, count, worker, timeout):
+    """
+    Publish ``count`` tasks, fetch every result and summarize end-to-end
+    latency, enqueue to start latency and result fetch latency
+    """
+    published = {}
+    first = time.time()
+    for number in range(count):
+        sent = time.time()
+        result = app.send_task(task_name, arguments(number))
+        published[result.id] = sent
+
+    fetched = {}
+    stored = {}
+    failures = 0
+    for task_id, fetched_at, meta in wait_for_results(
+        app.backend, list(published), timeout
+    ):
+        fetched[task_id] = fetched_at
+        stored[task_id] = done_at(meta)
+        failures += meta["status"] != states.SUCCESS
+    elapsed = max(fetched.values()) - first
+
+    started = read_start_times(worker.timings_dir)
+    summary = summarize(
+        [fetched[task_id] - sent for task_id, sent in published.items()],
+        elapsed,
+        failures,
+    )
+    summary.update(
+        percentiles_ms(
+            [
+                started[task_id] - sent
+                for task_id, sent in published.items()
+                if task_id in started
+            ],
+            "queue_wait_",
+        )
+    )
+    summary.update(
+        percentiles_ms(
+            [fetched[task_id] - stored[task_id] for task_id in published],
+            "fetch_",
+        )
+    )
+    return summary
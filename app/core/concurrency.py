@@ -0,0 +1,203 @@
+"""
+Concurrent execution of I/O bound items inside a single task.
+
+``run_concurrently`` calls a ``process_item``-style function on every item
+with at most ``concurrency`` calls in flight: on a bounded thread pool, or
+as coroutines on an event loop of its own when the function is a
+coroutine function. Results stream back as ``(index, result)`` pairs in
+item order or, with ``ordered=False``, as they complete, so a task can
+report progress and keep memory flat while later items still run.
+
+Each call is bounded by ``timeout`` seconds from when it started (an
+expired coroutine is cancelled; an expired thread cannot be interrupted
+and keeps its slot until it returns) and fails with ``TimeoutError``.
+Given the running task, the whole run is bounded by its soft time limit
+(CELERY_TASK_SOFT_TIME_LIMIT unless set on the task or call): once it
+passes, outstanding calls are abandoned and SoftTimeLimitExceeded is
+raised in the task, as the prefork pool would, so the task handles it the
+same way under every pool.
+"""
+import time
+import asyncio
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait as wait_futures,
+)
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+
+from app.instrumentation import started_at
+
+
+def soft_deadline(task):
+    """``perf_counter()`` value at which ``task`` reaches its soft limit"""
+    if task is None:
+        return None
+    limit = (
+        (task.request.timelimit or (None, None))[1]
+        or task.soft_time_limit
+        or task.app.conf.task_soft_time_limit
+    )
+    if not limit:
+        return None
+    started = started_at(task.request.id)
+    return (time.perf_counter() if started is None else started) + limit
+
+
+class ThreadRunner:
+    """Calls on a pool of ``concurrency`` threads"""
+
+    def __init__(self, func, concurrency, timeout):
+        self.func = func
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="task-io"
+        )
+        self.started = {}
+
+    def _call(self, index, item):
+        self.started[index] = time.perf_counter()
+        return self.func(item)
+
+    def submit(self, index, item):
+        return self.executor.submit(self._call, index, item)
+
+    def wait(self, futures, timeout):
+        return wait_futures(
+            futures, timeout=timeout, return_when=FIRST_COMPLETED
+        ).done
+
+    def expiries(self, running):
+        """``(expiry, future)`` for every started call"""
+        if not self.timeout:
+            return []
+        return [
+            (self.started[index] + self.timeout, future)
+            for future, index in running.items()
+            if index in self.started
+        ]
+
+    def close(self, running):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncRunner:
+    """Calls as coroutines on a private event loop"""
+
+    def __init__(self, func, concurrency, timeout):
+        self.func = func
+        self.timeout = timeout
+        self.loop = asyncio.new_event_loop()
+
+    async def _call(self, item):
+        try:
+            return await asyncio.wait_for(self.func(item), self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Item timed out after {self.timeout}s")
+
+    def submit(self, index, item):
+        return self.loop.create_task(self._call(item))
+
+    def wait(self, futures, timeout):
+        done, _ = self.loop.run_until_complete(
+            asyncio.wait(
+                futures, timeout=timeout, return_when=FIRST_COMPLETED
+            )
+        )
+        return done
+
+    def expiries(self, running):
+        # Expired coroutines are cancelled by wait_for
+        return []
+
+    def close(self, running):
+        for future in running:
+            future.cancel()
+        if running:
+            self.loop.run_until_complete(asyncio.wait(list(running)))
+        self.loop.close()
+
+
+def run_concurrently(
+    func,
+    items,
+    concurrency=None,
+    timeout=None,
+    ordered=True,
+    return_exceptions=False,
+    task=None,
+):
+    """
+    Yield ``(index, result)`` for every item of ``items`` once
+    ``func(item)`` returned. ``concurrency`` and ``timeout`` default to
+    TASK_IO_CONCURRENCY and TASK_IO_TIMEOUT (0 means no timeout). A call
+    that raised or timed out raises its exception when its turn comes,
+    unless ``return_exceptions`` yields it as the result. ``task`` is the
+    running bound task whose soft time limit bounds the run.
+    """
+    if concurrency is None:
+        concurrency = settings.TASK_IO_CONCURRENCY
+    if timeout is None:
+        timeout = settings.TASK_IO_TIMEOUT or None
+    deadline = soft_deadline(task)
+    runner_class = (
+        AsyncRunner if asyncio.iscoroutinefunction(func) else ThreadRunner
+    )
+    runner = runner_class(func, max(concurrency, 1), timeout)
+
+    pending = iter(enumerate(items))
+    running = {}
+    finished = {}
+    next_index = 0
+    try:
+        while True:
+            while len(running) < max(concurrency, 1):
+                entry = next(pending, None)
+                if entry is None:
+                    break
+                running[runner.submit(*entry)] = entry[0]
+            if not running:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                raise SoftTimeLimitExceeded()
+
+            wakeups = [expiry for expiry, _ in runner.expiries(running)]
+            if deadline is not None:
+                wakeups.append(deadline)
+            wait = None
+            if wakeups:
+                wait = max(min(wakeups) - time.perf_counter(), 0)
+            done = runner.wait(list(running), wait)
+
+            now = time.perf_counter()
+            outcomes = []
+            for future in done:
+                error = future.exception()
+                outcomes.append(
+                    (running.pop(future), error, error or future.result())
+                )
+            for expiry, future in runner.expiries(running):
+                if expiry <= now and future not in done:
+                    error = TimeoutError(f"Item timed out after {timeout}s")
+                    outcomes.append((running.pop(future), error, error))
+
+            for index, error, result in sorted(outcomes, key=_index):
+                if ordered:
+                    finished[index] = (error, result)
+                    continue
+                if error is not None and not return_exceptions:
+                    raise error
+                yield index, result
+            while next_index in finished:
+                error, result = finished.pop(next_index)
+                if error is not None and not return_exceptions:
+                    raise error
+                yield next_index, result
+                next_index += 1
+    finally:
+        runner.close(running)
+
+
+def _index(outcome):
+    return outcome[0]
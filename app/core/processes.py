@@ -0,0 +1,151 @@
+"""
+Per-process pool of helper processes for CPU-bound task items.
+
+Threads do not speed up pure Python work because of the GIL, and more
+Celery worker processes each import Django again. A task that opts in
+with ``map_in_processes`` instead hands its items to up to
+TASK_PROCESS_POOL_WORKERS helpers forked from a forkserver: a single
+threaded process, started with the task modules already imported, that
+holds none of the worker's locks, threads or database and broker
+sockets. Forking the worker itself is unsafe once it runs threads, as the
+thread pools and Celery's own timers do. The pool is created on first
+use and reused by every later task of the same worker process until it
+shuts down.
+
+Items are submitted in chunks, about four per helper, so the pickling and
+queue round trip is paid per chunk rather than per item. A large input
+shared by every item (``shared``, bytes-like) is copied once into a shared
+memory block that helpers read in place instead of receiving a pickled
+copy with every chunk. Helpers must not use the ORM.
+"""
+import os
+import threading
+import multiprocessing
+from functools import partial
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from concurrent.futures import ProcessPoolExecutor
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+
+
+CHUNKS_PER_WORKER = 4
+# Imported once by the forkserver rather than by every helper
+PRELOAD = ["core.tasks"]
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    """Return this process's helper pool, creating it on first use"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        # A pool whose helper died cannot be used again
+        broken = getattr(_pool, "_broken", False)
+        if _pool is None or _pool_pid != os.getpid() or broken:
+            # The forkserver also hands helpers this process's tracker of
+            # shared memory blocks, so they do not "clean up" the blocks
+            # they merely attach to
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(PRELOAD)
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.TASK_PROCESS_POOL_WORKERS,
+                mp_context=context,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+@contextmanager
+def allow_children():
+    """
+    Let this process start helpers even when it is daemonic, as Celery's
+    prefork pool processes are: the helpers are shut down with it instead.
+    The flag is process wide, so threads take turns toggling it.
+    """
+    config = multiprocessing.current_process()._config
+    with _pool_lock:
+        daemon = config.pop("daemon", None)
+        try:
+            yield
+        finally:
+            if daemon is not None:
+                config["daemon"] = daemon
+
+
+@worker_process_shutdown.connect
+def shutdown_process_pool(**kwargs):
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def chunked(items, size):
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+class SharedBlock:
+    """Name and size of an input copied into shared memory"""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+
+def _run_chunk(func, shared, items):
+    """Run in a helper: ``func`` on every item, with the shared input"""
+    if shared is None:
+        return [func(item) for item in items]
+    if not isinstance(shared, SharedBlock):
+        return [func(shared, item) for item in items]
+
+    block = SharedMemory(name=shared.name)
+    view = block.buf[:shared.size].toreadonly()
+    try:
+        return [func(view, item) for item in items]
+    finally:
+        view.release()
+        block.close()
+
+
+def map_in_processes(func, items, shared=None, chunksize=None):
+    """
+    Yield ``func(item)`` for every item, in order, computed by the helper
+    pool; ``func(shared, item)`` when a ``shared`` input is given, which
+    arrives as a read-only memoryview once it is large enough to go
+    through shared memory. ``func`` must be a module level function. Runs
+    inline when TASK_PROCESS_POOL_WORKERS is below 2 or there are too few
+    items to be worth a round trip.
+    """
+    items = list(items)
+    workers = settings.TASK_PROCESS_POOL_WORKERS
+    if workers <= 1 or len(items) < settings.TASK_PROCESS_POOL_THRESHOLD:
+        yield from _run_chunk(func, shared, items)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (workers * CHUNKS_PER_WORKER))
+    block = None
+    if (
+        shared is not None
+        and len(shared) >= max(settings.TASK_SHARED_MEMORY_MIN_BYTES, 1)
+    ):
+        block = SharedMemory(create=True, size=len(shared))
+        block.buf[:len(shared)] = shared
+        shared = SharedBlock(block.name, len(shared))
+    try:
+        run = partial(_run_chunk, func, shared)
+        pool = get_process_pool()
+        # Helpers are started as the chunks are submitted
+        with allow_children():
+            chunks = pool.map(run, chunked(items, chunksize))
+        for results in chunks:
+            yield from results
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
@@ -0,0 +1,152 @@
+"""
+Throttled progress reporting for long running tasks.
+
+Writing a PROGRESS state for every item costs one result backend write
+per item. ``ProgressReporter`` coalesces updates instead: one is written
+only when progress moved by at least TASK_PROGRESS_STEP percent or
+TASK_PROGRESS_INTERVAL seconds passed since the last write, and the first
+and final updates are always written. With TASK_PROGRESS_PUBSUB progress
+is published on the task's ``task-progress:<task id>`` channel of the
+Redis result backend rather than overwriting its result key, so pollers
+of the result only ever see the outcome.
+
+A task fanned out in chunks reports through ``ChunkProgressReporter``
+from every chunk. The items done are added up in the shared cache and
+written as the parent task's progress, so its callers follow a single
+``current`` out of ``total`` whichever chunks run where.
+"""
+import json
+import time
+import logging
+from django.conf import settings
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "task-progress:"
+# Seconds a chunked task's shared item counter outlives its last update
+ROLLUP_TIMEOUT = 24 * 60 * 60
+
+
+def progress_channel(task_id):
+    """Pub/sub channel a task's progress is published on"""
+    return f"{CHANNEL_PREFIX}{task_id}"
+
+
+class ProgressReporter:
+    """
+    Report ``current`` out of ``total`` for ``task``, a bound task. A
+    ``step`` or ``interval`` of 0 writes every update. ``updates`` and
+    ``writes`` count the updates received and written.
+    """
+
+    def __init__(self, task, total, interval=None, step=None, pubsub=None):
+        self.task = task
+        self.total = total
+        self.interval = (
+            settings.TASK_PROGRESS_INTERVAL if interval is None else interval
+        )
+        self.step = settings.TASK_PROGRESS_STEP if step is None else step
+        if pubsub is None:
+            pubsub = settings.TASK_PROGRESS_PUBSUB
+        self.client = self._publisher() if pubsub else None
+        self.updates = 0
+        self.writes = 0
+        self._pending = None
+        self._written_at = None
+        self._written_percent = None
+
+    @property
+    def saved(self):
+        """Updates coalesced into a later write"""
+        return self.updates - self.writes
+
+    def _publisher(self):
+        client = getattr(self.task.backend, "client", None)
+        if not hasattr(client, "publish"):
+            logger.warning(
+                f"{type(self.task.backend).__name__} has no pub/sub, "
+                "progress is written to the result instead"
+            )
+            return None
+        return client
+
+    def percent(self, current):
+        return 100 * current / self.total if self.total else 100
+
+    def update(self, current, **meta):
+        """Record progress, writing it if it is due"""
+        self.updates += 1
+        self._pending = {"current": current, "total": self.total, **meta}
+        now = time.monotonic()
+        if (
+            self._written_at is None
+            or current >= self.total
+            or now - self._written_at >= self.interval
+            or self.percent(current) - self._written_percent >= self.step
+        ):
+            self.flush(now)
+
+    def flush(self, now=None):
+        """Write the latest update if it was coalesced"""
+        if self._pending is None:
+            return
+        meta, self._pending = self._pending, None
+        self.write(meta)
+        self.writes += 1
+        self._written_at = time.monotonic() if now is None else now
+        self._written_percent = self.percent(meta["current"])
+
+    def write(self, meta, task_id=None):
+        """Store or publish ``meta`` as the progress of ``task_id``"""
+        if self.client is not None:
+            self.client.publish(
+                progress_channel(task_id or self.task.request.id),
+                json.dumps({"state": "PROGRESS", "meta": meta}),
+            )
+        else:
+            self.task.update_state(
+                task_id=task_id, state="PROGRESS", meta=meta
+            )
+
+
+class ChunkProgressReporter(ProgressReporter):
+    """
+    Progress of one chunk of a fanned out task, rolled up into the
+    parent's: each write adds the items done since the previous one to a
+    counter shared by the chunks and reports the sum out of
+    ``parent_total`` as the parent task's progress.
+    """
+
+    def __init__(self, task, total, parent_id, parent_total, **kwargs):
+        super().__init__(task, total, **kwargs)
+        self.parent_id = parent_id
+        self.parent_total = parent_total
+        self.counted = 0
+
+    def write(self, meta, task_id=None):
+        done = self.count(meta["current"] - self.counted)
+        self.counted = meta["current"]
+        super().write(
+            {"current": done, "total": self.parent_total}, self.parent_id
+        )
+
+    def count(self, items):
+        key = rollup_key(self.parent_id)
+        cache.add(key, 0, ROLLUP_TIMEOUT)
+        return cache.incr(key, items)
+
+    def discard(self):
+        """Take back the items counted, before the chunk runs again"""
+        if self.counted:
+            self.count(-self.counted)
+            self.counted = 0
+
+
+def rollup_key(task_id):
+    return f"{CHANNEL_PREFIX}{task_id}:done"
+
+
+def clear_rollup(task_id):
+    cache.delete(rollup_key(task_id))
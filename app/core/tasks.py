@@ -3,8 +3,15 @@ from __future__ import absolute_import, unicode_literals
 
 import time
 import random
-from celery import shared_task
+import asyncio
+import hashlib
+from celery import chord, shared_task
 from celery.utils.log import get_task_logger
+from django.conf import settings
+
+from core.concurrency import run_concurrently
+from core.processes import map_in_processes
+from core.progress import ChunkProgressReporter, ProgressReporter, clear_rollup
 
 
 logger = get_task_logger(__name__)
@@ -17,6 +24,22 @@ def process_item(item):
     return f"processed_{item}"
 
 
+# Helper function for the CPU-bound task
+def crunch_item(item):
+    """Process an individual item (simulated computation)"""
+    digest = str(item).encode()
+    for _ in range(50000):
+        digest = hashlib.sha256(digest).digest()
+    return f"crunched_{item}_{digest.hex()[:8]}"
+
+
+# Non-blocking version of process_item for run_concurrently's event loop
+async def aprocess_item(item):
+    """Process an individual item (simulated I/O)"""
+    await asyncio.sleep(0.5)  # Simulate waiting on I/O
+    return f"processed_{item}"
+
+
 # Normal priority task (default queue)
 @shared_task
 def add(x, y):
@@ -39,19 +62,92 @@ def process_urgent_data(data):
 
 # Long-running task with progress tracking
 @shared_task(bind=True)
-def long_running_task(self, items):
-    """Task with progress tracking"""
+def long_running_task(self, items, chunk_size=None):
+    """Task with progress tracking, fanned out in chunks when large"""
+    if chunk_size is None:
+        chunk_size = settings.LONG_RUNNING_TASK_CHUNK_SIZE
     total = len(items)
+    if chunk_size and total > chunk_size:
+        # The chord's callback takes over this task's id and result
+        chunks = [
+            process_chunk.s(
+                items[start:start + chunk_size], self.request.id, total
+            )
+            for start in range(0, total, chunk_size)
+        ]
+        return self.replace(chord(chunks, collect_chunks.s()))
+
     results = []
+    # Coalesced to a few writes, see TASK_PROGRESS_INTERVAL and _STEP
+    progress = ProgressReporter(self, total)
     for i, item in enumerate(items, 1):
-        # Update progress state
-        self.update_state(
-            state="PROGRESS", meta={"current": i, "total": total}
-        )
+        progress.update(i)
         results.append(process_item(item))
     return {"result": results, "total_processed": total}
 
 
+# One chunk of a chunked long-running task, retried on its own
+@shared_task(
+    bind=True, autoretry_for=(Exception,), retry_backoff=True,
+    max_retries=3, retry_jitter=True
+)
+def process_chunk(self, items, parent_id, parent_total):
+    """Process a chunk, reporting progress on the parent task"""
+    progress = ChunkProgressReporter(self, len(items), parent_id, parent_total)
+    results = []
+    try:
+        for i, item in enumerate(items, 1):
+            results.append(process_item(item))
+            progress.update(i)
+    except Exception:
+        # The retry processes and counts the whole chunk again
+        progress.discard()
+        raise
+    return results
+
+
+@shared_task(bind=True)
+def collect_chunks(self, chunks):
+    """Join the chunk results of a long-running task in order"""
+    clear_rollup(self.request.id)
+    results = [result for chunk in chunks for result in chunk]
+    return {"result": results, "total_processed": len(results)}
+
+
+# I/O-bound task processing its items concurrently
+@shared_task(bind=True)
+def concurrent_io_task(self, items, use_asyncio=False):
+    """Task with concurrent items and progress tracking"""
+    total = len(items)
+    results = [None] * total
+    progress = ProgressReporter(self, total)
+    for done, (index, result) in enumerate(
+        run_concurrently(
+            aprocess_item if use_asyncio else process_item,
+            items,
+            ordered=False,
+            task=self,
+        ),
+        1,
+    ):
+        results[index] = result
+        progress.update(done)
+    return {"result": results, "total_processed": total}
+
+
+# CPU-bound task running its items on the worker's helper processes
+@shared_task(bind=True)
+def cpu_bound_task(self, items):
+    """Task with items computed in parallel and progress tracking"""
+    total = len(items)
+    results = []
+    progress = ProgressReporter(self, total)
+    for i, result in enumerate(map_in_processes(crunch_item, items), 1):
+        results.append(result)
+        progress.update(i)
+    return {"result": results, "total_processed": total}
+
+
 # Error handling task with retries
 @shared_task(
     autoretry_for=(Exception,), retry_backoff=True,
@@ -0,0 +1,198 @@
+"""
+Test concurrent execution of I/O bound task items
+"""
+import time
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+from celery.exceptions import SoftTimeLimitExceeded
+from django.test import SimpleTestCase, override_settings
+
+from core.concurrency import run_concurrently
+from core.tasks import concurrent_io_task
+
+
+class Tracker:
+    """Callables sleeping per item, recording how many ran at once"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.running = 0
+        self.most = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.running += 1
+            self.most = max(self.most, self.running)
+
+    def leave(self):
+        with self.lock:
+            self.running -= 1
+
+    def call(self, item):
+        self.enter()
+        try:
+            time.sleep(self.delays.get(item, 0.01))
+            if item == "boom":
+                raise ValueError(item)
+            return item.upper()
+        finally:
+            self.leave()
+
+    async def acall(self, item):
+        self.enter()
+        try:
+            await asyncio.sleep(self.delays.get(item, 0.01))
+            return item.upper()
+        finally:
+            self.leave()
+
+
+def soft_limited(seconds):
+    return SimpleNamespace(
+        request=SimpleNamespace(id="task-1", timelimit=(None, seconds)),
+        soft_time_limit=None,
+        app=None,
+    )
+
+
+@override_settings(TASK_IO_CONCURRENCY=4, TASK_IO_TIMEOUT=0)
+class RunConcurrentlyTests(SimpleTestCase):
+    """Test suite for run_concurrently"""
+
+    def test_ordered_with_bounded_threads(self):
+        """Test that results keep item order with at most 3 in flight"""
+        tracker = Tracker({"a": 0.05})
+        items = list("abcdefgh")
+
+        results = list(run_concurrently(tracker.call, items, concurrency=3))
+
+        self.assertEqual(results, list(enumerate("ABCDEFGH")))
+        self.assertEqual(tracker.most, 3)
+
+    def test_as_completed(self):
+        """Test that unordered results stream as calls complete"""
+        tracker = Tracker({"a": 0.2})
+
+        results = list(
+            run_concurrently(tracker.call, list("abc"), ordered=False)
+        )
+
+        self.assertEqual(results[-1], (0, "A"))
+        self.assertCountEqual(results, list(enumerate("ABC")))
+
+    def test_errors(self):
+        """Test that failures raise, or are returned when asked"""
+        tracker = Tracker()
+
+        with self.assertRaises(ValueError):
+            list(run_concurrently(tracker.call, ["a", "boom"]))
+        results = dict(
+            run_concurrently(
+                tracker.call, ["a", "boom"], return_exceptions=True
+            )
+        )
+        self.assertEqual(results[0], "A")
+        self.assertIsInstance(results[1], ValueError)
+
+    def test_thread_timeout(self):
+        """Test that a call running past the timeout fails alone"""
+        tracker = Tracker({"slow": 1.0})
+
+        results = dict(
+            run_concurrently(
+                tracker.call,
+                ["a", "slow", "b"],
+                timeout=0.1,
+                return_exceptions=True,
+            )
+        )
+
+        self.assertEqual((results[0], results[2]), ("A", "B"))
+        self.assertIsInstance(results[1], TimeoutError)
+
+    def test_coroutines(self):
+        """Test that coroutine functions run on an event loop, bounded"""
+        tracker = Tracker({"slow": 1.0})
+        items = ["a", "b", "slow", "c", "d", "e"]
+
+        results = dict(
+            run_concurrently(
+                tracker.acall,
+                items,
+                concurrency=2,
+                timeout=0.1,
+                return_exceptions=True,
+            )
+        )
+
+        self.assertEqual(tracker.most, 2)
+        self.assertEqual(tracker.running, 0)
+        self.assertIsInstance(results.pop(2), TimeoutError)
+        self.assertEqual(list(results.values()), list("ABCDE"))
+
+    def test_soft_time_limit(self):
+        """Test that the run stops at the task's soft time limit"""
+        tracker = Tracker({"a": 0.01, "b": 2.0})
+        results = run_concurrently(
+            tracker.call, ["a", "b"], task=soft_limited(0.2)
+        )
+
+        self.assertEqual(next(results), (0, "A"))
+        with self.assertRaises(SoftTimeLimitExceeded):
+            next(results)
+
+    def test_default_soft_time_limit(self):
+        """Test that CELERY_TASK_SOFT_TIME_LIMIT applies by default"""
+        task = concurrent_io_task
+        conf = task.app.conf
+        self.addCleanup(
+            conf.update,
+            CELERY_TASK_SOFT_TIME_LIMIT=conf.task_soft_time_limit,
+        )
+        conf.update(CELERY_TASK_SOFT_TIME_LIMIT=0.1)
+
+        with self.assertRaises(SoftTimeLimitExceeded):
+            list(run_concurrently(Tracker({"a": 1.0}).call, ["a"], task=task))
+
+
+@override_settings(TASK_IO_CONCURRENCY=10, TASK_PROGRESS_STEP=0)
+class ConcurrentIOTaskTests(SimpleTestCase):
+    """Test suite for concurrent_io_task"""
+
+    def run_task(self, use_asyncio):
+        items = [f"item-{number}" for number in range(10)]
+        with patch("core.tasks.asyncio.sleep", side_effect=fast_sleep), patch(
+            "core.tasks.time.sleep"
+        ), patch.object(concurrent_io_task, "update_state") as update_state:
+            result = concurrent_io_task.apply(
+                args=(items,), kwargs={"use_asyncio": use_asyncio}
+            ).get()
+        return items, result, update_state
+
+    def test_threads(self):
+        """Test that items are processed in order of the input"""
+        items, result, update_state = self.run_task(False)
+
+        self.assertEqual(
+            result["result"], [f"processed_{item}" for item in items]
+        )
+        self.assertEqual(update_state.call_count, 10)
+
+    def test_asyncio(self):
+        """Test that the async version of process_item is used"""
+        items, result, _ = self.run_task(True)
+
+        self.assertEqual(result["total_processed"], 10)
+        self.assertEqual(
+            result["result"], [f"processed_{item}" for item in items]
+        )
+
+
+_real_sleep = asyncio.sleep
+
+
+async def fast_sleep(seconds):
+    await _real_sleep(0)
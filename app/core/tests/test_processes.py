@@ -0,0 +1,136 @@
+"""
+Test the helper process pool for CPU-bound task items
+"""
+import os
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from unittest.mock import patch
+from django.test import SimpleTestCase, override_settings
+
+from core import processes
+from core.processes import (
+    allow_children,
+    chunked,
+    get_process_pool,
+    map_in_processes,
+    shutdown_process_pool,
+)
+from core.tasks import cpu_bound_task
+
+
+def square(number):
+    return number * number, os.getpid()
+
+
+def parent(number):
+    return os.getppid()
+
+
+def describe(data, number):
+    return type(data).__name__, data[number]
+
+
+@override_settings(TASK_PROCESS_POOL_WORKERS=2)
+class ProcessPoolTests(SimpleTestCase):
+    """Test suite for map_in_processes"""
+
+    def setUp(self):
+        self.addCleanup(shutdown_process_pool)
+
+    def test_results_in_order_from_helpers(self):
+        """Test that items run in forked helpers and keep their order"""
+        results = list(map_in_processes(square, range(20)))
+
+        self.assertEqual(
+            [value for value, _ in results], [n * n for n in range(20)]
+        )
+        pids = {pid for _, pid in results}
+        self.assertNotIn(os.getpid(), pids)
+        self.assertLessEqual(len(pids), 2)
+
+    def test_helpers_not_forked_from_worker(self):
+        """Test that helpers come from the forkserver, not this process"""
+        parents = set(map_in_processes(parent, range(20)))
+
+        self.assertEqual(len(parents), 1)
+        self.assertNotIn(os.getpid(), parents)
+
+    def test_pool_reused_across_calls(self):
+        """Test that later calls reuse the helpers of the first"""
+        first = {pid for _, pid in map_in_processes(square, range(20))}
+        pool = get_process_pool()
+        second = {pid for _, pid in map_in_processes(square, range(20))}
+
+        self.assertIs(get_process_pool(), pool)
+        self.assertLessEqual(first | second, set(pool._processes))
+
+    @override_settings(TASK_PROCESS_POOL_WORKERS=0)
+    def test_inline_when_disabled(self):
+        """Test that items run in the task when the pool is disabled"""
+        results = list(map_in_processes(square, range(20)))
+
+        self.assertEqual({pid for _, pid in results}, {os.getpid()})
+
+    def test_inline_below_threshold(self):
+        """Test that a few items are not worth a round trip"""
+        results = list(map_in_processes(square, range(3)))
+
+        self.assertEqual({pid for _, pid in results}, {os.getpid()})
+
+    @override_settings(TASK_SHARED_MEMORY_MIN_BYTES=16)
+    def test_large_input_through_shared_memory(self):
+        """Test that helpers read a large input in place"""
+        data = bytes(range(64))
+        created = []
+
+        def create(*args, **kwargs):
+            block = SharedMemory(*args, **kwargs)
+            created.append(block.name)
+            return block
+
+        with patch("core.processes.SharedMemory", side_effect=create):
+            results = list(map_in_processes(describe, range(64), data))
+
+        self.assertEqual(results, [("memoryview", n) for n in range(64)])
+        # Removed once the call returned
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=created[0])
+
+    @override_settings(TASK_SHARED_MEMORY_MIN_BYTES=1024)
+    def test_small_input_pickled(self):
+        """Test that a small input is sent along with every chunk"""
+        data = bytes(range(64))
+
+        results = list(map_in_processes(describe, range(64), data))
+
+        self.assertEqual(results, [("bytes", n) for n in range(64)])
+
+    def test_chunked(self):
+        """Test that items are split in chunks of the given size"""
+        self.assertEqual(
+            chunked(list(range(5)), 2), [[0, 1], [2, 3], [4]]
+        )
+
+    def test_allow_children(self):
+        """Test that a daemonic process is daemonic again afterwards"""
+        config = multiprocessing.current_process()._config
+        self.addCleanup(config.pop, "daemon", None)
+        config["daemon"] = True
+
+        with allow_children():
+            self.assertNotIn("daemon", config)
+            self.assertTrue(processes._pool_lock.locked())
+        self.assertTrue(config["daemon"])
+        self.assertFalse(processes._pool_lock.locked())
+
+    def test_cpu_bound_task(self):
+        """Test that the task returns every item's result in order"""
+        items = [f"item-{number}" for number in range(10)]
+        with patch.object(cpu_bound_task, "update_state"):
+            result = cpu_bound_task.apply(args=(items,)).get()
+
+        self.assertEqual(result["total_processed"], 10)
+        self.assertEqual(
+            [value.rsplit("_", 1)[0] for value in result["result"]],
+            [f"crunched_{item}" for item in items],
+        )
@@ -0,0 +1,171 @@
+"""
+Test the throttled progress reporting of long running tasks
+"""
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from django.test import SimpleTestCase, override_settings
+
+from core.progress import (
+    ChunkProgressReporter,
+    ProgressReporter,
+    clear_rollup,
+    progress_channel,
+)
+from core.tasks import long_running_task
+
+
+def fake_task(backend=None):
+    return SimpleNamespace(
+        backend=backend or SimpleNamespace(),
+        request=SimpleNamespace(id="task-1"),
+        update_state=MagicMock(),
+    )
+
+
+def written(task):
+    return [
+        call.kwargs["meta"]["current"]
+        for call in task.update_state.call_args_list
+    ]
+
+
+@override_settings(
+    TASK_PROGRESS_INTERVAL=3600,
+    TASK_PROGRESS_STEP=10,
+    TASK_PROGRESS_PUBSUB=False,
+)
+class ProgressReporterTests(SimpleTestCase):
+    """Test suite for ProgressReporter"""
+
+    def test_coalesces_by_step(self):
+        """Test that progress is written once per step and at the end"""
+        task = fake_task()
+        progress = ProgressReporter(task, 100)
+        for current in range(1, 101):
+            progress.update(current)
+
+        self.assertEqual(
+            written(task), [1, 11, 21, 31, 41, 51, 61, 71, 81, 91, 100]
+        )
+        self.assertEqual(
+            (progress.updates, progress.writes, progress.saved), (100, 11, 89)
+        )
+
+    @patch("core.progress.time.monotonic")
+    def test_coalesces_by_interval(self, monotonic):
+        """Test that an update is written once the interval passed"""
+        task = fake_task()
+        progress = ProgressReporter(task, 1000, interval=5, step=100)
+        for current, now in ((1, 0), (2, 4), (3, 5), (4, 6), (5, 10.5)):
+            monotonic.return_value = now
+            progress.update(current)
+
+        self.assertEqual(written(task), [1, 3, 5])
+
+    def test_always_writes_final_state(self):
+        """Test that the last update is written however soon it comes"""
+        task = fake_task()
+        progress = ProgressReporter(task, 3, step=100)
+        for current in range(1, 4):
+            progress.update(current, item=f"item-{current}")
+
+        self.assertEqual(written(task), [1, 3])
+        task.update_state.assert_called_with(
+            task_id=None,
+            state="PROGRESS",
+            meta={"current": 3, "total": 3, "item": "item-3"},
+        )
+
+    def test_zero_step_writes_every_update(self):
+        """Test that a step of 0 restores a write per item"""
+        task = fake_task()
+        progress = ProgressReporter(task, 5, step=0)
+        for current in range(1, 6):
+            progress.update(current)
+
+        self.assertEqual(written(task), [1, 2, 3, 4, 5])
+
+    def test_flush_writes_coalesced_update(self):
+        """Test that flushing writes the pending update only once"""
+        task = fake_task()
+        progress = ProgressReporter(task, 100)
+        progress.update(1)
+        progress.update(2)
+        progress.flush()
+        progress.flush()
+
+        self.assertEqual(written(task), [1, 2])
+
+    def test_publishes_instead_of_storing(self):
+        """Test that pub/sub progress leaves the result key alone"""
+        client = MagicMock()
+        task = fake_task(SimpleNamespace(client=client))
+        progress = ProgressReporter(task, 2, pubsub=True)
+        progress.update(1)
+        progress.update(2)
+
+        task.update_state.assert_not_called()
+        self.assertEqual(client.publish.call_count, 2)
+        channel, message = client.publish.call_args.args
+        self.assertEqual(channel, progress_channel("task-1"))
+        self.assertEqual(
+            json.loads(message),
+            {"state": "PROGRESS", "meta": {"current": 2, "total": 2}},
+        )
+
+    def test_pubsub_falls_back_without_redis(self):
+        """Test that backends without pub/sub store the progress"""
+        task = fake_task()
+        with self.assertLogs("core.progress", "WARNING"):
+            progress = ProgressReporter(task, 1, pubsub=True)
+        progress.update(1)
+
+        self.assertEqual(written(task), [1])
+
+    @override_settings(TASK_PROGRESS_STEP=50)
+    @patch("core.tasks.process_item", side_effect=lambda item: item)
+    def test_long_running_task(self, process_item):
+        """Test that the task reports coalesced progress"""
+        items = ["a", "b", "c", "d"]
+        with patch.object(long_running_task, "update_state") as update_state:
+            result = long_running_task.apply(args=(items,)).get()
+
+        self.assertEqual(result, {"result": items, "total_processed": 4})
+        self.assertEqual(
+            [
+                call.kwargs["meta"]["current"]
+                for call in update_state.call_args_list
+            ],
+            [1, 3, 4],
+        )
+
+
+@override_settings(TASK_PROGRESS_STEP=0, TASK_PROGRESS_PUBSUB=False)
+class ChunkProgressReporterTests(SimpleTestCase):
+    """Test suite for ChunkProgressReporter"""
+
+    def setUp(self):
+        self.addCleanup(clear_rollup, "parent")
+
+    def test_rolls_up_chunks(self):
+        """Test that chunks add their items up on the parent task"""
+        first, second = fake_task(), fake_task()
+        ChunkProgressReporter(first, 2, "parent", 4).update(1)
+        ChunkProgressReporter(second, 2, "parent", 4).update(2)
+
+        second.update_state.assert_called_once_with(
+            task_id="parent",
+            state="PROGRESS",
+            meta={"current": 3, "total": 4},
+        )
+
+    def test_discard(self):
+        """Test that a discarded chunk's items are no longer counted"""
+        task = fake_task()
+        progress = ChunkProgressReporter(task, 3, "parent", 6)
+        progress.update(2)
+        progress.discard()
+        ChunkProgressReporter(task, 3, "parent", 6).update(3)
+
+        self.assertEqual(written(task), [2, 3])
@@ -0,0 +1,86 @@
+"""
+Test the chunked fan-out of long_running_task
+"""
+from unittest.mock import PropertyMock, patch
+from celery.backends.cache import CacheBackend
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from app.celery import app as celery_app
+from core.progress import rollup_key
+from core.tasks import long_running_task, process_chunk
+
+
+@override_settings(TASK_PROGRESS_STEP=0, TASK_PROGRESS_PUBSUB=False)
+class ChunkedLongRunningTaskTests(SimpleTestCase):
+    """Test suite for long_running_task in chunked mode"""
+
+    def setUp(self):
+        # Chords need a result backend; this one lives in memory
+        backend = CacheBackend(app=celery_app, url="memory://")
+        patcher = patch(
+            "celery.app.base.Celery.backend",
+            new_callable=PropertyMock,
+            return_value=backend,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.processed = []
+        self.failing = set()
+
+    def process_item(self, item):
+        self.processed.append(item)
+        if item in self.failing:
+            self.failing.discard(item)
+            raise RuntimeError(f"{item} failed")
+        return item.upper()
+
+    def run_task(self, items, **kwargs):
+        with patch(
+            "core.tasks.process_item", side_effect=self.process_item
+        ), patch.object(process_chunk, "update_state") as update_state:
+            result = long_running_task.apply(args=(items,), kwargs=kwargs)
+        return result, update_state
+
+    def test_results_in_order(self):
+        """Test that chunk results are joined in item order"""
+        result, _ = self.run_task(list("abcdefg"), chunk_size=3)
+
+        self.assertEqual(
+            result.get(),
+            {"result": list("ABCDEFG"), "total_processed": 7},
+        )
+
+    def test_progress_rolls_up_on_parent(self):
+        """Test that chunks report the items done out of the whole job"""
+        result, update_state = self.run_task(list("abcde"), chunk_size=2)
+
+        self.assertEqual(
+            [call.kwargs["meta"] for call in update_state.call_args_list],
+            [{"current": done, "total": 5} for done in range(1, 6)],
+        )
+        self.assertEqual(
+            {call.kwargs["task_id"] for call in update_state.call_args_list},
+            {result.id},
+        )
+        self.assertIsNone(cache.get(rollup_key(result.id)))
+
+    def test_failed_chunk_retried_alone(self):
+        """Test that a retry only processes the failed chunk again"""
+        self.failing = {"d"}
+        result, update_state = self.run_task(list("abcdef"), chunk_size=2)
+
+        self.assertEqual(result.get()["result"], list("ABCDEF"))
+        self.assertEqual(self.processed, list("abcdcdef"))
+        self.assertEqual(
+            update_state.call_args.kwargs["meta"], {"current": 6, "total": 6}
+        )
+
+    @override_settings(LONG_RUNNING_TASK_CHUNK_SIZE=10)
+    def test_small_jobs_not_chunked(self):
+        """Test that jobs within one chunk run in the task itself"""
+        with patch.object(long_running_task, "update_state"):
+            result, update_state = self.run_task(list("abc"))
+
+        self.assertEqual(result.get()["result"], list("ABC"))
+        update_state.assert_not_called()
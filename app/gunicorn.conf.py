@@ -0,0 +1,18 @@
+"""
+gunicorn settings, read from the working directory of the container (/app).
+Bind address, workers and threads are given on the command line.
+"""
+
+
+def post_worker_init(worker):
+    # The application is loaded; start the password hashing pool before
+    # the worker serves requests from several threads
+    from users.bulk import start_hash_pool
+
+    start_hash_pool()
+
+
+def worker_exit(server, worker):
+    from users.bulk import shutdown_hash_pool
+
+    shutdown_hash_pool()
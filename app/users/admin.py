@@ -1,4 +1,4 @@
-from users.models import User
+from users.models import User, EmailOutbox
 from django.contrib import admin
 from django.utils.translation import gettext as _
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
@@ -64,3 +64,10 @@ class UserAdmin(BaseUserAdmin):
             },
         ),
     )
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ["task_name", "status", "created_at", "sent_at"]
+    list_filter = ["status"]
+    readonly_fields = ["created_at", "sent_at"]
@@ -0,0 +1,91 @@
+"""
+JWT authentication that resolves the token's user from the cache.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+
+
+USER_CACHE_KEY = "users:auth:{}"
+
+
+def user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+def snapshot_fields():
+    """Every concrete User column except the password hash"""
+    return [
+        field.attname
+        for field in get_user_model()._meta.concrete_fields
+        if field.attname != "password"
+    ]
+
+
+def cache_user(user):
+    cache.set(
+        user_cache_key(user.pk),
+        [getattr(user, attname) for attname in snapshot_fields()],
+        settings.USER_AUTH_CACHE_TIMEOUT,
+    )
+
+
+def get_cached_user(user_id):
+    """
+    Rebuild a User from its snapshot, or return None on a miss. The
+    password is left deferred and is only loaded if something reads it.
+    """
+    values = cache.get(user_cache_key(user_id))
+    if values is None:
+        return None
+    return get_user_model().from_db(
+        DEFAULT_DB_ALIAS, snapshot_fields(), values
+    )
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that serves the user from a short-lived cache
+    snapshot instead of querying the users table on every request.
+    Snapshots are dropped whenever a user is saved or deleted; queryset
+    ``update()`` calls bypass that, so USER_AUTH_CACHE_TIMEOUT bounds how
+    long such changes take to apply.
+    """
+
+    def get_user(self, validated_token):
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            or settings.USER_AUTH_CACHE_TIMEOUT <= 0
+        ):
+            # Revocation checks need the password hash, which is not cached
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        user = get_cached_user(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user)
+        elif not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+
+        return user
@@ -0,0 +1,194 @@
+"""
+Bulk user creation.
+
+A batch is validated up front with one uniqueness query, passwords are
+hashed across a process pool, rows are inserted with ``bulk_create`` in
+chunks and the verification emails are enqueued with a single publish.
+"""
+import os
+import threading
+import multiprocessing
+from multiprocessing import forkserver
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from rest_framework import serializers
+from django.db import IntegrityError, transaction
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+
+DUPLICATE_EMAIL_ERROR = {"email": ["user with this email already exists."]}
+
+
+class BulkUserRowSerializer(serializers.Serializer):
+    """One row of a bulk create request, mirroring UserSerializer"""
+
+    email = serializers.EmailField(max_length=255)
+    password = serializers.CharField(write_only=True, min_length=5)
+    first_name = serializers.CharField(
+        max_length=30, required=False, allow_blank=True, default=""
+    )
+    last_name = serializers.CharField(
+        max_length=30, required=False, allow_blank=True, default=""
+    )
+
+
+_hash_pool = None
+_hash_pool_pid = None
+_hash_pool_lock = threading.Lock()
+
+
+def get_hash_pool():
+    """
+    Return this process's password hashing pool, reused across calls.
+
+    Helpers are forked from a forkserver: a fresh single threaded process
+    that holds none of the web worker's locks or database and Redis
+    sockets. They are started on demand, up to USER_BULK_HASH_WORKERS.
+    """
+    global _hash_pool, _hash_pool_pid
+    with _hash_pool_lock:
+        if _hash_pool is None or _hash_pool_pid != os.getpid():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(["django.contrib.auth.hashers"])
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.USER_BULK_HASH_WORKERS,
+                mp_context=context,
+            )
+            _hash_pool_pid = os.getpid()
+        return _hash_pool
+
+
+def start_hash_pool():
+    """
+    Create the pool and its forkserver at worker startup (gunicorn's
+    post_worker_init) rather than inside the first bulk request
+    """
+    if settings.USER_BULK_HASH_WORKERS > 1:
+        get_hash_pool()
+        forkserver.ensure_running()
+
+
+def shutdown_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None and _hash_pool_pid == os.getpid():
+            _hash_pool.shutdown(cancel_futures=True)
+            _hash_pool = None
+
+
+def hash_passwords(passwords):
+    """
+    Hash passwords in order. Small batches are hashed inline since forking
+    the pool would cost more than it saves.
+    """
+    if (
+        len(passwords) < settings.USER_BULK_HASH_POOL_THRESHOLD
+        or settings.USER_BULK_HASH_WORKERS <= 1
+    ):
+        return [make_password(password) for password in passwords]
+
+    chunksize = max(
+        1, len(passwords) // (settings.USER_BULK_HASH_WORKERS * 4)
+    )
+    return list(
+        get_hash_pool().map(make_password, passwords, chunksize=chunksize)
+    )
+
+
+class BulkUserCreateService:
+    """Create many inactive users and report a result for every row"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.results = [None] * len(rows)
+
+    def error(self, index, errors):
+        self.results[index] = {
+            "index": index, "status": "error", "errors": errors
+        }
+
+    def validate(self):
+        """Return ``(index, validated_data)`` for every acceptable row"""
+        valid, seen = [], set()
+        for index, row in enumerate(self.rows):
+            serializer = BulkUserRowSerializer(data=row)
+            if not serializer.is_valid():
+                self.error(index, serializer.errors)
+                continue
+
+            data = serializer.validated_data
+            data["email"] = data["email"].strip().lower()
+            if data["email"] in seen:
+                self.error(index, {"email": ["Duplicate email in batch."]})
+                continue
+            seen.add(data["email"])
+            valid.append((index, data))
+
+        existing = set(
+            email.lower() for email in
+            get_user_model().objects.filter(
+                email__lower__in=seen
+            ).values_list("email", flat=True)
+        )
+        accepted = []
+        for index, data in valid:
+            if data["email"] in existing:
+                self.error(index, DUPLICATE_EMAIL_ERROR)
+            else:
+                accepted.append((index, data))
+        return accepted
+
+    def insert(self, users):
+        """
+        Insert in chunks. A chunk hitting a concurrent duplicate is retried
+        row by row so only the conflicting rows fail.
+        """
+        User = get_user_model()
+        created = []
+        batch_size = settings.USER_BULK_INSERT_BATCH_SIZE
+        for start in range(0, len(users), batch_size):
+            chunk = users[start:start + batch_size]
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create([user for _, user in chunk])
+                created.extend(chunk)
+            except IntegrityError:
+                for index, user in chunk:
+                    try:
+                        with transaction.atomic():
+                            User.objects.bulk_create([user])
+                        created.append((index, user))
+                    except IntegrityError:
+                        self.error(index, DUPLICATE_EMAIL_ERROR)
+        return created
+
+    def create(self):
+        """Run the batch and return ``(results, created_users)``"""
+        User = get_user_model()
+        accepted = self.validate()
+        hashes = hash_passwords([data["password"] for _, data in accepted])
+
+        users = [
+            (
+                index,
+                User(
+                    email=data["email"],
+                    first_name=data["first_name"],
+                    last_name=data["last_name"],
+                    password=password_hash,
+                    is_active=False,
+                ),
+            )
+            for (index, data), password_hash in zip(accepted, hashes)
+        ]
+        created = self.insert(users)
+
+        for index, user in created:
+            self.results[index] = {
+                "index": index,
+                "status": "created",
+                "id": str(user.pk),
+                "email": user.email,
+            }
+        return self.results, [user for _, user in created]
@@ -0,0 +1,128 @@
+"""
+Versioned read-through cache for serialized user responses.
+
+Entries are keyed by user id and the user's current version. Saving or
+deleting a user bumps the version, so stale entries are never read again
+and simply expire. Versions expire too, after twice
+USER_RESPONSE_CACHE_TIMEOUT, and are only created for users that exist.
+"""
+import time
+import threading
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.permissions import BasePermission
+
+
+VERSION_KEY = "users:version:{}"
+RESPONSE_KEY = "users:response:{}:{}:v{}"
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def response_cache_stats():
+    """Hit and miss counts of this process since start"""
+    with _stats_lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"]}
+
+
+def reset_response_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def version_timeout():
+    """Versions outlive every response cached under them"""
+    return settings.USER_RESPONSE_CACHE_TIMEOUT * 2
+
+
+def get_user_version(user_id):
+    """Return the user's current version, or None if it has none yet"""
+    return cache.get(VERSION_KEY.format(user_id))
+
+
+def start_user_version(user_id, version):
+    """
+    Start the user's version at ``version`` unless a save already started
+    one, and return whether it did. Versions start from the clock rather
+    than 1, so an expired or evicted counter never reuses old versions.
+    """
+    return cache.add(VERSION_KEY.format(user_id), version, version_timeout())
+
+
+def bump_user_version(user_id):
+    key = VERSION_KEY.format(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), version_timeout())
+
+
+class VersionedUserResponseMixin:
+    """
+    Cache successful ``retrieve`` responses per user and version. Views
+    set ``response_cache_prefix`` and may override ``get_cached_user_id``.
+    """
+
+    response_cache_prefix = None
+
+    def get_cached_user_id(self):
+        return self.kwargs[self.lookup_field]
+
+    def check_cached_object_permissions(self, request):
+        """
+        Run the object permission checks ``get_object`` would have run,
+        loading the object only if a permission class implements them
+        """
+        for permission in self.get_permissions():
+            if (
+                type(permission).has_object_permission
+                is not BasePermission.has_object_permission
+            ):
+                self.check_object_permissions(request, self.get_object())
+                return
+
+    def retrieve(self, request, *args, **kwargs):
+        if settings.USER_RESPONSE_CACHE_TIMEOUT <= 0:
+            return super().retrieve(request, *args, **kwargs)
+
+        user_id = self.get_cached_user_id()
+        version = get_user_version(user_id)
+        if version is not None:
+            key = RESPONSE_KEY.format(
+                self.response_cache_prefix, user_id, version
+            )
+            data = cache.get(key)
+            if data is not None:
+                self.check_cached_object_permissions(request)
+                _record("hits")
+                response = Response(data)
+                response["X-Cache"] = "HIT"
+                return response
+
+        # Taken before the lookup, so a save racing it starts the version
+        # first and this response is not cached under the newer version
+        new_version = time.time_ns()
+        _record("misses")
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            # Unknown ids never get here and leave no version behind
+            if version is None and start_user_version(user_id, new_version):
+                version = new_version
+            if version is not None:
+                key = RESPONSE_KEY.format(
+                    self.response_cache_prefix, user_id, version
+                )
+                cache.set(
+                    key, response.data, settings.USER_RESPONSE_CACHE_TIMEOUT
+                )
+        response["X-Cache"] = "MISS"
+        return response
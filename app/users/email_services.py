@@ -1,4 +1,9 @@
+import atexit
+import logging
+import threading
+
 from django.conf import settings
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
@@ -6,7 +11,16 @@ from django.contrib.sites.shortcuts import get_current_site
 from django.contrib.auth.tokens import default_token_generator
 
 from users.tokens import generate_token
-from users.tasks import send_email_task
+from users.models import EmailOutbox
+from users.tasks import (
+    send_email_task,
+    send_email_batch_task,
+    send_onboarding_emails_task,
+    send_bulk_verification_emails_task,
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 def generate_email_message(user):
@@ -22,38 +36,172 @@ The Platform Team
 """
 
 
+def build_welcome_email(user):
+    """Return the send_email_task payload of the welcome email"""
+    return {
+        "subject": "Welcome Email",
+        "body": generate_email_message(user),
+        "from_email": settings.EMAIL_HOST_USER,
+        "recipient_list": [user.email],
+        "content_subtype": "plain",
+    }
+
+
+def build_account_verification_email(user, domain):
+    """Return the send_email_task payload of the verification email"""
+    name = user.first_name or user.last_name or user.email.split('@')[0]
+
+    body = render_to_string(
+        "mail/email_confirmation.html",
+        {
+            "name": name,
+            "domain": domain,
+            "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+            "token": generate_token.make_token(user),
+        },
+    )
+    return {
+        "subject": "Verify Your Email",
+        "body": body,
+        "from_email": settings.EMAIL_HOST_USER,
+        "recipient_list": [user.email],
+        "content_subtype": "html",
+    }
+
+
+class EmailBatcher:
+    """
+    Buffers outgoing emails in-process and hands them to
+    ``send_email_batch_task`` once ``EMAIL_BATCH_SIZE`` messages are queued
+    or ``EMAIL_BATCH_WINDOW`` seconds have passed since the first one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._timer = None
+
+    @property
+    def max_size(self):
+        return settings.EMAIL_BATCH_SIZE
+
+    @property
+    def window(self):
+        return settings.EMAIL_BATCH_WINDOW
+
+    def add(self, message):
+        batch = None
+        with self._lock:
+            self._buffer.append(message)
+            if len(self._buffer) >= self.max_size:
+                batch = self._drain()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if batch:
+            self._publish(batch)
+
+    def flush(self):
+        with self._lock:
+            batch = self._drain()
+
+        if batch:
+            self._publish(batch)
+
+    def _drain(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._buffer = self._buffer, []
+        return batch
+
+    def _publish(self, batch):
+        try:
+            send_email_batch_task.delay(batch)
+        except Exception as e:
+            logger.error(f"Failed to publish email batch: {str(e)}")
+
+
+email_batcher = EmailBatcher()
+atexit.register(email_batcher.flush)
+
+
 class EmailService:
+    def enqueue(self, task, *args, **kwargs):
+        """
+        Publish ``task`` once the current transaction commits, so a worker
+        never runs it against rows it cannot see yet, or write it to the
+        outbox in that transaction when EMAIL_OUTBOX_ENABLED is set
+        """
+        if settings.EMAIL_OUTBOX_ENABLED:
+            with transaction.atomic():
+                EmailOutbox.objects.create(
+                    task_name=task.name, args=list(args), kwargs=kwargs
+                )
+        else:
+            transaction.on_commit(
+                lambda: task.delay(*args, **kwargs), robust=True
+            )
+
+    def send_email(self, subject, body, recipient_list, content_subtype):
+        """Send on commit, or buffer into a batch when batching is enabled"""
+        if (
+            settings.EMAIL_BATCHING_ENABLED
+            and not settings.EMAIL_OUTBOX_ENABLED
+        ):
+            email_batcher.add(
+                {
+                    "subject": subject,
+                    "body": body,
+                    "from_email": settings.EMAIL_HOST_USER,
+                    "recipient_list": recipient_list,
+                    "content_subtype": content_subtype,
+                }
+            )
+        else:
+            self.enqueue(
+                send_email_task,
+                subject,
+                body,
+                settings.EMAIL_HOST_USER,
+                recipient_list,
+                content_subtype=content_subtype
+            )
+
     def send_welcome_email(self, user):
-        subject = "Welcome Email"
-        message = generate_email_message(user)
-        send_email_task.delay(
-            subject,
-            message,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            content_subtype="plain"
+        email = build_welcome_email(user)
+        self.send_email(
+            email["subject"], email["body"], email["recipient_list"],
+            content_subtype=email["content_subtype"]
         )
 
     def send_account_verification_email(self, request, user):
         current_site = get_current_site(request)
-        subject = "Verify Your Email"
-        name = user.first_name or user.last_name or user.email.split('@')[0]
+        email = build_account_verification_email(user, current_site.domain)
+        self.send_email(
+            email["subject"], email["body"], email["recipient_list"],
+            content_subtype=email["content_subtype"]
+        )
 
-        body = render_to_string(
-            "mail/email_confirmation.html",
-            {
-                "name": name,
-                "domain": current_site.domain,
-                "uid": urlsafe_base64_encode(force_bytes(user.pk)),
-                "token": generate_token.make_token(user),
-            },
+    def send_onboarding_emails(self, request, user):
+        """
+        Send the welcome and verification emails with a single publish.
+        Both emails are rendered on the worker from the user id.
+        """
+        current_site = get_current_site(request)
+        self.enqueue(
+            send_onboarding_emails_task, str(user.pk), current_site.domain
         )
-        send_email_task.delay(
-            subject,
-            body,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            content_subtype="html"
+
+    def send_bulk_verification_emails(self, request, users):
+        """Enqueue the verification emails of many users in one publish"""
+        current_site = get_current_site(request)
+        self.enqueue(
+            send_bulk_verification_emails_task,
+            [str(user.pk) for user in users],
+            current_site.domain,
         )
 
     def send_password_reset_link(self, request, user):
@@ -89,12 +237,8 @@ This link will expire in 24 hours.
 """
             subtype = "plain"
 
-        send_email_task.delay(
-            subject,
-            body,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            content_subtype=subtype
+        self.send_email(
+            subject, body, [user.email], content_subtype=subtype
         )
 
     def send_password_reset_confirmation(self, user):
@@ -115,10 +259,6 @@ If this wasn't you, contact support at {settings.EMAIL_HOST_USER}.
 """
             subtype = "plain"
 
-        send_email_task.delay(
-            subject,
-            body,
-            settings.EMAIL_HOST_USER,
-            [user.email],
-            content_subtype=subtype
+        self.send_email(
+            subject, body, [user.email], content_subtype=subtype
         )
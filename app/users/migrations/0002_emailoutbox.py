@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-16 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_name", models.CharField(max_length=255)),
+                ("args", models.JSONField(blank=True, default=list)),
+                ("kwargs", models.JSONField(blank=True, default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("sent", "Sent")],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name_plural": "email outbox",
+                "ordering": ("id",),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="emailoutbox",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["id"],
+                name="users_outbox_pending_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emailoutbox",
+            index=models.Index(
+                condition=models.Q(("status", "sent")),
+                fields=["sent_at"],
+                name="users_outbox_sent_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-16 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_emailoutbox"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["-date_joined", "-id"], name="users_user_joined_id_idx"
+            ),
+        ),
+    ]
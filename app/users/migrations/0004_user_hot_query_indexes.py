@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-16 20:41
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0003_user_joined_id_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="user",
+            name="users_user_joined_id_idx",
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["-date_joined", "-id"],
+                include=("email", "first_name", "last_name"),
+                name="users_user_joined_cover_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="users_user_email_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["date_joined"],
+                name="users_user_inactive_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-16 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_user_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["date_modified", "id"], name="users_user_modified_id_idx"
+            ),
+        ),
+    ]
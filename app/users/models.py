@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -88,3 +89,69 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         ordering = ("-date_joined",)
+        indexes = [
+            # Keyset pagination of the users list. The listed columns are
+            # included (Postgres only) so the page is an index-only scan.
+            models.Index(
+                fields=["-date_joined", "-id"],
+                include=["email", "first_name", "last_name"],
+                name="users_user_joined_cover_idx",
+            ),
+            # Case-insensitive email lookups (email__lower)
+            models.Index(Lower("email"), name="users_user_email_lower_idx"),
+            # Incremental exports (?since=) ordered by modification time
+            models.Index(
+                fields=["date_modified", "id"],
+                name="users_user_modified_id_idx",
+            ),
+            # Cleanup scans over accounts that were never activated
+            models.Index(
+                fields=["date_joined"],
+                condition=models.Q(is_active=False),
+                name="users_user_inactive_idx",
+            ),
+        ]
+
+
+# Enables User.objects.filter(email__lower=...), served by the lower(email)
+# index
+User._meta.get_field("email").register_lookup(Lower)
+
+
+class EmailOutbox(models.Model):
+    """
+    Email task written in the same transaction as the change that triggered
+    it, and published to the broker afterwards by ``relay_email_outbox``.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+
+    task_name = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.task_name} ({self.status})"
+
+    class Meta:
+        ordering = ("id",)
+        verbose_name_plural = "email outbox"
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status="pending"),
+                name="users_outbox_pending_idx",
+            ),
+            models.Index(
+                fields=["sent_at"],
+                condition=models.Q(status="sent"),
+                name="users_outbox_sent_idx",
+            ),
+        ]
@@ -0,0 +1,7 @@
+from utils.pagination import KeysetPagination
+
+
+class UserKeysetPagination(KeysetPagination):
+    """Newest users first, with ties on date_joined broken by id"""
+
+    ordering = ("-date_joined", "-id")
@@ -1,4 +1,5 @@
 from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
 from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa
 
 
@@ -15,3 +16,7 @@ class JWTCookieAuthenticationScheme(OpenApiAuthenticationExtension):
             "scheme": "bearer",
             "bearerFormat": "JWT",
         }
+
+
+class CachedJWTAuthenticationScheme(SimpleJWTScheme):
+    target_class = "users.authentication.CachedJWTAuthentication"
@@ -1,12 +1,14 @@
 from django.conf import settings
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from rest_framework_simplejwt.serializers import (
     TokenObtainPairSerializer,
     TokenRefreshSerializer,
 )
 from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 
 
 User = get_user_model()
@@ -70,9 +72,13 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         self.fields["email"] = serializers.CharField()
 
     def validate(self, attrs):
-        # Check if the user's account is active
+        """
+        Authenticate in a single pass: one user query and one password
+        hash verification, rather than checking the credentials here and
+        again through ``authenticate()`` in the parent serializer.
+        """
         email = attrs.get("email").strip().lower()
-        user_ = User.objects.filter(email=email).first()
+        user_ = User.objects.filter(email__lower=email).first()
 
         if not user_:
             raise ValidationError(
@@ -98,8 +104,16 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 }
             )
 
-        # Validate email and password
-        data = super().validate(attrs)
+        self.user = user_
+        refresh = self.get_token(self.user)
+
+        data = {
+            "refresh": str(refresh),
+            "access": str(refresh.access_token),
+        }
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
 
         data["email"] = self.user.email
         data["first_name"] = self.user.first_name or ""
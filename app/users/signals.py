@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+
+from users.caching import bump_user_version
+from users.authentication import invalidate_cached_user
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_user_cache(sender, instance, **kwargs):
+    """
+    Drop the auth snapshot and bump the response cache version now and
+    again on commit, so a request reading the old row before the
+    transaction commits cannot re-cache it
+    """
+    def invalidate():
+        invalidate_cached_user(instance.pk)
+        bump_user_version(instance.pk)
+
+    invalidate()
+    transaction.on_commit(invalidate)
@@ -0,0 +1,157 @@
+"""
+Per-process pool of authenticated SMTP connections.
+
+Each Celery worker process keeps up to ``EMAIL_POOL_SIZE`` open email
+backend connections so consecutive sends skip the TCP/STARTTLS/AUTH
+handshake. Idle connections are health-checked with NOOP before reuse and
+recycled once they exceed ``EMAIL_POOL_MAX_AGE`` seconds or
+``EMAIL_POOL_MAX_MESSAGES`` sent messages.
+"""
+import os
+import time
+import smtplib
+import threading
+from django.conf import settings
+from django.core.mail import get_connection
+from celery.signals import worker_process_shutdown
+
+
+# Errors meaning the server dropped the connection under us. Other SMTP
+# and socket errors (refused recipients, a timeout after DATA) may follow
+# an accepted message, so resending could deliver it twice.
+DISCONNECT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class PooledConnection:
+    """An opened email backend plus the bookkeeping used for recycling"""
+
+    def __init__(self):
+        self.backend = get_connection(fail_silently=False)
+        self.backend.open()
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.messages_sent = 0
+
+    def is_expired(self):
+        return (
+            time.monotonic() - self.created_at > settings.EMAIL_POOL_MAX_AGE
+            or self.messages_sent >= settings.EMAIL_POOL_MAX_MESSAGES
+        )
+
+    def is_alive(self):
+        """NOOP the server if the connection has been idle for a while"""
+        if not hasattr(self.backend, "connection"):
+            # Non-SMTP backends (locmem, console) hold no socket
+            return True
+        if self.backend.connection is None:
+            return False
+        if time.monotonic() - self.last_used < settings.EMAIL_POOL_NOOP_AFTER:
+            return True
+        try:
+            return self.backend.connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send_messages(self, email_messages):
+        sent = self.backend.send_messages(email_messages)
+        self.messages_sent += len(email_messages)
+        self.last_used = time.monotonic()
+        return sent
+
+    def close(self):
+        try:
+            self.backend.close()
+        except Exception:
+            pass
+
+
+class SMTPConnectionPool:
+    """
+    LIFO pool of open connections.
+
+    The pool never blocks: when every pooled connection is checked out a new
+    one is opened, and connections returned to a full pool are closed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = []
+        self.connections_opened = 0
+
+    def _open(self):
+        self.connections_opened += 1
+        return PooledConnection()
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn = self._idle.pop()
+            if not conn.is_expired() and conn.is_alive():
+                return conn
+            conn.close()
+        return self._open()
+
+    def _checkin(self, conn):
+        with self._lock:
+            if len(self._idle) < settings.EMAIL_POOL_SIZE:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def send_messages(self, email_messages):
+        """
+        Send ``email_messages`` over a pooled connection. A connection the
+        server dropped is reopened and the send attempted once more.
+        """
+        conn = self._checkout()
+        try:
+            try:
+                sent = conn.send_messages(email_messages)
+            except DISCONNECT_ERRORS:
+                conn.close()
+                conn = self._open()
+                sent = conn.send_messages(email_messages)
+        except Exception:
+            conn.close()
+            raise
+
+        self._checkin(conn)
+        return sent
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pool = None
+_pool_pid = None
+
+
+def get_pool():
+    """Return the pool of the current process, creating it after a fork"""
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool, _pool_pid = SMTPConnectionPool(), os.getpid()
+    return _pool
+
+
+def send_messages(email_messages):
+    """Send through the process pool, or a one-off connection if disabled"""
+    if settings.EMAIL_POOL_SIZE <= 0:
+        connection = get_connection(fail_silently=False)
+        return connection.send_messages(email_messages)
+    return get_pool().send_messages(email_messages)
+
+
+@worker_process_shutdown.connect
+def close_pool(**kwargs):
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close_all()
@@ -1,5 +1,61 @@
-from celery import shared_task
+from datetime import timedelta
+from celery import shared_task, current_app
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from django.core.mail import EmailMessage
+from django.contrib.auth import get_user_model
+
+from users import smtp_pool
+from users.models import EmailOutbox
+
+
+logger = get_task_logger(__name__)
+
+
+def build_email_message(
+    subject, body, from_email, recipient_list, content_subtype="plain"
+):
+    """Build an EmailMessage from the payload used by the email tasks"""
+    email = EmailMessage(
+        subject=subject,
+        body=body,
+        from_email=from_email,
+        to=recipient_list,
+    )
+    if content_subtype == "html":
+        email.content_subtype = "html"
+    return email
+
+
+def deliver_messages(messages):
+    """
+    Send each payload over the pooled SMTP connection. Returns the delivery
+    status of every message, in order, and the payloads that failed.
+    """
+    results, failed = [], []
+    for message in messages:
+        email = build_email_message(**message)
+        try:
+            smtp_pool.send_messages([email])
+            results.append(
+                {"to": message["recipient_list"], "status": "sent"}
+            )
+        except Exception as exc:
+            logger.error(
+                f"Failed to send email to {message['recipient_list']}: "
+                f"{exc}"
+            )
+            failed.append(message)
+            results.append(
+                {
+                    "to": message["recipient_list"],
+                    "status": "failed",
+                    "error": str(exc),
+                }
+            )
+    return results, failed
 
 
 @shared_task(bind=True, max_retries=3)
@@ -7,14 +63,134 @@ def send_email_task(
     self, subject, body, from_email, recipient_list, content_subtype="plain"
 ):
     try:
-        email = EmailMessage(
-            subject=subject,
-            body=body,
-            from_email=from_email,
-            to=recipient_list,
+        email = build_email_message(
+            subject, body, from_email, recipient_list, content_subtype
         )
-        if content_subtype == "html":
-            email.content_subtype = "html"
-        email.send(fail_silently=False)
+        smtp_pool.send_messages([email])
     except Exception as exc:
         raise self.retry(exc=exc, countdown=60)  # retry after 1 min
+
+
+@shared_task(bind=True, max_retries=3)
+def send_email_batch_task(self, messages):
+    """
+    Send a batch of emails over the worker's pooled SMTP connection.
+
+    ``messages`` is a list of ``send_email_task`` keyword payloads. Returns
+    the delivery status of every message, in order. Messages that failed
+    are retried together in a new batch after 1 min.
+    """
+    results, failed = deliver_messages(messages)
+
+    if failed and self.request.retries < self.max_retries:
+        self.retry(args=(failed,), countdown=60, throw=False)
+
+    return results
+
+
+@shared_task
+def send_onboarding_emails_task(user_id, domain):
+    """
+    Render and send the welcome and account verification emails of a new
+    user together. Failed emails are retried as a batch after 1 min.
+    """
+    # Imported here since email_services enqueues the tasks of this module
+    from users.email_services import (
+        build_welcome_email,
+        build_account_verification_email,
+    )
+
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is None:
+        logger.warning(f"Skipping onboarding emails: user {user_id} is gone")
+        return []
+
+    results, failed = deliver_messages(
+        [
+            build_welcome_email(user),
+            build_account_verification_email(user, domain),
+        ]
+    )
+    if failed:
+        send_email_batch_task.apply_async((failed,), countdown=60)
+
+    return results
+
+
+@shared_task
+def send_bulk_verification_emails_task(user_ids, domain):
+    """
+    Render and send the account verification emails of users created in
+    bulk. Failed emails are retried as a batch after 1 min.
+    """
+    # Imported here since email_services enqueues the tasks of this module
+    from users.email_services import build_account_verification_email
+
+    users = get_user_model().objects.filter(pk__in=user_ids)
+    results, failed = deliver_messages(
+        [build_account_verification_email(user, domain) for user in users]
+    )
+    if failed:
+        send_email_batch_task.apply_async((failed,), countdown=60)
+
+    return results
+
+
+def publish_outbox_rows(rows):
+    """
+    Publish outbox rows over one producer connection. Returns the ids that
+    were published and the error that stopped the batch, if any.
+    """
+    published = []
+    try:
+        with current_app.producer_or_acquire() as producer:
+            for row in rows:
+                current_app.send_task(
+                    row.task_name,
+                    args=row.args,
+                    kwargs=row.kwargs,
+                    producer=producer,
+                )
+                published.append(row.pk)
+    except Exception as exc:
+        return published, exc
+    return published, None
+
+
+@shared_task
+def relay_email_outbox():
+    """
+    Drain pending outbox rows to the broker in batches of
+    EMAIL_OUTBOX_BATCH_SIZE, marking each batch sent with a single UPDATE,
+    then purge rows sent more than EMAIL_OUTBOX_RETENTION seconds ago.
+    """
+    batch_size = settings.EMAIL_OUTBOX_BATCH_SIZE
+    relayed = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(status=EmailOutbox.Status.PENDING)
+                .order_by("id")[:batch_size]
+            )
+            published, error = publish_outbox_rows(rows)
+            EmailOutbox.objects.filter(pk__in=published).update(
+                status=EmailOutbox.Status.SENT, sent_at=timezone.now()
+            )
+        relayed += len(published)
+
+        if error is not None:
+            logger.error(f"Outbox relay stopped after {relayed}: {error}")
+            raise error
+        if len(rows) < batch_size:
+            break
+
+    EmailOutbox.objects.filter(
+        status=EmailOutbox.Status.SENT,
+        sent_at__lt=timezone.now() - timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETENTION
+        ),
+    ).delete()
+
+    return relayed
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from unittest.mock import patch
+from django.urls import reverse
+from django.db import transaction
+from django.utils import timezone
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from users.models import EmailOutbox
+from users.email_services import EmailService
+from users.tasks import relay_email_outbox
+
+
+@override_settings(EMAIL_OUTBOX_ENABLED=True)
+class EmailOutboxWriteTests(TestCase):
+    """Test suite for writing email tasks to the outbox"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    @patch("users.email_services.send_onboarding_emails_task.delay")
+    def test_signup_writes_outbox_instead_of_publishing(self, mock_delay):
+        """Test that signup writes an outbox row and publishes nothing"""
+        response = self.client.post(
+            reverse("users:users_list_create"),
+            {"email": "new@test.com", "password": "strongpass123"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mock_delay.assert_not_called()
+
+        row = EmailOutbox.objects.get()
+        self.assertEqual(
+            row.task_name, "users.tasks.send_onboarding_emails_task"
+        )
+        self.assertEqual(row.args, [response.data["id"], "testserver"])
+        self.assertEqual(row.status, EmailOutbox.Status.PENDING)
+
+    def test_outbox_rolled_back_with_transaction(self):
+        """Test that the outbox row shares the caller's transaction"""
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                EmailService().send_email(
+                    "Subject", "Body", ["a@test.com"], "plain"
+                )
+                raise RuntimeError("Signup failed")
+
+        self.assertFalse(EmailOutbox.objects.exists())
+
+
+@override_settings(EMAIL_OUTBOX_BATCH_SIZE=2)
+@patch("users.tasks.current_app.send_task")
+class RelayEmailOutboxTests(TestCase):
+    """Test suite for relay_email_outbox"""
+
+    def setUp(self):
+        self.rows = [
+            EmailOutbox.objects.create(
+                task_name="users.tasks.send_email_task",
+                args=[f"Subject {i}", "Body", "from@test.com", ["a@b.com"]],
+                kwargs={"content_subtype": "plain"},
+            )
+            for i in range(5)
+        ]
+
+    def test_pending_rows_published_in_order(self, mock_send_task):
+        """Test that every pending row is published and marked sent"""
+        relayed = relay_email_outbox.apply().get()
+
+        self.assertEqual(relayed, 5)
+        self.assertEqual(
+            [c.kwargs["args"][0] for c in mock_send_task.call_args_list],
+            [f"Subject {i}" for i in range(5)],
+        )
+        self.assertFalse(
+            EmailOutbox.objects.filter(
+                status=EmailOutbox.Status.PENDING
+            ).exists()
+        )
+
+    def test_batches_share_one_producer(self, mock_send_task):
+        """Test that rows of a batch are published over one producer"""
+        relay_email_outbox.apply().get()
+
+        producers = [
+            c.kwargs["producer"] for c in mock_send_task.call_args_list
+        ]
+        self.assertIs(producers[0], producers[1])
+
+    def test_sent_rows_not_republished(self, mock_send_task):
+        """Test that a second relay run publishes nothing"""
+        relay_email_outbox.apply().get()
+        mock_send_task.reset_mock()
+
+        relayed = relay_email_outbox.apply().get()
+
+        self.assertEqual(relayed, 0)
+        mock_send_task.assert_not_called()
+
+    def test_publish_failure_keeps_unpublished_rows(self, mock_send_task):
+        """Test that rows are only marked sent once published"""
+        mock_send_task.side_effect = [None, None, None, ConnectionError]
+
+        result = relay_email_outbox.apply()
+
+        self.assertIsInstance(result.result, ConnectionError)
+        self.assertEqual(
+            EmailOutbox.objects.filter(
+                status=EmailOutbox.Status.SENT
+            ).count(),
+            3,
+        )
+
+    def test_old_sent_rows_purged(self, mock_send_task):
+        """Test that rows sent past the retention period are deleted"""
+        EmailOutbox.objects.filter(pk=self.rows[0].pk).update(
+            status=EmailOutbox.Status.SENT,
+            sent_at=timezone.now() - timedelta(days=2),
+        )
+
+        relay_email_outbox.apply().get()
+
+        self.assertFalse(
+            EmailOutbox.objects.filter(pk=self.rows[0].pk).exists()
+        )
+        self.assertEqual(EmailOutbox.objects.count(), 4)
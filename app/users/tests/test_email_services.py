@@ -0,0 +1,214 @@
+from unittest.mock import patch
+from django.core import mail
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from users import smtp_pool
+from users.tasks import send_email_batch_task, send_onboarding_emails_task
+from users.email_services import EmailBatcher, EmailService
+
+
+def make_message(recipient, subtype="plain"):
+    return {
+        "subject": "Subject",
+        "body": "Body",
+        "from_email": "no-reply@domain.com",
+        "recipient_list": [recipient],
+        "content_subtype": subtype,
+    }
+
+
+class SendEmailBatchTaskTests(SimpleTestCase):
+    """Test suite for send_email_batch_task"""
+
+    def setUp(self):
+        smtp_pool.get_pool().close_all()
+
+    def test_batch_sent_over_single_connection(self):
+        """Test that the whole batch reuses one opened connection"""
+        messages = [make_message(f"user{i}@test.com") for i in range(5)]
+
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.open"
+        ) as mock_open:
+            results = send_email_batch_task.apply(args=(messages,)).get()
+
+        mock_open.assert_called_once()
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual([r["status"] for r in results], ["sent"] * 5)
+
+    def test_html_subtype_preserved(self):
+        """Test that html messages keep their content subtype"""
+        send_email_batch_task.apply(
+            args=([make_message("user@test.com", subtype="html")],)
+        ).get()
+
+        self.assertEqual(mail.outbox[0].content_subtype, "html")
+
+    def test_per_message_failure_reported(self):
+        """Test that one failing message does not fail the batch"""
+        messages = [make_message(f"user{i}@test.com") for i in range(3)]
+        original = mail.backends.locmem.EmailBackend.send_messages
+
+        def send_messages(backend, emails):
+            if emails[0].to == ["user1@test.com"]:
+                raise ConnectionError("Mailbox unavailable")
+            return original(backend, emails)
+
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            send_messages,
+        ):
+            results = send_email_batch_task.apply(args=(messages,)).get()
+
+        self.assertEqual(
+            [r["status"] for r in results], ["sent", "failed", "sent"]
+        )
+        self.assertIn("Mailbox unavailable", results[1]["error"])
+        self.assertEqual(len(mail.outbox), 2)
+
+
+class SendOnboardingEmailsTaskTests(TestCase):
+    """Test suite for send_onboarding_emails_task"""
+
+    def setUp(self):
+        smtp_pool.get_pool().close_all()
+        self.user = get_user_model().objects.create_user(
+            email="new@test.com", password="testpass123",
+            first_name="New", is_active=False
+        )
+
+    def test_both_emails_rendered_and_sent(self):
+        """Test that welcome and verification emails are sent together"""
+        results = send_onboarding_emails_task.apply(
+            args=(str(self.user.pk), "example.com")
+        ).get()
+
+        self.assertEqual([r["status"] for r in results], ["sent", "sent"])
+        self.assertEqual(
+            [m.subject for m in mail.outbox],
+            ["Welcome Email", "Verify Your Email"]
+        )
+        self.assertEqual(mail.outbox[1].content_subtype, "html")
+        self.assertIn("example.com", mail.outbox[1].body)
+        self.assertIn("New", mail.outbox[0].body)
+
+    @patch("users.tasks.send_email_batch_task.apply_async")
+    def test_failed_emails_retried_as_batch(self, mock_apply_async):
+        """Test that only the failed email is retried"""
+        original = mail.backends.locmem.EmailBackend.send_messages
+
+        def send_messages(backend, emails):
+            if emails[0].subject == "Verify Your Email":
+                raise ConnectionError("Mailbox unavailable")
+            return original(backend, emails)
+
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            send_messages,
+        ):
+            send_onboarding_emails_task.apply(
+                args=(str(self.user.pk), "example.com")
+            ).get()
+
+        failed = mock_apply_async.call_args.args[0][0]
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0]["subject"], "Verify Your Email")
+
+    def test_deleted_user_skipped(self):
+        """Test that no email is sent for a user deleted in the meantime"""
+        user_id = str(self.user.pk)
+        self.user.delete()
+
+        results = send_onboarding_emails_task.apply(
+            args=(user_id, "example.com")
+        ).get()
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(mail.outbox), 0)
+
+
+@override_settings(EMAIL_BATCH_SIZE=3, EMAIL_BATCH_WINDOW=60)
+@patch("users.email_services.send_email_batch_task.delay")
+class EmailBatcherTests(SimpleTestCase):
+    """Test suite for EmailBatcher"""
+
+    def setUp(self):
+        self.batcher = EmailBatcher()
+        self.addCleanup(self.batcher._drain)
+
+    def test_batch_published_when_full(self, mock_delay):
+        """Test that a full buffer is published as one batch"""
+        for i in range(3):
+            self.batcher.add(make_message(f"user{i}@test.com"))
+
+        mock_delay.assert_called_once()
+        self.assertEqual(len(mock_delay.call_args.args[0]), 3)
+
+    def test_batch_waits_for_window(self, mock_delay):
+        """Test that a partial buffer is held until flushed"""
+        self.batcher.add(make_message("user@test.com"))
+
+        mock_delay.assert_not_called()
+        self.assertIsNotNone(self.batcher._timer)
+
+        self.batcher.flush()
+
+        mock_delay.assert_called_once()
+        self.assertIsNone(self.batcher._timer)
+
+    @override_settings(EMAIL_BATCH_WINDOW=0.01)
+    def test_window_expiry_flushes(self, mock_delay):
+        """Test that the window timer flushes a partial buffer"""
+        self.batcher.add(make_message("user@test.com"))
+        self.batcher._timer.join(1)
+
+        mock_delay.assert_called_once()
+
+    def test_flush_empty_buffer(self, mock_delay):
+        """Test that flushing an empty buffer publishes nothing"""
+        self.batcher.flush()
+
+        mock_delay.assert_not_called()
+
+
+class EmailServiceBatchingTests(SimpleTestCase):
+    """Test suite for EmailService dispatching"""
+
+    @override_settings(EMAIL_BATCHING_ENABLED=False)
+    @patch("users.email_services.send_email_task.delay")
+    def test_sends_immediately_by_default(self, mock_delay):
+        """Test that each email gets its own task without batching"""
+        EmailService().send_email("Subject", "Body", ["a@test.com"], "plain")
+
+        mock_delay.assert_called_once()
+
+    @override_settings(EMAIL_BATCHING_ENABLED=True)
+    @patch("users.email_services.email_batcher.add")
+    @patch("users.email_services.send_email_task.delay")
+    def test_buffers_when_batching_enabled(self, mock_delay, mock_add):
+        """Test that emails are buffered when batching is enabled"""
+        EmailService().send_email("Subject", "Body", ["a@test.com"], "html")
+
+        mock_delay.assert_not_called()
+        self.assertEqual(
+            mock_add.call_args.args[0]["recipient_list"], ["a@test.com"]
+        )
+
+
+class EmailServiceCommitTests(TestCase):
+    """Test suite for publishing emails after the transaction commits"""
+
+    @override_settings(EMAIL_BATCHING_ENABLED=False)
+    @patch("users.email_services.send_email_task.delay")
+    def test_published_on_commit(self, mock_delay):
+        """Test that an email sent in a transaction waits for its commit"""
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                EmailService().send_email(
+                    "Subject", "Body", ["a@test.com"], "plain"
+                )
+                mock_delay.assert_not_called()
+
+        mock_delay.assert_called_once()
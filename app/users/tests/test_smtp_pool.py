@@ -0,0 +1,170 @@
+"""
+Tests for the per-worker SMTP connection pool, run against a local SMTP sink
+"""
+import smtplib
+import socketserver
+import threading
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase, override_settings
+
+from users import smtp_pool
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue that accepts and discards every message"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        sink = self.server.sink
+        sink.connections += 1
+        self.reply("220 sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 sink")
+            elif command.startswith("RCPT") and sink.reject_recipients:
+                self.reply("550 No such user")
+            elif command == "NOOP":
+                sink.noops += 1
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                sink.messages += 1
+                self.reply("250 OK")
+                if sink.drop_after_message:
+                    sink.drop_after_message = False
+                    return
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPSinkHandler)
+        self.sink = self
+        self.connections = 0
+        self.messages = 0
+        self.noops = 0
+        self.drop_after_message = False
+        self.reject_recipients = False
+
+
+class SMTPConnectionPoolTests(SimpleTestCase):
+    """Test suite for the SMTP connection pool"""
+
+    def setUp(self):
+        self.sink = SMTPSink()
+        thread = threading.Thread(target=self.sink.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.sink.server_close)
+        self.addCleanup(self.sink.shutdown)
+
+        settings_override = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.sink.server_address[1],
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+            EMAIL_POOL_SIZE=2,
+            EMAIL_POOL_MAX_AGE=300,
+            EMAIL_POOL_MAX_MESSAGES=100,
+            EMAIL_POOL_NOOP_AFTER=0,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.pool = smtp_pool.SMTPConnectionPool()
+        self.addCleanup(self.pool.close_all)
+
+    def send(self, count, send=None):
+        send = send or self.pool.send_messages
+        for i in range(count):
+            send(
+                [
+                    EmailMessage(
+                        "Subject", "Body", "from@test.com",
+                        [f"user{i}@test.com"]
+                    )
+                ]
+            )
+
+    def test_connection_reused_across_sends(self):
+        """Test that consecutive sends share one SMTP session"""
+        self.send(10)
+
+        self.assertEqual(self.sink.messages, 10)
+        self.assertEqual(self.sink.connections, 1)
+        self.assertEqual(self.pool.connections_opened, 1)
+
+    def test_handshake_savings_against_unpooled(self):
+        """Test that pooling removes a handshake per message"""
+        with override_settings(EMAIL_POOL_SIZE=0):
+            self.send(10, send=smtp_pool.send_messages)
+        unpooled = self.sink.connections
+
+        self.send(10)
+
+        self.assertEqual(unpooled, 10)
+        self.assertEqual(self.sink.connections - unpooled, 1)
+
+    def test_idle_connection_checked_with_noop(self):
+        """Test that reused connections are health-checked with NOOP"""
+        self.send(3)
+
+        self.assertEqual(self.sink.noops, 2)
+
+    def test_connection_recycled_after_max_messages(self):
+        """Test that a connection is replaced after the message limit"""
+        with override_settings(EMAIL_POOL_MAX_MESSAGES=4):
+            self.send(10)
+
+        self.assertEqual(self.sink.connections, 3)
+
+    def test_connection_recycled_after_max_age(self):
+        """Test that a connection is replaced after its maximum age"""
+        with override_settings(EMAIL_POOL_MAX_AGE=-1):
+            self.send(3)
+
+        self.assertEqual(self.sink.connections, 3)
+
+    def test_dropped_connection_reopened(self):
+        """Test that a connection dropped by the server is reopened"""
+        self.sink.drop_after_message = True
+
+        self.send(3)
+
+        self.assertEqual(self.sink.messages, 3)
+        self.assertEqual(self.sink.connections, 2)
+
+    def test_dropped_connection_reopened_without_noop(self):
+        """Test that a send on a silently dropped connection is retried"""
+        self.sink.drop_after_message = True
+
+        with override_settings(EMAIL_POOL_NOOP_AFTER=300):
+            self.send(3)
+
+        self.assertEqual(self.sink.messages, 3)
+        self.assertEqual(self.sink.connections, 2)
+
+    def test_smtp_errors_not_retried(self):
+        """Test that a refused send is raised instead of sent again"""
+        self.sink.reject_recipients = True
+
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            self.send(1)
+
+        self.assertEqual(self.sink.connections, 1)
@@ -39,10 +39,8 @@ class ListCreateUserViewTests(APITestCase):
         }
 
         with patch(
-            "users.views.email_service.send_welcome_email"
-        ) as mock_welcome, patch(
-            "users.views.email_service.send_account_verification_email"
-        ) as mock_verify:
+            "users.views.email_service.send_onboarding_emails"
+        ) as mock_onboarding:
             response = self.client.post(self.url, data, format="json")
 
             self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -51,8 +49,25 @@ class ListCreateUserViewTests(APITestCase):
             )
 
             # Verify emails were sent
-            mock_welcome.assert_called_once()
-            mock_verify.assert_called_once()
+            mock_onboarding.assert_called_once()
+
+    def test_create_user_single_publish(self):
+        """Test that signup publishes one onboarding task and nothing else"""
+        data = {"email": "newuser@test.com", "password": "strongpass123"}
+
+        with patch(
+            "users.email_services.send_onboarding_emails_task.delay"
+        ) as mock_onboarding, patch(
+            "users.email_services.send_email_task.delay"
+        ) as mock_send, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data, format="json")
+            # Nothing is published before the user row is committed
+            mock_onboarding.assert_not_called()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(email="newuser@test.com")
+        mock_onboarding.assert_called_once_with(str(user.pk), "testserver")
+        mock_send.assert_not_called()
 
     def test_create_user_duplicate_email(self):
         """Test user creation with duplicate email"""
@@ -77,7 +92,8 @@ class ListCreateUserViewTests(APITestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # admin + regular user
+        # admin + regular user
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_list_users_as_regular_user(self):
         """Test listing users as regular user (should be forbidden)"""
@@ -93,14 +109,12 @@ class ListCreateUserViewTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
-    @patch("users.views.email_service.send_welcome_email")
-    @patch("users.views.email_service.send_account_verification_email")
+    @patch("users.views.email_service.send_onboarding_emails")
     def test_email_service_failure_doesnt_break_user_creation(
-        self, mock_verify, mock_welcome
+        self, mock_onboarding
     ):
         """Test that email service failures don't prevent user creation"""
-        mock_welcome.side_effect = Exception("Email service down")
-        mock_verify.side_effect = Exception("Email service down")
+        mock_onboarding.side_effect = Exception("Email service down")
 
         data = {"email": "newuser@test.com", "password": "strongpass123"}
 
@@ -463,9 +477,7 @@ class SecurityTests(APITestCase):
             # Create user (triggers email sending)
             data = {"email": "newuser@test.com", "password": "strongpass123"}
 
-            with patch("users.views.email_service.send_welcome_email"), patch(
-                "users.views.email_service.send_account_verification_email"
-            ):
+            with patch("users.views.email_service.send_onboarding_emails"):
                 self.client.post(
                     reverse("users:users_list_create"), data, format="json"
                 )
@@ -494,10 +506,8 @@ class IntegrationTests(APITestCase):
         }
 
         with patch(
-            "users.views.email_service.send_welcome_email"
-        ) as mock_welcome, patch(
-            "users.views.email_service.send_account_verification_email"
-        ) as mock_verify:
+            "users.views.email_service.send_onboarding_emails"
+        ) as mock_onboarding:
             response = self.client.post(
                 reverse("users:users_list_create"),
                 registration_data,
@@ -511,8 +521,8 @@ class IntegrationTests(APITestCase):
             self.assertFalse(user.is_active)
 
             # Verify emails were sent
-            mock_welcome.assert_called_once_with(user)
-            mock_verify.assert_called_once()
+            mock_onboarding.assert_called_once()
+            self.assertEqual(mock_onboarding.call_args.args[1], user)
 
         # Step 2: Activate account
         uid = urlsafe_base64_encode(force_bytes(user.pk))
@@ -0,0 +1,114 @@
+from django.urls import reverse
+from django.core.cache import cache
+from django.test import override_settings
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import get_cached_user, user_cache_key
+
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    """Test suite for CachedJWTAuthentication"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="test@test.com",
+            password="testpass123",
+            first_name="Test",
+        )
+        self.url = reverse("users:manage_profile")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_first_request_populates_cache(self):
+        """Test that a cache miss loads the user and stores a snapshot"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+
+    def test_cached_request_needs_no_queries(self):
+        """Test that an authenticated read runs zero DB queries"""
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "test@test.com")
+        self.assertEqual(response.data["first_name"], "Test")
+
+    def test_snapshot_excludes_password(self):
+        """Test that the password hash is never cached"""
+        self.client.get(self.url)
+
+        user = get_cached_user(self.user.pk)
+
+        self.assertNotIn("testpass123", str(cache.get(
+            user_cache_key(self.user.pk)
+        )))
+        self.assertIn("password", user.get_deferred_fields())
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_save_invalidates_snapshot(self):
+        """Test that deactivating a user takes effect immediately"""
+        self.client.get(self.url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_delete_invalidates_snapshot(self):
+        """Test that a deleted user can no longer authenticate"""
+        self.client.get(self.url)
+
+        User.objects.filter(pk=self.user.pk).delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_from_snapshot(self):
+        """Test that a profile served from the cache can still be updated"""
+        self.client.get(self.url)
+
+        response = self.client.patch(
+            self.url, {"last_name": "User"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_name, "User")
+        self.assertTrue(self.user.check_password("testpass123"))
+
+    def test_profile_update_keeps_concurrent_changes(self):
+        """Test that an update does not write a stale snapshot back"""
+        self.client.get(self.url)
+        # Changes made behind the snapshot's back, e.g. by another process
+        User.objects.filter(pk=self.user.pk).update(first_name="Changed")
+
+        self.client.patch(self.url, {"last_name": "User"}, format="json")
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Changed")
+        self.assertEqual(self.user.last_name, "User")
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+    @override_settings(USER_AUTH_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self):
+        """Test that a zero timeout always reads the user from the DB"""
+        self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
@@ -0,0 +1,184 @@
+from unittest.mock import patch
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from users.bulk import (
+    BulkUserCreateService,
+    get_hash_pool,
+    hash_passwords,
+    shutdown_hash_pool,
+)
+
+
+User = get_user_model()
+
+
+@patch("users.email_services.send_bulk_verification_emails_task.delay")
+class BulkCreateUserViewTests(APITestCase):
+    """Test suite for BulkCreateUserView"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("users:users_bulk_create")
+        self.admin_user = User.objects.create_user(
+            email="admin@test.com", password="testpass123", is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def rows(self, count):
+        return [
+            {"email": f"User{i}@Test.com", "password": f"strongpass{i}"}
+            for i in range(count)
+        ]
+
+    def test_users_created(self, mock_delay):
+        """Test that every valid row becomes an inactive user"""
+        response = self.client.post(self.url, self.rows(3), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(
+            [r["status"] for r in response.data["results"]],
+            ["created"] * 3,
+        )
+
+        user = User.objects.get(email="user1@test.com")
+        self.assertFalse(user.is_active)
+        self.assertTrue(user.check_password("strongpass1"))
+        self.assertEqual(
+            response.data["results"][1]["id"], str(user.pk)
+        )
+
+    def test_verification_emails_single_publish(self, mock_delay):
+        """Test that all verification emails are enqueued at once"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.url, self.rows(4), format="json"
+            )
+
+        mock_delay.assert_called_once()
+        user_ids, domain = mock_delay.call_args.args
+        self.assertEqual(
+            user_ids, [r["id"] for r in response.data["results"]]
+        )
+        self.assertEqual(domain, "testserver")
+
+    def test_per_row_errors(self, mock_delay):
+        """Test that invalid and duplicate rows fail on their own"""
+        User.objects.create_user(email="taken@test.com", password="pass123")
+        rows = [
+            {"email": "ok@test.com", "password": "strongpass"},
+            {"email": "not-an-email", "password": "strongpass"},
+            {"email": "TAKEN@test.com", "password": "strongpass"},
+            {"email": "ok@TEST.com", "password": "strongpass"},
+            {"email": "short@test.com", "password": "123"},
+        ]
+
+        response = self.client.post(self.url, rows, format="json")
+
+        results = response.data["results"]
+        self.assertEqual(
+            [r["status"] for r in results],
+            ["created", "error", "error", "error", "error"],
+        )
+        self.assertIn("email", results[1]["errors"])
+        self.assertIn("already exists", str(results[2]["errors"]))
+        self.assertIn("Duplicate", str(results[3]["errors"]))
+        self.assertIn("password", results[4]["errors"])
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["failed"], 4)
+
+    def test_uniqueness_checked_with_one_query(self, mock_delay):
+        """Test that validation does not query once per row"""
+        with self.assertNumQueries(1):
+            BulkUserCreateService(self.rows(20)).validate()
+
+    @override_settings(USER_BULK_INSERT_BATCH_SIZE=2)
+    def test_concurrent_duplicate_only_fails_its_row(self, mock_delay):
+        """Test that an insert conflict falls back to row inserts"""
+        with patch(
+            "users.bulk.BulkUserCreateService.validate",
+            return_value=[
+                (0, {"email": "a@test.com", "password": "x" * 5,
+                     "first_name": "", "last_name": ""}),
+                (1, {"email": "admin@test.com", "password": "x" * 5,
+                     "first_name": "", "last_name": ""}),
+            ],
+        ), patch("users.bulk.hash_passwords", return_value=["h1", "h2"]):
+            response = self.client.post(
+                self.url, self.rows(2), format="json"
+            )
+
+        self.assertEqual(
+            [r["status"] for r in response.data["results"]],
+            ["created", "error"],
+        )
+
+    @override_settings(USER_BULK_MAX_ROWS=2)
+    def test_batch_too_large(self, mock_delay):
+        """Test that oversized batches are rejected"""
+        response = self.client.post(self.url, self.rows(3), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_body_must_be_list(self, mock_delay):
+        """Test that a non-list body is rejected"""
+        response = self.client.post(
+            self.url, {"email": "a@test.com"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_admin(self, mock_delay):
+        """Test that regular users cannot bulk create"""
+        user = User.objects.create_user(email="u@test.com", password="pass1")
+        self.client.force_authenticate(user=user)
+
+        response = self.client.post(self.url, self.rows(1), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class HashPasswordsTests(TestCase):
+    """Test suite for hash_passwords"""
+
+    @override_settings(
+        USER_BULK_HASH_WORKERS=2, USER_BULK_HASH_POOL_THRESHOLD=2
+    )
+    def test_hashed_across_process_pool(self):
+        """Test that large batches are hashed in pool processes, in order"""
+        passwords = ["first-pass", "second-pass", "third-pass"]
+        self.addCleanup(shutdown_hash_pool)
+
+        with patch(
+            "users.bulk.get_hash_pool", wraps=get_hash_pool
+        ) as mock_pool:
+            hashes = hash_passwords(passwords)
+
+        mock_pool.assert_called_once()
+        for password, password_hash in zip(passwords, hashes):
+            self.assertTrue(check_password(password, password_hash))
+
+    def test_pool_forks_from_forkserver(self):
+        """Test that helpers do not fork the multithreaded web worker"""
+        self.addCleanup(shutdown_hash_pool)
+
+        pool = get_hash_pool()
+
+        self.assertIs(get_hash_pool(), pool)
+        self.assertEqual(
+            pool._mp_context.get_start_method(), "forkserver"
+        )
+
+    @override_settings(USER_BULK_HASH_POOL_THRESHOLD=10)
+    def test_small_batches_hashed_inline(self):
+        """Test that small batches skip the pool"""
+        with patch("users.bulk.get_hash_pool") as mock_pool:
+            hashes = hash_passwords(["only-pass"])
+
+        mock_pool.assert_not_called()
+        self.assertTrue(check_password("only-pass", hashes[0]))
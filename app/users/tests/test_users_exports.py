@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest.mock import patch
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+
+User = get_user_model()
+
+
+class ExportUsersViewTests(APITestCase):
+    """Test suite for ExportUsersView"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("users:users_export")
+        self.admin_user = User.objects.create_user(
+            email="admin@test.com", password="testpass123", is_staff=True
+        )
+        User.objects.bulk_create(
+            [User(email=f"user{i}@test.com") for i in range(250)]
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def content(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        """Test that every user is exported as one JSON object per line"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line) for line in self.content(response).splitlines()
+        ]
+        self.assertEqual(len(rows), 251)
+        self.assertEqual(
+            {row["email"] for row in rows},
+            set(User.objects.values_list("email", flat=True)),
+        )
+        self.assertNotIn("password", rows[0])
+
+    def test_csv_export(self):
+        """Test that the CSV export has a header and one row per user"""
+        response = self.client.get(self.url, {"output": "csv"})
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.reader(io.StringIO(self.content(response))))
+        self.assertEqual(rows[0][:2], ["id", "email"])
+        self.assertEqual(len(rows), 252)
+
+    def test_since_filters_unmodified_users(self):
+        """Test that ?since= only exports recently modified users"""
+        User.objects.exclude(email="user3@test.com").update(
+            date_modified=timezone.now() - timedelta(days=2)
+        )
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+
+        response = self.client.get(self.url, {"since": since})
+
+        rows = [
+            json.loads(line) for line in self.content(response).splitlines()
+        ]
+        self.assertEqual([row["email"] for row in rows], ["user3@test.com"])
+
+    def test_rows_streamed_through_iterator(self):
+        """Test that rows are fetched in chunks, not loaded at once"""
+        with patch(
+            "django.db.models.query.QuerySet.iterator",
+            autospec=True,
+            side_effect=lambda qs, chunk_size: iter(qs),
+        ) as mock_iterator:
+            self.content(self.client.get(self.url))
+
+        self.assertEqual(mock_iterator.call_args.kwargs["chunk_size"], 2000)
+
+    def test_invalid_parameters(self):
+        """Test that unknown formats and bad dates are rejected"""
+        for params in ({"output": "xml"}, {"since": "yesterday"}):
+            response = self.client.get(self.url, params)
+
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_export_requires_admin(self):
+        """Test that regular users cannot export"""
+        user = User.objects.get(email="user1@test.com")
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
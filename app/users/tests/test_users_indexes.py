@@ -0,0 +1,81 @@
+"""
+Query plan tests for the indexes serving the User hot queries
+"""
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from django.db import connection
+from django.contrib.auth import get_user_model
+
+from users.views import ListCreateUserView
+
+
+User = get_user_model()
+
+
+class UserIndexTests(TestCase):
+    """Each hot query must be answered from an index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(
+            [
+                User(email=f"user{i}@test.com", is_active=i % 10 != 0)
+                for i in range(200)
+            ]
+        )
+
+    def assertUsesIndex(self, queryset, index_name):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # The test table is tiny; force the planner off seq scans
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_indexes_exist(self):
+        """Test that the migration created every index"""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, User._meta.db_table
+            )
+
+        for name in (
+            "users_user_joined_cover_idx",
+            "users_user_email_lower_idx",
+            "users_user_inactive_idx",
+        ):
+            self.assertIn(name, constraints)
+
+    def test_users_list_page_uses_covering_index(self):
+        """Test that a users list page is read from the ordering index"""
+        queryset = ListCreateUserView.queryset.order_by(
+            "-date_joined", "-id"
+        )[:51]
+
+        self.assertUsesIndex(queryset, "users_user_joined_cover_idx")
+
+    def test_email_lookup_uses_lower_index(self):
+        """Test that email__lower lookups use the functional index"""
+        queryset = User.objects.filter(email__lower="user5@test.com")
+
+        self.assertUsesIndex(queryset, "users_user_email_lower_idx")
+
+    def test_email_lower_lookup_is_case_insensitive(self):
+        """Test that email__lower matches mixed case stored emails"""
+        User.objects.filter(email="user7@test.com").update(
+            email="User7@Test.com"
+        )
+
+        self.assertTrue(
+            User.objects.filter(email__lower="user7@test.com").exists()
+        )
+
+    def test_inactive_cleanup_uses_partial_index(self):
+        """Test that scans for unactivated accounts use the partial index"""
+        queryset = User.objects.filter(
+            is_active=False,
+            date_joined__lt=timezone.now() + timedelta(days=1),
+        ).order_by("date_joined")
+
+        self.assertUsesIndex(queryset, "users_user_inactive_idx")
@@ -0,0 +1,92 @@
+from unittest.mock import patch
+from django.urls import reverse
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.settings import api_settings
+
+
+User = get_user_model()
+
+
+class SinglePassLoginTests(APITestCase):
+    """Test suite for the single-pass token obtain flow"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="test@test.com", password="testpass123", is_active=True
+        )
+        self.url = reverse("users:token_obtain_pair")
+        self.credentials = {
+            "email": "Test@Test.com", "password": "testpass123"
+        }
+
+    def post(self, data):
+        return self.client.post(self.url, data, format="json")
+
+    def test_password_verified_once(self):
+        """Test that a login runs the password hasher exactly once"""
+        with patch.object(
+            PBKDF2PasswordHasher, "verify",
+            autospec=True, side_effect=PBKDF2PasswordHasher.verify,
+        ) as mock_verify:
+            response = self.post(self.credentials)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_verify.call_count, 1)
+
+    def test_user_fetched_once(self):
+        """Test that the user row is read by a single query"""
+        with CaptureQueriesContext(connection) as queries:
+            self.post(self.credentials)
+
+        selects = [
+            query["sql"] for query in queries
+            if query["sql"].startswith("SELECT")
+            and '"users_user"' in query["sql"].split("WHERE")[0]
+        ]
+        self.assertEqual(len(selects), 1)
+
+    def test_response_payload(self):
+        """Test that tokens and the user details are returned"""
+        response = self.post(self.credentials)
+
+        self.assertIn("access", response.data)
+        self.assertIn("refresh", response.data)
+        self.assertEqual(response.data["email"], "test@test.com")
+        self.assertEqual(response.data["user_id"], self.user.id)
+
+    @patch.object(api_settings, "UPDATE_LAST_LOGIN", True)
+    def test_last_login_updated(self):
+        """Test that UPDATE_LAST_LOGIN is still honoured"""
+        self.post(self.credentials)
+
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+
+    def test_error_codes(self):
+        """Test that every failure keeps its detailed error code"""
+        User.objects.create_user(
+            email="inactive@test.com", password="testpass123",
+            is_active=False,
+        )
+        cases = [
+            ({"email": "nobody@test.com", "password": "x"},
+             "user_not_found"),
+            ({"email": "inactive@test.com", "password": "testpass123"},
+             "account_not_activated"),
+            ({"email": "test@test.com", "password": "wrongpass"},
+             "incorrect_password"),
+        ]
+
+        for data, code in cases:
+            response = self.post(data)
+
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+            self.assertEqual(response.data["code"], [code])
@@ -0,0 +1,185 @@
+import base64
+from unittest.mock import patch
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+
+from users.pagination import UserKeysetPagination
+
+
+User = get_user_model()
+
+
+def create_users(count, same_date=False):
+    """Bulk create users without hashing passwords"""
+    now = timezone.now()
+    users = User.objects.bulk_create(
+        [User(email=f"user{i}@test.com") for i in range(count)]
+    )
+    for i, user in enumerate(users):
+        user.date_joined = now if same_date else now - timedelta(seconds=i)
+    User.objects.bulk_update(users, ["date_joined"], batch_size=500)
+    return users
+
+
+class UserKeysetPaginationTests(APITestCase):
+    """Test suite for keyset pagination of the users list"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("users:users_list_create")
+        self.admin_user = User.objects.create_user(
+            email="admin@test.com", password="testpass123", is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def walk(self, url, direction="next"):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(user["id"] for user in response.data["results"])
+            url = response.data[direction]
+        return ids
+
+    def expected_ids(self):
+        return [
+            str(pk) for pk in User.objects.order_by(
+                "-date_joined", "-id"
+            ).values_list("id", flat=True)
+        ]
+
+    def test_first_page_shape(self):
+        """Test the paginated response of the first page"""
+        create_users(5)
+
+        response = self.client.get(self.url, {"page_size": 2})
+
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+    def test_walk_all_pages(self):
+        """Test that following next visits every user exactly once"""
+        create_users(11)
+
+        ids = self.walk(f"{self.url}?page_size=3")
+
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_walk_with_tied_dates(self):
+        """Test that users sharing date_joined are neither skipped nor
+        repeated"""
+        create_users(9, same_date=True)
+
+        ids = self.walk(f"{self.url}?page_size=2")
+
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_previous_link(self):
+        """Test that previous returns to the preceding page"""
+        create_users(6)
+        first = self.client.get(self.url, {"page_size": 3})
+        second = self.client.get(first.data["next"])
+
+        back = self.client.get(second.data["previous"])
+
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(back.data["previous"])
+        self.assertIsNotNone(back.data["next"])
+
+    def test_last_page_has_no_next(self):
+        """Test that the last page has no next link"""
+        create_users(3)
+
+        response = self.client.get(self.url, {"page_size": 10})
+
+        self.assertIsNone(response.data["next"])
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor returns 404"""
+        bad_key = base64.urlsafe_b64encode(b'{"p": ["x", "y"], "r": 0}')
+        for cursor in ("not-a-cursor", bad_key.decode()):
+            response = self.client.get(self.url, {"cursor": cursor})
+
+            self.assertEqual(
+                response.status_code, status.HTTP_404_NOT_FOUND
+            )
+
+    @patch.object(UserKeysetPagination, "max_page_size", 3)
+    def test_page_size_capped(self):
+        """Test that page_size cannot exceed max_page_size"""
+        create_users(5)
+
+        response = self.client.get(self.url, {"page_size": 100})
+
+        self.assertEqual(len(response.data["results"]), 3)
+
+
+class UserKeysetPaginationPerformanceTests(APITestCase):
+    """Deep pages must cost the same as the first page"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_users(10000)
+
+    def paginate(self, cursor=None):
+        params = {"page_size": 1}
+        if cursor:
+            params["cursor"] = cursor
+        request = Request(APIRequestFactory().get("/users/", params))
+        paginator = UserKeysetPagination()
+        page = paginator.paginate_queryset(User.objects.all(), request)
+        return paginator, page
+
+    def deep_cursor(self):
+        paginator = UserKeysetPagination()
+        paginator.page = [self.users[-2]]
+        paginator.has_next = True
+        paginator.base_url = "http://testserver/users/"
+        link = paginator.get_next_link()
+        return parse_qs(urlparse(link).query)["cursor"][0]
+
+    def test_deep_page_uses_seek_not_offset(self):
+        """Test that page 10,000 is a single LIMIT query without OFFSET"""
+        cursor = self.deep_cursor()
+
+        with CaptureQueriesContext(connection) as queries:
+            _, page = self.paginate(cursor)
+
+        self.assertEqual(page, [self.users[-1]])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("OFFSET", queries[0]["sql"].upper())
+
+    def test_deep_page_seeks_into_index(self):
+        """Test that the cursor bounds the index range, not just filters it"""
+        paginator = UserKeysetPagination()
+        request = Request(
+            APIRequestFactory().get(
+                "/users/", {"cursor": self.deep_cursor()}
+            )
+        )
+        position, _ = paginator.decode_cursor(request)
+        queryset = User.objects.order_by("-date_joined", "-id").filter(
+            paginator.seek(position, descending=True)
+        )[:2]
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("users_user_joined_cover_idx", plan)
+        if connection.vendor == "postgresql":
+            self.assertRegex(plan, r"Index Cond: \(date_joined <=")
+        else:
+            # SCAN would read the index from its start up to the cursor
+            self.assertIn("SEARCH", plan)
+            self.assertIn("date_joined<", plan)
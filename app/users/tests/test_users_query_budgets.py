@@ -0,0 +1,277 @@
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.http import urlsafe_base64_encode
+from django.utils.encoding import force_bytes
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from users.tokens import generate_token
+from utils.testing import QueryBudgetMixin
+
+
+User = get_user_model()
+
+# Statement summaries as produced by utils.testing.summarize
+SELECT_USER = "SELECT users_user"
+INSERT_USER = "INSERT users_user"
+UPDATE_USER = "UPDATE users_user"
+# Authenticating with a cold CachedJWTAuthentication cache
+AUTHENTICATE = SELECT_USER
+# User.save() runs full_clean(), which checks the email is unique
+VALIDATE_UNIQUE = SELECT_USER
+
+
+class UserEndpointBudgetTests(QueryBudgetMixin, APITestCase):
+    """Test suite pinning the queries and publishes of every users URL"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="testpass123",
+            is_staff=True,
+            is_superuser=True,
+        )
+        cls.user = User.objects.create_user(
+            email="user@test.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="User",
+        )
+        User.objects.bulk_create(
+            User(
+                email=f"member{number}@test.com",
+                first_name="Member",
+                last_name=str(number),
+            )
+            for number in range(60)
+        )
+
+    def setUp(self):
+        # Budgets are measured with cold authentication and response caches
+        cache.clear()
+
+    def authenticate(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+
+    def uid(self, user):
+        return urlsafe_base64_encode(force_bytes(user.pk))
+
+    def test_list_users(self):
+        """Test that listing a page of users runs one query"""
+        # The list view disables authentication, so only a forced user
+        # can reach it
+        self.client.force_authenticate(self.admin)
+        with self.assertBudget(queries=[SELECT_USER]):
+            response = self.client.get(reverse("users:users_list_create"))
+
+        self.assertEqual(len(response.json()["results"]), 50)
+
+    def test_create_user(self):
+        """Test the budget of signing up"""
+        data = {
+            "email": "new@test.com",
+            "password": "strongpass123",
+            "first_name": "New",
+        }
+        queries = [
+            # Serializer email uniqueness
+            SELECT_USER,
+            "SAVEPOINT",
+            # full_clean() primary key and email uniqueness
+            SELECT_USER,
+            VALIDATE_UNIQUE,
+            INSERT_USER,
+            "RELEASE",
+        ]
+        with self.assertBudget(
+            queries=queries,
+            publishes=["users.tasks.send_onboarding_emails_task"],
+        ):
+            response = self.client.post(
+                reverse("users:users_list_create"), data, format="json"
+            )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_bulk_create_users(self):
+        """Test that bulk creation uses one lookup and one insert"""
+        self.authenticate(self.admin)
+        rows = [
+            {"email": f"bulk{number}@test.com", "password": "strongpass123"}
+            for number in range(10)
+        ]
+        queries = [
+            AUTHENTICATE,
+            # Existing emails among the rows
+            SELECT_USER,
+            "SAVEPOINT",
+            INSERT_USER,
+            "RELEASE",
+        ]
+        with self.assertBudget(
+            queries=queries,
+            publishes=["users.tasks.send_bulk_verification_emails_task"],
+        ):
+            response = self.client.post(
+                reverse("users:users_bulk_create"), rows, format="json"
+            )
+
+        self.assertEqual(response.json()["created"], 10)
+
+    def test_export_users(self):
+        """Test that the export streams every user from one query"""
+        self.authenticate(self.admin)
+        with self.assertBudget(queries=[AUTHENTICATE, SELECT_USER]):
+            response = self.client.get(reverse("users:users_export"))
+            content = b"".join(response.streaming_content)
+
+        self.assertEqual(len(content.splitlines()), 62)
+
+    def test_user_detail(self):
+        """Test that a user detail is read once, then served cached"""
+        url = reverse("users:user_details", kwargs={"id": self.user.pk})
+        with self.assertBudget(queries=[SELECT_USER]):
+            self.client.get(url)
+        with self.assertBudget():
+            response = self.client.get(url)
+
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_profile(self):
+        """Test that the profile is read once, then served cached"""
+        self.authenticate(self.user)
+        with self.assertBudget(queries=[AUTHENTICATE]):
+            self.client.get(reverse("users:manage_profile"))
+        with self.assertBudget():
+            response = self.client.get(reverse("users:manage_profile"))
+
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_update_profile(self):
+        """Test the budget of updating the profile"""
+        self.authenticate(self.user)
+        with self.assertBudget(
+            # The snapshot from authentication is reloaded before writing
+            queries=[AUTHENTICATE, SELECT_USER, VALIDATE_UNIQUE, UPDATE_USER]
+        ):
+            response = self.client.patch(
+                reverse("users:manage_profile"),
+                {"first_name": "Changed"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_delete_profile(self):
+        """Test the budget of deleting the profile and its relations"""
+        self.authenticate(self.user)
+        queries = [
+            AUTHENTICATE,
+            SELECT_USER,
+            "DELETE django_admin_log",
+            "DELETE users_user_groups",
+            "DELETE users_user_user_permissions",
+            "DELETE users_user",
+        ]
+        with self.assertBudget(queries=queries):
+            response = self.client.delete(reverse("users:manage_profile"))
+
+        self.assertEqual(response.status_code, 204)
+
+    def test_activate(self):
+        """Test the budget of activating an account"""
+        self.user.is_active = False
+        self.user.save()
+        url = reverse(
+            "users:activate",
+            kwargs={
+                "uidb64": self.uid(self.user),
+                "token": generate_token.make_token(self.user),
+            },
+        )
+        with self.assertBudget(
+            queries=[SELECT_USER, VALIDATE_UNIQUE, UPDATE_USER]
+        ):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_password_reset(self):
+        """Test that a reset request is one lookup and one publish"""
+        with self.assertBudget(
+            queries=[SELECT_USER], publishes=["users.tasks.send_email_task"]
+        ):
+            response = self.client.post(
+                reverse("users:password_reset"),
+                {"email": self.user.email},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_password_reset_confirm(self):
+        """Test the budget of confirming a password reset"""
+        url = reverse(
+            "users:password_reset_confirm",
+            kwargs={
+                "uidb64": self.uid(self.user),
+                "token": default_token_generator.make_token(self.user),
+            },
+        )
+        data = {
+            "new_password1": "NewStrongPass123!",
+            "new_password2": "NewStrongPass123!",
+        }
+        with self.assertBudget(
+            queries=[SELECT_USER, VALIDATE_UNIQUE, UPDATE_USER]
+        ):
+            response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_obtain_token(self):
+        """Test that logging in is a single lookup"""
+        with self.assertBudget(queries=[SELECT_USER]):
+            response = self.client.post(
+                reverse("users:token_obtain_pair"),
+                {"email": self.user.email, "password": "testpass123"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh_token(self):
+        """Test the budget of refreshing a token"""
+        refresh = RefreshToken.for_user(self.user)
+        with self.assertBudget():
+            response = self.client.post(
+                reverse("users:token_refresh"),
+                {"refresh": str(refresh)},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_verify_token(self):
+        """Test that verifying a token never reads the database"""
+        with self.assertBudget():
+            response = self.client.post(
+                reverse("users:token_verify"),
+                {"token": str(AccessToken.for_user(self.user))},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_logout(self):
+        """Test the budget of logging out"""
+        self.authenticate(self.user)
+        with self.assertBudget(queries=[AUTHENTICATE]):
+            response = self.client.post(reverse("users:logout"))
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,172 @@
+from unittest.mock import ANY, patch
+from django.urls import reverse
+from django.core.cache import cache
+from django.test import override_settings
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.views import DetailUserView
+from users.serializers import UserSerializer
+from users.caching import (
+    VERSION_KEY,
+    bump_user_version,
+    response_cache_stats,
+    reset_response_cache_stats,
+)
+
+
+User = get_user_model()
+
+
+class DenyObjectPermission(BasePermission):
+    def has_object_permission(self, request, view, obj):
+        return False
+
+
+class VersionedUserResponseCacheTests(APITestCase):
+    """Test suite for the versioned user response cache"""
+
+    def setUp(self):
+        cache.clear()
+        reset_response_cache_stats()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="test@test.com", password="testpass123", first_name="Test"
+        )
+        self.url = reverse(
+            "users:user_details", kwargs={"id": self.user.id}
+        )
+
+    def test_second_read_is_served_from_cache(self):
+        """Test that a repeated read is a hit with no queries"""
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+
+    def test_save_bumps_version(self):
+        """Test that an update is visible on the next read"""
+        self.client.get(self.url)
+        version = cache.get(VERSION_KEY.format(self.user.id))
+
+        self.user.first_name = "Changed"
+        self.user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["first_name"], "Changed")
+        self.assertGreater(
+            cache.get(VERSION_KEY.format(self.user.id)), version
+        )
+
+    def test_delete_bumps_version(self):
+        """Test that a deleted user is no longer served"""
+        self.client.get(self.url)
+
+        self.user.delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_not_found_is_not_cached(self):
+        """Test that unknown ids leave neither a response nor a version"""
+        user_id = "00000000-0000-0000-0000-000000000000"
+        url = reverse("users:user_details", kwargs={"id": user_id})
+
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response_cache_stats(), {"hits": 0, "misses": 2})
+        self.assertIsNone(cache.get(VERSION_KEY.format(user_id)))
+
+    def test_hit_and_miss_counters(self):
+        """Test that hits and misses are counted"""
+        for _ in range(3):
+            self.client.get(self.url)
+
+        self.assertEqual(
+            response_cache_stats(), {"hits": 2, "misses": 1}
+        )
+
+    def test_profile_cached_per_user(self):
+        """Test that the profile endpoint caches the caller's own row"""
+        other = User.objects.create_user(
+            email="other@test.com", password="testpass123"
+        )
+        url = reverse("users:manage_profile")
+
+        for user in (self.user, other, self.user):
+            self.client.credentials(
+                HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+            )
+            response = self.client.get(url)
+
+            self.assertEqual(response.data["email"], user.email)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_profile_update_invalidates(self):
+        """Test that a profile update is reflected on the next read"""
+        url = reverse("users:manage_profile")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.client.get(url)
+
+        self.client.patch(url, {"first_name": "New"}, format="json")
+
+        self.assertEqual(self.client.get(url).data["first_name"], "New")
+
+    def test_version_expires_after_responses(self):
+        """Test that version keys get a TTL beyond the response TTL"""
+        key = VERSION_KEY.format(self.user.id)
+        cache.delete(key)
+
+        with override_settings(USER_RESPONSE_CACHE_TIMEOUT=300), patch(
+            "users.caching.cache.add", wraps=cache.add
+        ) as mock_add, patch(
+            "users.caching.cache.set", wraps=cache.set
+        ) as mock_set:
+            self.client.get(self.url)
+            cache.delete(key)
+            bump_user_version(self.user.id)
+
+        mock_add.assert_called_once_with(key, ANY, 600)
+        mock_set.assert_called_with(key, ANY, 600)
+
+    def test_save_during_lookup_is_not_cached(self):
+        """Test that a row read before a concurrent save is not cached"""
+        to_representation = UserSerializer.to_representation
+
+        def save_concurrently(serializer, instance):
+            data = to_representation(serializer, instance)
+            bump_user_version(instance.pk)
+            return data
+
+        with patch.object(
+            UserSerializer, "to_representation",
+            autospec=True, side_effect=save_concurrently,
+        ):
+            self.client.get(self.url)
+
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+
+    def test_hit_checks_object_permissions(self):
+        """Test that a cached response is only served if permitted"""
+        self.client.get(self.url)
+        request = APIRequestFactory().get(self.url)
+        view = DetailUserView.as_view(
+            permission_classes=[DenyObjectPermission]
+        )
+
+        response = view(request, id=self.user.id)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response_cache_stats(), {"hits": 0, "misses": 1})
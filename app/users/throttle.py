@@ -1,5 +1,8 @@
 from rest_framework.throttling import AnonRateThrottle
 
+from utils.cache import throttle_cache
+
 
 class PasswordResetThrottle(AnonRateThrottle):
+    cache = throttle_cache
     rate = '5/hour'  # 5 attempts per hour
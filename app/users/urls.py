@@ -15,6 +15,16 @@ urlpatterns = [
         views.ListCreateUserView.as_view(),
         name="users_list_create"
     ),
+    path(
+        "bulk/",
+        views.BulkCreateUserView.as_view(),
+        name="users_bulk_create"
+    ),
+    path(
+        "export/",
+        views.ExportUsersView.as_view(),
+        name="users_export"
+    ),
     path(
         "<uuid:id>/",
         views.DetailUserView.as_view(),
@@ -57,6 +67,6 @@ urlpatterns = [
     path(
         "logout/",
         views.LogOutAPIView.as_view(),
-        name="token_verify"
+        name="logout"
     ),
 ]
@@ -1,4 +1,6 @@
 import logging
+from django.conf import settings
+from django.db import transaction
 from users.tokens import generate_token
 from users.serializers import (
     UserSerializer,
@@ -10,6 +12,8 @@ from users.serializers import (
     PasswordResetConfirmSerializer,
 )
 from django.shortcuts import redirect
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
 from rest_framework.views import APIView
 from django.utils.encoding import force_str
 from rest_framework.response import Response
@@ -18,15 +22,20 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 from .throttle import PasswordResetThrottle
+from .pagination import UserKeysetPagination
+from .exports import EXPORT_FORMATS, export_rows
+from .bulk import BulkUserCreateService
+from .authentication import CachedJWTAuthentication
+from .caching import VersionedUserResponseMixin
 from users.email_services import EmailService
 from django.contrib.auth import get_user_model
 from utils.permissions import IsAdminOrCreateOnly
 from django.utils.http import urlsafe_base64_decode
 from django.utils.decorators import method_decorator
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from django.contrib.auth.tokens import default_token_generator
 from django.views.decorators.debug import sensitive_post_parameters
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 
 email_service = EmailService()
@@ -39,46 +48,133 @@ class ListCreateUserView(generics.ListCreateAPIView):
     """
 
     serializer_class = UserSerializer
-    queryset = get_user_model().objects.all()
+    # Only the listed columns, all held by users_user_joined_cover_idx
+    queryset = get_user_model().objects.only(
+        "id", "email", "first_name", "last_name", "date_joined"
+    )
     authentication_classes = []
     permission_classes = [IsAdminOrCreateOnly]
+    pagination_class = UserKeysetPagination
 
+    @transaction.atomic
     def perform_create(self, serializer):
         """Create a new user"""
         user = serializer.save()
 
         try:
-            email_service.send_welcome_email(user)
+            email_service.send_onboarding_emails(self.request, user)
         except Exception as e:
-            logger.error(f"Failed to send welcome email: {str(e)}")
+            logger.error(f"Failed to send onboarding emails: {str(e)}")
 
-        try:
-            email_service.send_account_verification_email(
-                self.request,
-                user
+
+class BulkCreateUserView(APIView):
+    """
+    Create up to USER_BULK_MAX_ROWS inactive users from a list of
+    ``{"email", "password", "first_name", "last_name"}`` objects.
+    Returns a result for every row, in request order.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError(
+                {"detail": "Expected a non-empty list of users."}
             )
-        except Exception as e:
-            logger.error(f"Failed to send verification email: {str(e)}")
+        if len(rows) > settings.USER_BULK_MAX_ROWS:
+            raise ValidationError(
+                {
+                    "detail": f"At most {settings.USER_BULK_MAX_ROWS} users "
+                    "can be created per request."
+                }
+            )
+
+        results, users = BulkUserCreateService(rows).create()
 
+        if users:
+            try:
+                email_service.send_bulk_verification_emails(request, users)
+            except Exception as e:
+                logger.error(f"Failed to send verification emails: {str(e)}")
 
-class DetailUserView(generics.RetrieveAPIView):
+        return Response(
+            {
+                "created": len(users),
+                "failed": len(results) - len(users),
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ExportUsersView(APIView):
+    """
+    Stream every user as NDJSON (default) or CSV, row by row.
+    ``?output=csv`` selects CSV and ``?since=<ISO datetime>`` limits the
+    export to users modified at or after that time.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        output = request.query_params.get("output", "ndjson")
+        if output not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"output": f"Choose one of: {', '.join(EXPORT_FORMATS)}"}
+            )
+
+        queryset = get_user_model().objects.all()
+        since = request.query_params.get("since")
+        if since:
+            try:
+                since_dt = parse_datetime(since)
+            except ValueError:
+                since_dt = None
+            if since_dt is None:
+                raise ValidationError({"since": "Invalid ISO 8601 datetime"})
+            queryset = queryset.filter(date_modified__gte=since_dt)
+
+        render, content_type = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(
+            render(export_rows(queryset)), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="users.{output}"'
+        )
+        return response
+
+
+class DetailUserView(VersionedUserResponseMixin, generics.RetrieveAPIView):
     """APIView to retrieve a user"""
 
+    response_cache_prefix = "detail"
     serializer_class = UserSerializer
     queryset = get_user_model().objects.all()
     lookup_field = "id"
 
 
-class ManageProfileView(generics.RetrieveUpdateDestroyAPIView):
+class ManageProfileView(
+    VersionedUserResponseMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """APIView to manage the authenticated user profile"""
 
+    response_cache_prefix = "profile"
     serializer_class = UserSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_cached_user_id(self):
+        return self.request.user.pk
+
     def get_object(self):
         """Restricts users to manage only their own profile"""
-        return self.request.user
+        user = self.request.user
+        if self.request.method not in permissions.SAFE_METHODS:
+            # request.user may be a cached snapshot; saving it would write
+            # its stale columns back. Saving the row drops the snapshot.
+            user.refresh_from_db()
+        return user
 
 
 class ActivateAccountAPIView(APIView):
@@ -196,9 +292,10 @@ class PasswordResetView(APIView):
         # Get user by email
         from django.contrib.auth import get_user_model
         User = get_user_model()
-        try:
-            user = User.objects.get(email=serializer.validated_data['email'])
-        except User.DoesNotExist:
+        user = User.objects.filter(
+            email__lower=serializer.validated_data['email'].lower()
+        ).first()
+        if user is None:
             return Response(
                 {
                     "detail": "A password reset link has been sent."
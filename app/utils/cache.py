@@ -0,0 +1,383 @@
+"""
+Cache backend and serializer for the shared Redis cache.
+
+``PooledRedisCache`` shares one blocking connection pool per server across
+every thread and cache alias of a process, instead of Django's pool per
+backend instance. ``CompactJSONSerializer`` stores values as tagged JSON
+rather than pickle and compresses large payloads. ``TwoTierCache`` puts a
+bounded in-process LRU in front of Redis and keeps it coherent through
+pub/sub invalidations.
+"""
+import os
+import json
+import time
+import zlib
+import uuid
+import decimal
+import logging
+import datetime
+import threading
+from collections import Counter, OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from django.core.cache.backends.redis import RedisCache, RedisCacheClient
+
+
+JSON_MARKER = b"j"
+ZLIB_MARKER = b"z"
+TYPE_TAG = "$t"
+
+# Values JSON cannot represent natively, keyed by their tag
+_ENCODERS = (
+    (datetime.datetime, "dt", lambda value: value.isoformat()),
+    (datetime.date, "d", lambda value: value.isoformat()),
+    (datetime.time, "t", lambda value: value.isoformat()),
+    (datetime.timedelta, "td", lambda value: value.total_seconds()),
+    (uuid.UUID, "uuid", str),
+    (decimal.Decimal, "dec", str),
+    ((set, frozenset), "set", list),
+)
+_DECODERS = {
+    "dt": datetime.datetime.fromisoformat,
+    "d": datetime.date.fromisoformat,
+    "t": datetime.time.fromisoformat,
+    "td": lambda value: datetime.timedelta(seconds=value),
+    "uuid": uuid.UUID,
+    "dec": decimal.Decimal,
+    "set": set,
+}
+
+
+class TaggedJSONEncoder(json.JSONEncoder):
+    def default(self, o):
+        for types, tag, encode in _ENCODERS:
+            if isinstance(o, types):
+                return {TYPE_TAG: tag, "v": encode(o)}
+        return super().default(o)
+
+
+def _decode_tagged(obj):
+    if len(obj) == 2 and TYPE_TAG in obj and "v" in obj:
+        # A tag this version does not know, e.g. written by a newer
+        # release, is returned as stored rather than failing the read
+        decode = _DECODERS.get(obj[TYPE_TAG])
+        if decode is not None:
+            return decode(obj["v"])
+    return obj
+
+
+class CompactJSONSerializer:
+    """
+    Pickle-free serializer for Django's Redis cache client. Integers are
+    stored raw so ``incr``/``decr`` keep working; everything else is
+    compact JSON, zlib-compressed from CACHE_COMPRESS_MIN_BYTES on.
+    """
+
+    def __init__(self):
+        self.compress_min_bytes = settings.CACHE_COMPRESS_MIN_BYTES
+
+    def dumps(self, obj):
+        if type(obj) is int:
+            return obj
+        data = json.dumps(
+            obj, cls=TaggedJSONEncoder, separators=(",", ":")
+        ).encode()
+        if len(data) >= self.compress_min_bytes:
+            return ZLIB_MARKER + zlib.compress(data)
+        return JSON_MARKER + data
+
+    def loads(self, data):
+        try:
+            return int(data)
+        except ValueError:
+            pass
+        marker, payload = data[:1], data[1:]
+        if marker == ZLIB_MARKER:
+            payload = zlib.decompress(payload)
+        return json.loads(payload, object_hook=_decode_tagged)
+
+
+# Per-process state, dropped in a forked child so it never shares sockets
+# or local entries with its parent
+_pools = {}
+_local_tiers = {}
+_tier_stats = Counter()
+_process_pid = None
+_process_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def _reset_after_fork():
+    global _process_pid
+    if _process_pid != os.getpid():
+        _pools.clear()
+        _local_tiers.clear()
+        _tier_stats.clear()
+        _process_pid = os.getpid()
+
+
+class PooledRedisCacheClient(RedisCacheClient):
+    def _get_connection_pool(self, write):
+        index = self._get_connection_pool_index(write)
+        key = (
+            self._servers[index],
+            self._pool_class,
+            frozenset(self._pool_options.items()),
+        )
+        with _process_lock:
+            _reset_after_fork()
+            if key not in _pools:
+                _pools[key] = self._pool_class.from_url(
+                    self._servers[index], **self._pool_options
+                )
+            return _pools[key]
+
+
+class PooledRedisCache(RedisCache):
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        self._class = PooledRedisCacheClient
+
+
+MISSING = object()
+
+
+class LocalLRU:
+    """
+    Bounded in-process store of serialized values. Entries live at most
+    ``timeout`` seconds, the safety net should an invalidation be lost.
+    """
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.generation = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout, generation):
+        """
+        Store unless an invalidation arrived since ``generation`` was read,
+        which would mean ``value`` may predate it
+        """
+        if timeout is None or timeout > self.timeout:
+            timeout = self.timeout
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+
+class InvalidationListener(threading.Thread):
+    """Evict keys from a local tier as other processes publish writes"""
+
+    def __init__(self, client, channel, tier):
+        super().__init__(name=f"cache-invalidation:{channel}", daemon=True)
+        self.client = client
+        self.channel = channel
+        self.tier = tier
+
+    def run(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub()
+                pubsub.subscribe(self.channel)
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self.handle(message)
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed: {e}")
+            # Anything published while disconnected was missed
+            self.tier.clear()
+            time.sleep(1)
+
+    def handle(self, message):
+        if message["type"] == "subscribe":
+            # Entries cached before the subscription may already be stale
+            self.tier.clear()
+        elif message["type"] == "message":
+            keys = json.loads(message["data"])
+            if keys is None:
+                self.tier.clear()
+            else:
+                self.tier.delete(*keys)
+
+
+def _count(outcome):
+    with _process_lock:
+        _tier_stats[outcome] += 1
+
+
+def cache_tier_stats():
+    """Hits, misses and hit ratio of each tier in this process"""
+    with _process_lock:
+        stats = dict(_tier_stats)
+    tiers = {}
+    for tier in ("local", "remote"):
+        hits = stats.get(f"{tier}_hits", 0)
+        misses = stats.get(f"{tier}_misses", 0)
+        tiers[tier] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+        }
+    return tiers
+
+
+class TwoTierCacheClient(PooledRedisCacheClient):
+    """
+    Reads are served from the process's LocalLRU when possible. Writes
+    go to Redis and publish the written keys on ``channel`` so every
+    process, this one included, evicts its local copy.
+    """
+
+    def __init__(
+        self,
+        servers,
+        local_max_entries=1000,
+        local_timeout=30,
+        channel="cache:invalidate",
+        **options,
+    ):
+        super().__init__(servers, **options)
+        self._local_max_entries = local_max_entries
+        self._local_timeout = local_timeout
+        self._channel = channel
+
+    def _local_tier(self):
+        """Return this process's tier, starting its listener on first use"""
+        key = (tuple(self._servers), self._channel)
+        with _process_lock:
+            _reset_after_fork()
+            tier = _local_tiers.get(key)
+        if tier is None:
+            client = self.get_client(write=True)
+            with _process_lock:
+                tier = _local_tiers.get(key)
+                if tier is None:
+                    tier = _local_tiers[key] = LocalLRU(
+                        self._local_max_entries, self._local_timeout
+                    )
+                    InvalidationListener(
+                        client, self._channel, tier
+                    ).start()
+        return tier
+
+    def _invalidate(self, pipeline, keys):
+        """Evict locally and queue the publish; ``None`` means every key"""
+        if keys is None:
+            self._local_tier().clear()
+        else:
+            self._local_tier().delete(*keys)
+        pipeline.publish(self._channel, json.dumps(keys))
+
+    def get(self, key, default):
+        tier = self._local_tier()
+        raw = tier.get(key)
+        if raw is not MISSING:
+            _count("local_hits")
+            return self._serializer.loads(raw)
+
+        _count("local_misses")
+        generation = tier.generation
+        pipeline = self.get_client(key).pipeline(transaction=False)
+        pipeline.get(key)
+        pipeline.pttl(key)
+        raw, ttl = pipeline.execute()
+        if raw is None:
+            _count("remote_misses")
+            return default
+
+        _count("remote_hits")
+        tier.set(key, raw, ttl / 1000 if ttl > 0 else None, generation)
+        return self._serializer.loads(raw)
+
+    def set(self, key, value, timeout):
+        pipeline = self.get_client(key, write=True).pipeline(
+            transaction=False
+        )
+        if timeout == 0:
+            pipeline.delete(key)
+        else:
+            pipeline.set(key, self._serializer.dumps(value), ex=timeout)
+        self._invalidate(pipeline, [key])
+        pipeline.execute()
+
+    def delete(self, key):
+        pipeline = self.get_client(key, write=True).pipeline(
+            transaction=False
+        )
+        pipeline.delete(key)
+        self._invalidate(pipeline, [key])
+        return bool(pipeline.execute()[0])
+
+    def _after_write(self, keys):
+        pipeline = self.get_client(write=True).pipeline(transaction=False)
+        self._invalidate(pipeline, keys)
+        pipeline.execute()
+
+    def add(self, key, value, timeout):
+        added = super().add(key, value, timeout)
+        if added:
+            self._after_write([key])
+        return added
+
+    def incr(self, key, delta):
+        value = super().incr(key, delta)
+        self._after_write([key])
+        return value
+
+    def set_many(self, data, timeout):
+        super().set_many(data, timeout)
+        self._after_write(list(data))
+
+    def delete_many(self, keys):
+        super().delete_many(keys)
+        self._after_write(list(keys))
+
+    def clear(self):
+        cleared = super().clear()
+        self._after_write(None)
+        return cleared
+
+
+class TwoTierCache(PooledRedisCache):
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        self._class = TwoTierCacheClient
+
+
+# Thread-aware handle on the throttle alias, like django.core.cache.cache
+throttle_cache = ConnectionProxy(caches, "throttle")
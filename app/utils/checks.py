@@ -0,0 +1,49 @@
+"""
+System checks. Configuration checks run with every management command;
+checks that reach the cache servers are deploy checks, run by
+``manage.py check --deploy`` (the container runs it before migrating).
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.checks import Error, Tags, register
+
+
+CHECK_KEY = "utils:cache-check"
+
+
+@register(Tags.caches)
+def check_cache_aliases(app_configs, **kwargs):
+    """Fail fast when a cache alias is missing"""
+    return [
+        Error(f"CACHES has no '{alias}' alias.", id="utils.E001")
+        for alias in settings.CACHE_ALIASES
+        if alias not in settings.CACHES
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_cache_servers(app_configs, **kwargs):
+    """Fail fast when a cache alias's server is unreachable"""
+    errors = []
+    for alias in settings.CACHE_ALIASES:
+        if alias not in settings.CACHES:
+            continue
+
+        try:
+            cache = caches[alias]
+            cache.set(CHECK_KEY, "ok", 10)
+            reachable = cache.get(CHECK_KEY) == "ok"
+        except Exception as e:
+            reachable, reason = False, str(e)
+        else:
+            reason = "the value read back did not match"
+
+        if not reachable:
+            errors.append(
+                Error(
+                    f"Cache alias '{alias}' is not usable: {reason}",
+                    hint="Check REDIS_CACHE_URL or set USE_REDIS_CACHE=False.",
+                    id="utils.E002",
+                )
+            )
+    return errors
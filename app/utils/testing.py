@@ -0,0 +1,92 @@
+"""
+Query and broker publish budgets for API tests.
+
+``assertBudget`` pins the exact statements a block of code runs, each
+summarised as its verb and table (``SELECT users_user``), and the tasks it
+publishes. Summaries are stable across database backends and parameters,
+while still showing which table an extra query hit. A broken budget fails
+with a unified diff of the summaries followed by the full captured SQL.
+"""
+import re
+import difflib
+from contextlib import contextmanager
+from unittest.mock import patch
+from celery import Celery
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+_TABLE = re.compile(
+    r'\b(?:FROM|INTO|UPDATE|JOIN)\s+[`"\[]?(\w+)', re.IGNORECASE
+)
+
+
+def summarize(sql):
+    """``VERB table`` for a statement, the verb alone when it has no table"""
+    verb = sql.split(None, 1)[0].upper()
+    match = _TABLE.search(sql)
+    return f"{verb} {match.group(1)}" if match else verb
+
+
+@contextmanager
+def capture_publishes():
+    """Record the task names published, without touching a broker"""
+    published = []
+
+    def send_task(app, name, *args, **kwargs):
+        published.append(name)
+        return app.AsyncResult(kwargs.get("task_id") or "captured")
+
+    with patch.object(Celery, "send_task", autospec=True) as mock:
+        mock.side_effect = send_task
+        yield published
+
+
+def _diff(title, expected, captured):
+    return "\n".join(
+        difflib.unified_diff(
+            list(expected),
+            list(captured),
+            fromfile=f"expected {title}",
+            tofile=f"captured {title}",
+            lineterm="",
+        )
+    )
+
+
+class QueryBudgetMixin:
+    """TestCase mixin providing ``assertBudget``"""
+
+    @contextmanager
+    def assertBudget(self, queries=(), publishes=(), using=DEFAULT_DB_ALIAS):
+        """
+        Assert the block runs exactly ``queries`` (statement summaries, in
+        order) and publishes exactly ``publishes`` (task names). Callbacks
+        deferred with ``transaction.on_commit`` run and are counted.
+        """
+        connection = connections[using]
+        with CaptureQueriesContext(connection) as context, \
+                capture_publishes() as published:
+            with self.captureOnCommitCallbacks(using=using, execute=True):
+                yield
+
+        sql = [query["sql"] for query in context.captured_queries]
+        captured = [summarize(statement) for statement in sql]
+        problems = []
+        if captured != list(queries):
+            problems.append(
+                f"{len(captured)} queries, budget {len(queries)}:\n"
+                + _diff("queries", queries, captured)
+                + "\n\nCaptured SQL:\n"
+                + "\n".join(
+                    f"{number}. {statement}"
+                    for number, statement in enumerate(sql, 1)
+                )
+            )
+        if published != list(publishes):
+            problems.append(
+                f"{len(published)} publishes, budget {len(publishes)}:\n"
+                + _diff("publishes", publishes, published)
+            )
+        if problems:
+            self.fail("Budget not met\n\n" + "\n\n".join(problems))
@@ -0,0 +1,145 @@
+import uuid
+import decimal
+import datetime
+from unittest.mock import patch
+from django.core.cache import caches
+from django.core.checks.registry import registry
+from django.utils import timezone
+from django.test import SimpleTestCase, override_settings
+
+from utils import cache as cache_module
+from utils.checks import check_cache_aliases, check_cache_servers
+from utils.cache import (
+    JSON_MARKER,
+    ZLIB_MARKER,
+    CompactJSONSerializer,
+    PooledRedisCacheClient,
+)
+
+
+def redis_cache(location="redis://localhost:1/0"):
+    return {
+        "BACKEND": "utils.cache.PooledRedisCache",
+        "LOCATION": location,
+        "OPTIONS": {
+            "pool_class": "redis.BlockingConnectionPool",
+            "serializer": "utils.cache.CompactJSONSerializer",
+            "max_connections": 5,
+            "socket_connect_timeout": 0.2,
+        },
+    }
+
+
+class CompactJSONSerializerTests(SimpleTestCase):
+    """Test suite for CompactJSONSerializer"""
+
+    def setUp(self):
+        self.serializer = CompactJSONSerializer()
+
+    def test_round_trips_tagged_types(self):
+        """Test that non-JSON types survive a round trip"""
+        value = {
+            "id": uuid.uuid4(),
+            "joined": timezone.now(),
+            "day": datetime.date(2024, 1, 2),
+            "at": datetime.time(10, 30),
+            "ttl": datetime.timedelta(minutes=5),
+            "price": decimal.Decimal("9.99"),
+            "tags": {"a", "b"},
+            "nested": [None, True, 1.5, "text"],
+        }
+
+        data = self.serializer.dumps(value)
+
+        self.assertTrue(data.startswith(JSON_MARKER))
+        self.assertEqual(self.serializer.loads(data), value)
+
+    def test_integers_stored_raw(self):
+        """Test that ints bypass JSON so Redis INCR keeps working"""
+        self.assertEqual(self.serializer.dumps(42), 42)
+        self.assertEqual(self.serializer.loads(b"43"), 43)
+        self.assertIs(
+            self.serializer.loads(self.serializer.dumps(True)), True
+        )
+
+    @override_settings(CACHE_COMPRESS_MIN_BYTES=100)
+    def test_large_values_compressed(self):
+        """Test that values over the threshold are zlib-compressed"""
+        serializer = CompactJSONSerializer()
+        value = ["user@test.com"] * 100
+
+        data = serializer.dumps(value)
+
+        self.assertTrue(data.startswith(ZLIB_MARKER))
+        self.assertLess(len(data), 100)
+        self.assertEqual(serializer.loads(data), value)
+
+    def test_unknown_tag_returned_as_stored(self):
+        """Test that an unknown type tag does not fail the read"""
+        data = JSON_MARKER + b'{"$t":"newtype","v":"x"}'
+
+        self.assertEqual(
+            self.serializer.loads(data), {"$t": "newtype", "v": "x"}
+        )
+
+    def test_pickle_never_used(self):
+        """Test that unsupported objects are rejected, not pickled"""
+        with self.assertRaises(TypeError):
+            self.serializer.dumps(object())
+
+
+class PooledRedisCacheTests(SimpleTestCase):
+    """Test suite for PooledRedisCache"""
+
+    def setUp(self):
+        cache_module._pools.clear()
+
+    @override_settings(
+        CACHES={"default": redis_cache(), "throttle": redis_cache()}
+    )
+    def test_pool_shared_across_aliases(self):
+        """Test that aliases on one server share a connection pool"""
+        default = caches["default"]._cache._get_connection_pool(write=True)
+        throttle = caches["throttle"]._cache._get_connection_pool(write=True)
+
+        self.assertIs(default, throttle)
+        self.assertEqual(default.max_connections, 5)
+
+    def test_pool_recreated_after_fork(self):
+        """Test that a forked child never reuses the parent's pool"""
+        client = PooledRedisCacheClient(["redis://localhost:1/0"])
+        parent_pool = client._get_connection_pool(write=True)
+
+        with patch("utils.cache.os.getpid", return_value=-1):
+            child_pool = client._get_connection_pool(write=True)
+
+        self.assertIsNot(parent_pool, child_pool)
+
+
+class CacheChecksTests(SimpleTestCase):
+    """Test suite for the cache system checks"""
+
+    def test_configured_caches_pass(self):
+        """Test that the default configuration has no errors"""
+        self.assertEqual(check_cache_aliases(None), [])
+        self.assertEqual(check_cache_servers(None), [])
+
+    @override_settings(CACHES={"default": redis_cache()})
+    def test_missing_and_unreachable_aliases(self):
+        """Test that missing aliases and dead servers fail the checks"""
+        self.assertEqual(
+            [error.id for error in check_cache_aliases(None)],
+            ["utils.E001", "utils.E001"],
+        )
+        self.assertEqual(
+            [error.id for error in check_cache_servers(None)],
+            ["utils.E002"],
+        )
+
+    def test_servers_only_checked_on_deploy(self):
+        """Test that everyday commands never reach the cache servers"""
+        self.assertNotIn(check_cache_servers, registry.get_checks())
+        self.assertIn(
+            check_cache_servers,
+            registry.get_checks(include_deployment_checks=True),
+        )
@@ -0,0 +1,55 @@
+from django.test import SimpleTestCase, TestCase
+from django.contrib.auth import get_user_model
+
+from core.tasks import add
+from utils.testing import QueryBudgetMixin, summarize
+
+
+class SummarizeTests(SimpleTestCase):
+    """Test suite for summarize"""
+
+    def test_statements(self):
+        """Test that statements reduce to their verb and table"""
+        cases = {
+            'SELECT "a"."id" FROM "users_user" WHERE 1': "SELECT users_user",
+            "INSERT INTO `users_user` (id) VALUES (1)": "INSERT users_user",
+            'UPDATE "users_user" SET x = 1': "UPDATE users_user",
+            'DELETE FROM "django_admin_log"': "DELETE django_admin_log",
+            'SAVEPOINT "s1_x1"': "SAVEPOINT",
+            "select 1": "SELECT",
+        }
+        for sql, summary in cases.items():
+            with self.subTest(sql=sql):
+                self.assertEqual(summarize(sql), summary)
+
+
+class QueryBudgetMixinTests(QueryBudgetMixin, TestCase):
+    """Test suite for assertBudget"""
+
+    def test_within_budget(self):
+        """Test that matching queries and publishes pass"""
+        with self.assertBudget(
+            queries=["SELECT users_user"], publishes=["core.tasks.add"]
+        ):
+            get_user_model().objects.count()
+            add.delay(1, 2)
+
+    def test_extra_query_fails_with_diff(self):
+        """Test that an extra query fails with a diff and the SQL"""
+        with self.assertRaises(AssertionError) as raised:
+            with self.assertBudget(queries=["SELECT users_user"]):
+                get_user_model().objects.count()
+                get_user_model().objects.filter(email="a@b.c").exists()
+
+        message = str(raised.exception)
+        self.assertIn("2 queries, budget 1", message)
+        self.assertIn("+SELECT users_user", message)
+        self.assertIn("2. SELECT 1 AS", message)
+
+    def test_unexpected_publish_fails(self):
+        """Test that publishes beyond the budget fail"""
+        with self.assertRaises(AssertionError) as raised:
+            with self.assertBudget():
+                add.delay(1, 2)
+
+        self.assertIn("+core.tasks.add", str(raised.exception))
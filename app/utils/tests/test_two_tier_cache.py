@@ -0,0 +1,241 @@
+import json
+from unittest.mock import patch
+from django.urls import reverse
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from drf_spectacular.generators import SchemaGenerator
+
+from utils import cache as cache_module
+from utils.cache import LocalLRU, TwoTierCacheClient, cache_tier_stats
+
+
+CHANNEL = "cache:invalidate"
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [
+            getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for the two-tier client"""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+        self.listeners = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    def pttl(self, key):
+        return -1 if key in self.data else -2
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value).encode() if type(value) is int else value
+        return True
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def exists(self, key):
+        return key in self.data
+
+    def incr(self, key, delta):
+        value = int(self.data[key]) + delta
+        self.data[key] = str(value).encode()
+        return value
+
+    def publish(self, channel, data):
+        for listener in self.listeners:
+            listener.handle({"type": "message", "data": data})
+
+
+class TwoTierCacheClientTests(SimpleTestCase):
+    """Test suite for TwoTierCacheClient"""
+
+    def setUp(self):
+        cache_module._local_tiers.clear()
+        cache_module._tier_stats.clear()
+        self.redis = FakeRedis()
+        redis = self.redis
+
+        class Listener(cache_module.InvalidationListener):
+            def start(self):
+                redis.listeners.append(self)
+
+        patches = [
+            patch.object(cache_module, "InvalidationListener", Listener),
+            patch.object(
+                TwoTierCacheClient, "get_client", return_value=self.redis
+            ),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.client = TwoTierCacheClient(
+            ["redis://localhost:1/0"],
+            local_max_entries=2,
+            local_timeout=30,
+            channel=CHANNEL,
+            serializer="utils.cache.CompactJSONSerializer",
+        )
+
+    def write_from_other_process(self, key, value):
+        self.redis.data[key] = self.client._serializer.dumps(value)
+        self.redis.publish(CHANNEL, json.dumps([key]))
+
+    def test_repeated_reads_served_locally(self):
+        """Test that only the first read reaches Redis"""
+        self.client.set("key", {"a": 1}, 60)
+
+        for _ in range(3):
+            self.assertEqual(self.client.get("key", None), {"a": 1})
+
+        self.assertEqual(self.redis.gets, 1)
+
+    def test_local_write_evicts_and_publishes(self):
+        """Test that a write replaces the local copy everywhere"""
+        self.client.set("key", "old", 60)
+        self.client.get("key", None)
+        published = []
+        self.redis.listeners.append(
+            type("Spy", (), {"handle": lambda _, m: published.append(m)})()
+        )
+
+        self.client.set("key", "new", 60)
+
+        self.assertEqual(self.client.get("key", None), "new")
+        self.assertEqual(json.loads(published[0]["data"]), ["key"])
+
+    def test_remote_write_evicts_local_copy(self):
+        """Test that another process's write is seen on the next read"""
+        self.client.set("key", "old", 60)
+        self.client.get("key", None)
+
+        self.write_from_other_process("key", "new")
+
+        self.assertEqual(self.client.get("key", None), "new")
+
+    def test_delete_incr_and_clear_invalidate(self):
+        """Test that every kind of write evicts the local copy"""
+        self.client.set("counter", 1, 60)
+        self.client.get("counter", None)
+
+        self.assertEqual(self.client.incr("counter", 1), 2)
+        self.assertEqual(self.client.get("counter", None), 2)
+
+        self.assertTrue(self.client.delete("counter"))
+        self.assertIsNone(self.client.get("counter", None))
+
+        self.client.set("key", "value", 60)
+        self.client.get("key", None)
+        self.client._after_write(None)
+        self.assertEqual(len(self.client._local_tier()), 0)
+
+    def test_invalidation_during_fetch_is_not_cached(self):
+        """Test that a value fetched across an invalidation is not kept"""
+        self.client.set("key", "old", 60)
+        tier = self.client._local_tier()
+        original_execute = FakePipeline.execute
+
+        def execute_then_invalidate(pipeline):
+            result = original_execute(pipeline)
+            tier.delete("key")
+            return result
+
+        with patch.object(FakePipeline, "execute", execute_then_invalidate):
+            self.client.get("key", None)
+
+        self.assertEqual(len(tier), 0)
+
+    def test_tier_stats(self):
+        """Test that hits and misses are counted per tier"""
+        self.client.set("key", "value", 60)
+        self.client.get("missing", None)
+        self.client.get("key", None)
+        self.client.get("key", None)
+
+        stats = cache_tier_stats()
+
+        self.assertEqual(stats["local"]["hits"], 1)
+        self.assertEqual(stats["local"]["misses"], 2)
+        self.assertEqual(stats["remote"]["hits"], 1)
+        self.assertEqual(stats["remote"]["misses"], 1)
+        self.assertEqual(stats["local"]["hit_ratio"], 1 / 3)
+
+
+class LocalLRUTests(SimpleTestCase):
+    """Test suite for LocalLRU"""
+
+    def test_size_bound_evicts_least_recently_used(self):
+        """Test that the oldest unused entry is dropped first"""
+        tier = LocalLRU(max_entries=2, timeout=30)
+        tier.set("a", b"1", None, tier.generation)
+        tier.set("b", b"2", None, tier.generation)
+        tier.get("a")
+
+        tier.set("c", b"3", None, tier.generation)
+
+        self.assertEqual(tier.get("a"), b"1")
+        self.assertIs(tier.get("b"), cache_module.MISSING)
+
+    def test_entries_expire(self):
+        """Test that entries never outlive the local timeout"""
+        tier = LocalLRU(max_entries=10, timeout=30)
+        with patch("utils.cache.time.monotonic", return_value=100):
+            tier.set("a", b"1", 3600, tier.generation)
+        with patch("utils.cache.time.monotonic", return_value=131):
+            self.assertIs(tier.get("a"), cache_module.MISSING)
+
+    def test_subscribe_clears_tier(self):
+        """Test that entries cached before subscribing are dropped"""
+        tier = LocalLRU(max_entries=10, timeout=30)
+        tier.set("a", b"1", None, tier.generation)
+        listener = cache_module.InvalidationListener(None, CHANNEL, tier)
+
+        listener.handle({"type": "subscribe", "data": 1})
+
+        self.assertEqual(len(tier), 0)
+
+
+class CachedSchemaViewTests(TestCase):
+    """Test suite for CachedSpectacularAPIView"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_schema_generated_once(self):
+        """Test that repeated schema requests reuse the cached schema"""
+        url = reverse("api-schema")
+
+        with patch.object(
+            SchemaGenerator, "get_schema",
+            autospec=True, side_effect=SchemaGenerator.get_schema,
+        ) as mock_get_schema:
+            first = self.client.get(url, HTTP_ACCEPT="application/json")
+            second = self.client.get(url, HTTP_ACCEPT="application/json")
+
+        self.assertEqual(mock_get_schema.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertIn("/users/me/", json.loads(second.content)["paths"])
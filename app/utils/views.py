@@ -1,3 +1,54 @@
-from django.shortcuts import render  # noqa
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+from rest_framework.response import Response
+from drf_spectacular.views import SpectacularAPIView
+from drf_spectacular.renderers import OpenApiJsonRenderer
 
-# Create your views here.
+
+SCHEMA_CACHE_KEY = "openapi:{}:{}:{}"
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    Serve the public OpenAPI schema from the cache instead of walking
+    every view and serializer on each request. Entries are keyed by the
+    API VERSION, so bump it (or wait SCHEMA_CACHE_TIMEOUT) after changes.
+    """
+
+    def _get_schema_response(self, request):
+        if not self.serve_public or settings.SCHEMA_CACHE_TIMEOUT <= 0:
+            # Non-public schemas depend on the requesting user
+            return super()._get_schema_response(request)
+
+        version = (
+            self.api_version
+            or request.version
+            or self._get_version_parameter(request)
+        )
+        key = SCHEMA_CACHE_KEY.format(
+            settings.SPECTACULAR_SETTINGS["VERSION"],
+            version,
+            translation.get_language(),
+        )
+        schema = cache.get(key)
+        if schema is None:
+            generator = self.generator_class(
+                urlconf=self.urlconf, api_version=version,
+                patterns=self.patterns,
+            )
+            schema = generator.get_schema(request=request, public=True)
+            # Reduce to plain JSON types so the cache never has to pickle
+            schema = json.loads(OpenApiJsonRenderer().render(schema))
+            cache.set(key, schema, settings.SCHEMA_CACHE_TIMEOUT)
+
+        return Response(
+            data=schema,
+            headers={
+                "Content-Disposition": (
+                    "inline; "
+                    f'filename="{self._get_filename(request, version)}"'
+                )
+            },
+        )